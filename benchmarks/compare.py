@@ -0,0 +1,78 @@
+# karta-engine/benchmarks/compare.py
+"""
+Compares two result files written by `benchmarks.run`.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10 --fail-on-regression
+
+A scenario regresses when its p50 or p99 latency grows, or its throughput
+drops, by more than `--threshold` (a fraction) relative to the baseline.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {result["name"]: result for result in report.get("results", [])}
+
+
+def _change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]], candidate: Dict[str, Dict[str, Any]], threshold: float
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Returns per-scenario deltas and the names of regressed scenarios."""
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) & set(candidate)):
+        old, new = baseline[name], candidate[name]
+        row = {
+            "name": name,
+            "p50": _change(old["latency_ms"]["p50"], new["latency_ms"]["p50"]),
+            "p99": _change(old["latency_ms"]["p99"], new["latency_ms"]["p99"]),
+            "throughput": _change(old["throughput_rps"], new["throughput_rps"]),
+            "overhead_p50": _change(old["overhead_ms"]["p50"], new["overhead_ms"]["p50"]),
+        }
+        rows.append(row)
+        if row["p50"] > threshold or row["p99"] > threshold or row["throughput"] < -threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two Karta benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    rows, regressions = compare(baseline, candidate, args.threshold)
+
+    print(f"{'scenario':<45} {'p50':>9} {'p99':>9} {'rps':>9} {'overhead':>9}")
+    for row in rows:
+        flag = "  <-- regression" if row["name"] in regressions else ""
+        print(
+            f"{row['name']:<45} {row['p50']:>+9.1%} {row['p99']:>+9.1%} "
+            f"{row['throughput']:>+9.1%} {row['overhead_p50']:>+9.1%}{flag}"
+        )
+    for name in sorted(set(baseline) ^ set(candidate)):
+        print(f"{name:<45} (only in {'baseline' if name in baseline else 'candidate'})")
+
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}.")
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+# karta-engine/benchmarks/fakes.py
+"""
+Deterministic, in-process stand-ins for every backend Karta talks to.
+
+Each fake sleeps according to a seeded `LatencyModel` and adds the time it
+spent to the per-request `backend_time` accumulator, so the harness can
+separate Karta's own overhead from simulated backend latency.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+import xml.sax.saxutils
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+EMBEDDING_DIM = 64
+
+# Accumulates simulated backend time (ms) for the request running in the current task.
+backend_time: ContextVar[Optional[List[float]]] = ContextVar("karta_bench_backend_time", default=None)
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _record_backend_time(ms: float) -> None:
+    bucket = backend_time.get()
+    if bucket is not None:
+        bucket[0] += ms
+
+
+@dataclass
+class LatencyModel:
+    """
+    A seeded latency distribution.
+
+    kind: "constant" (always `median_ms`), "uniform" (`median_ms` +/- `spread`
+    fraction) or "lognormal" (median `median_ms`, shape `sigma`).
+    """
+
+    kind: str = "lognormal"
+    median_ms: float = 5.0
+    sigma: float = 0.5
+    spread: float = 0.5
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def sample_ms(self) -> float:
+        if self.kind == "constant":
+            return self.median_ms
+        if self.kind == "uniform":
+            low = self.median_ms * (1.0 - self.spread)
+            high = self.median_ms * (1.0 + self.spread)
+            return self._rng.uniform(low, high)
+        return self.median_ms * math.exp(self._rng.gauss(0.0, self.sigma))
+
+    async def wait(self) -> float:
+        ms = self.sample_ms()
+        await asyncio.sleep(ms / 1000.0)
+        _record_backend_time(ms)
+        return ms
+
+    def block(self) -> float:
+        """Sleeps synchronously, like a blocking client library would."""
+        ms = self.sample_ms()
+        time.sleep(ms / 1000.0)
+        _record_backend_time(ms)
+        return ms
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], seed: int) -> "LatencyModel":
+        return cls(
+            kind=data.get("kind", "lognormal"),
+            median_ms=float(data.get("median_ms", 5.0)),
+            sigma=float(data.get("sigma", 0.5)),
+            spread=float(data.get("spread", 0.5)),
+            seed=seed,
+        )
+
+
+LATENCY_PROFILES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    # Small latencies so that Karta's own overhead dominates the measurement.
+    "fast": {
+        "embedder": {"kind": "constant", "median_ms": 0.2},
+        "vector_store": {"kind": "constant", "median_ms": 0.1},
+        "llm": {"kind": "lognormal", "median_ms": 2.0, "sigma": 0.3},
+        "wolfram": {"kind": "lognormal", "median_ms": 2.0, "sigma": 0.3},
+        "wikipedia": {"kind": "lognormal", "median_ms": 1.0, "sigma": 0.3},
+        "ner": {"kind": "constant", "median_ms": 0.5},
+    },
+    # Roughly what production backends look like from a cloud worker.
+    "realistic": {
+        "embedder": {"kind": "lognormal", "median_ms": 8.0, "sigma": 0.3},
+        "vector_store": {"kind": "lognormal", "median_ms": 1.0, "sigma": 0.3},
+        "llm": {"kind": "lognormal", "median_ms": 600.0, "sigma": 0.5},
+        "wolfram": {"kind": "lognormal", "median_ms": 350.0, "sigma": 0.6},
+        "wikipedia": {"kind": "lognormal", "median_ms": 150.0, "sigma": 0.5},
+        "ner": {"kind": "lognormal", "median_ms": 15.0, "sigma": 0.3},
+    },
+}
+
+
+class FakeChunk:
+    __slots__ = ("id", "content", "metadata", "score", "rank")
+
+    def __init__(self, id: Optional[str], content: str, score: float = 0.0, rank: int = 0):
+        self.id = id
+        self.content = content
+        self.metadata: Dict[str, Any] = {}
+        self.score = score
+        self.rank = rank
+
+
+def hashed_embedding(text: str) -> List[float]:
+    """Bag-of-hashed-words embedding: texts sharing words get similar vectors."""
+    vector = [0.0] * EMBEDDING_DIM
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        h = _stable_hash(token)
+        vector[h % EMBEDDING_DIM] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class FakeEmbedder:
+    """Deterministic embedder with the same `embed(chunks=...)` contract as Genie's embedders."""
+
+    plugin_id = "bench_fake_embedder_v1"
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.calls = 0
+
+    async def embed(self, chunks: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+        self.calls += 1
+        chunk_list = [c async for c in chunks]
+        await self.latency.wait()
+
+        async def _results():
+            for chunk in chunk_list:
+                yield chunk, hashed_embedding(chunk.content)
+
+        return _results()
+
+
+class FakeVectorStore:
+    """Brute-force cosine vector store with Genie's `add`/`search` contract."""
+
+    plugin_id = "bench_fake_vector_store_v1"
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self._collections: Dict[str, List[Tuple[str, str, List[float]]]] = {}
+
+    async def add(self, embeddings: Any, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        collection = (config or {}).get("collection_name", "default")
+        rows = self._collections.setdefault(collection, [])
+        count = 0
+        async for chunk, vector in embeddings:
+            rows.append((chunk.id, chunk.content, list(vector)))
+            count += 1
+        return {"added_count": count, "errors": []}
+
+    async def search(
+        self, query_embedding: List[float], top_k: int, config: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> List[FakeChunk]:
+        await self.latency.wait()
+        collection = (config or {}).get("collection_name", "default")
+        scored = [
+            (sum(a * b for a, b in zip(query_embedding, vector)), chunk_id, content)
+            for chunk_id, content, vector in self._collections.get(collection, [])
+        ]
+        scored.sort(key=lambda row: row[0], reverse=True)
+        return [
+            FakeChunk(chunk_id, content, score=score, rank=i)
+            for i, (score, chunk_id, content) in enumerate(scored[:top_k])
+        ]
+
+
+class FakeLLM:
+    """
+    Answers Karta's extraction and summarization prompts. Whether an
+    extraction "finds" the attribute is a deterministic function of the prompt.
+    """
+
+    def __init__(self, latency: LatencyModel, hit_rate: float = 0.9):
+        self.latency = latency
+        self.hit_rate = hit_rate
+        self.calls = 0
+
+    async def generate(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        self.calls += 1
+        await self.latency.wait()
+        if prompt.startswith("Summarize"):
+            return {"text": "A short deterministic summary."}
+        if (_stable_hash(prompt) % 1000) / 1000.0 >= self.hit_rate:
+            return {"text": "Not found."}
+        return {"text": f"value-{_stable_hash(prompt) % 997}"}
+
+
+class FakeGenie:
+    """The slice of the Genie facade that Karta's dispatchers use."""
+
+    def __init__(self, llm: FakeLLM, embedder: FakeEmbedder, vector_store: FakeVectorStore):
+        self.llm = llm
+        self._embedder = embedder
+        self._vector_store = vector_store
+
+    async def get_default_embedder(self) -> FakeEmbedder:
+        return self._embedder
+
+    async def get_default_vector_store(self) -> FakeVectorStore:
+        return self._vector_store
+
+
+class FakeWikipediaPage:
+    def __init__(self, title: str, exists: bool):
+        self.title = title
+        self._exists = exists
+        self.summary = (
+            f"{title} is a well documented subject. " * 40 if exists else ""
+        )
+        self.fullurl = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+        self.lastrevid = _stable_hash(title) % 10_000_000
+
+    def exists(self) -> bool:
+        return self._exists
+
+
+class FakeWikipediaClient:
+    """Stands in for `wikipediaapi.Wikipedia`, including its blocking page fetch."""
+
+    def __init__(self, latency: LatencyModel, miss_rate: float = 0.05):
+        self.latency = latency
+        self.miss_rate = miss_rate
+        self.calls = 0
+
+    def page(self, title: str) -> FakeWikipediaPage:
+        self.calls += 1
+        self.latency.block()
+        exists = (_stable_hash(title) % 1000) / 1000.0 >= self.miss_rate
+        return FakeWikipediaPage(title, exists)
+
+
+def wolfram_transport(latency: LatencyModel, miss_rate: float = 0.1) -> httpx.MockTransport:
+    """An httpx transport that answers WolframAlpha v2 queries locally."""
+    calls = {"count": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        await latency.wait()
+        query = request.url.params.get("input", "")
+        if (_stable_hash(query) % 1000) / 1000.0 < miss_rate:
+            body = "<?xml version='1.0' encoding='UTF-8'?><queryresult success='false'/>"
+        else:
+            answer = xml.sax.saxutils.escape(f"{_stable_hash(query) % 100_000} units")
+            body = (
+                "<?xml version='1.0' encoding='UTF-8'?>"
+                "<queryresult success='true'><pod title='Result' primary='true'>"
+                f"<subpod><plaintext>{answer}</plaintext></subpod></pod></queryresult>"
+            )
+        return httpx.Response(200, content=body.encode("utf-8"))
+
+    transport = httpx.MockTransport(handler)
+    transport.calls = calls  # type: ignore[attr-defined]
+    return transport
+
+
+class _FakeEntity:
+    __slots__ = ("text", "label_", "start_char", "end_char")
+
+    def __init__(self, text: str, label: str, start: int, end: int):
+        self.text = text
+        self.label_ = label
+        self.start_char = start
+        self.end_char = end
+
+
+class _FakeDoc:
+    def __init__(self, ents: List[_FakeEntity]):
+        self.ents = ents
+
+
+class FakeNlp:
+    """A spaCy-pipeline stand-in that tags capitalized words, with blocking latency."""
+
+    _CAPITALIZED = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*")
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def __call__(self, text: str) -> _FakeDoc:
+        self.latency.block()
+        ents = [
+            _FakeEntity(m.group(0), "PERSON" if len(m.group(0).split()) > 1 else "GPE", m.start(), m.end())
+            for m in self._CAPITALIZED.finditer(text)
+        ]
+        return _FakeDoc(ents)
+
+
+class FakePluginManager:
+    """Holds pre-built plugin instances, mirroring the PluginManager calls Karta makes."""
+
+    def __init__(self, plugins: Dict[str, Any]):
+        self._plugins = plugins
+
+    async def get_plugin_instance(self, plugin_id: str, **kwargs: Any) -> Any:
+        return self._plugins.get(plugin_id)
+
+    async def get_all_plugin_instances_by_type(self, plugin_protocol_type: Any) -> List[Any]:
+        return [p for p in self._plugins.values() if isinstance(p, plugin_protocol_type)]
+
+    async def get_plugin(self, plugin_id: str) -> Any:
+        return self._plugins.get(plugin_id)
@@ -0,0 +1,346 @@
+# karta-engine/benchmarks/run.py
+"""
+Offline benchmark harness for Karta.
+
+Runs `lookup_fact`, `summarize` and `recognize_entities` through the real
+KartaManager, router and dispatchers, with every backend replaced by the
+seeded fakes in `benchmarks.fakes`. Results are written as JSON so that runs
+from different commits can be compared with `python -m benchmarks.compare`.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --operations lookup_fact --concurrency 1 32 --profile realistic
+"""
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fakes import (
+    LATENCY_PROFILES,
+    FakeEmbedder,
+    FakeGenie,
+    FakeLLM,
+    FakeNlp,
+    FakePluginManager,
+    FakeVectorStore,
+    FakeWikipediaClient,
+    LatencyModel,
+    backend_time,
+    wolfram_transport,
+)
+from karta.dispatchers.impl.llm_dispatchers import LlmSummaryDispatcher
+from karta.dispatchers.impl.spacy_ner_dispatcher import SpacyNerDispatcher
+from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+from karta.dispatchers.impl.wolfram_dispatcher import WolframAlphaDispatcher
+from karta.interface import KartaInterface
+from karta.manager import KartaManager
+
+RESULTS_SCHEMA_VERSION = 1
+WARM_KEY_POOL = 16
+
+OPERATIONS = ("lookup_fact", "summarize", "recognize_entities")
+CACHE_STATES = ("cold", "warm")
+
+# Cascade strategies for lookup_fact, expressed as `fact_lookup` router config.
+# Workload queries are computational, so WolframAlpha is the "right" provider.
+STRATEGIES: Dict[str, Dict[str, Any]] = {
+    "semantic": {},
+    "first_hit": {"priority_providers": ["wolfram_alpha_dispatcher_v1"]},
+    "fallthrough": {"priority_providers": ["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"]},
+}
+
+SAMPLE_TEXT = (
+    "Ada Lovelace worked with Charles Babbage in London on the Analytical Engine. "
+    "Decades later, Alan Turing studied at Cambridge and Princeton before returning to Manchester. "
+) * 8
+
+
+@dataclass
+class Scenario:
+    operation: str
+    concurrency: int
+    cache: str
+    strategy: str = "semantic"
+
+    @property
+    def name(self) -> str:
+        parts = [self.operation, f"c{self.concurrency}", self.cache]
+        if self.operation == "lookup_fact":
+            parts.append(self.strategy)
+        return "/".join(parts)
+
+
+@dataclass
+class BenchEnvironment:
+    interface: KartaInterface
+    manager: KartaManager
+    counters: Dict[str, Callable[[], int]]
+    wolfram: WolframAlphaDispatcher
+
+    def backend_calls(self) -> Dict[str, int]:
+        return {name: read() for name, read in self.counters.items()}
+
+    async def close(self) -> None:
+        await self.wolfram.teardown()
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+async def build_environment(
+    scenario: Scenario,
+    latency_specs: Dict[str, Dict[str, Any]],
+    seed: int,
+    karta_config: Dict[str, Any],
+) -> BenchEnvironment:
+    """Wires the real Karta stack to fresh fake backends."""
+    models = {
+        name: LatencyModel.from_dict(spec, seed=seed + i)
+        for i, (name, spec) in enumerate(sorted(latency_specs.items()))
+    }
+    embedder = FakeEmbedder(models["embedder"])
+    vector_store = FakeVectorStore(models["vector_store"])
+    llm = FakeLLM(models["llm"])
+    genie = FakeGenie(llm, embedder, vector_store)
+
+    # In the fallthrough strategy the first provider never has the answer.
+    wiki_miss_rate = 1.0 if scenario.strategy == "fallthrough" else 0.05
+    wiki_client = FakeWikipediaClient(models["wikipedia"], miss_rate=wiki_miss_rate)
+    wikipedia = WikipediaFactDispatcher()
+    wikipedia._wiki = wiki_client
+
+    transport = wolfram_transport(models["wolfram"])
+    wolfram = WolframAlphaDispatcher()
+    wolfram._client = SimpleNamespace(app_id="karta-bench")
+    wolfram._http_client = httpx.AsyncClient(transport=transport)
+
+    ner = SpacyNerDispatcher()
+    ner._nlp = FakeNlp(models["ner"])
+
+    plugins = {
+        wikipedia.plugin_id: wikipedia,
+        wolfram.plugin_id: wolfram,
+        LlmSummaryDispatcher.plugin_id: LlmSummaryDispatcher(),
+        ner.plugin_id: ner,
+    }
+    base_config = {
+        # Dispatchers above are pre-wired to the fakes; setup() would replace them.
+        "fact_lookup": {"defer_provider_setup": True, **STRATEGIES[scenario.strategy]},
+    }
+    manager = KartaManager(
+        genie=genie,
+        plugin_manager=FakePluginManager(plugins),
+        embedder=embedder,
+        vector_store=vector_store,
+        config=_deep_merge(base_config, karta_config),
+    )
+    await manager.setup()
+
+    counters = {
+        "embedder": lambda: embedder.calls,
+        "llm": lambda: llm.calls,
+        "wikipedia": lambda: wiki_client.calls,
+        "wolfram": lambda: transport.calls["count"],
+    }
+    return BenchEnvironment(KartaInterface(manager), manager, counters, wolfram)
+
+
+def _make_operation(env: BenchEnvironment, scenario: Scenario) -> Callable[[int], Awaitable[Any]]:
+    karta = env.interface
+
+    def key_for(i: int) -> int:
+        return i % WARM_KEY_POOL if scenario.cache == "warm" else i
+
+    if scenario.operation == "lookup_fact":
+        return lambda i: karta.lookup_fact(f"Compound {key_for(i)}", "molar mass in grams per mole")
+    if scenario.operation == "summarize":
+        return lambda i: karta.summarize(f"Document {key_for(i)}. {SAMPLE_TEXT}", style="one sentence")
+    if scenario.operation == "recognize_entities":
+        return lambda i: karta.recognize_entities(f"Report {key_for(i)}: {SAMPLE_TEXT}")
+    raise ValueError(f"Unknown operation '{scenario.operation}'.")
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))]
+
+    return {
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": round(pick(50), 4),
+        "p90": round(pick(90), 4),
+        "p99": round(pick(99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+async def _drive(operation: Callable[[int], Awaitable[Any]], indices: List[int], concurrency: int):
+    """Runs `operation` over `indices` with `concurrency` closed-loop workers."""
+    latencies: List[float] = []
+    overheads: List[float] = []
+    errors = 0
+    cursor = iter(indices)
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in cursor:
+            bucket = [0.0]
+            token = backend_time.set(bucket)
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                errors += 1
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                backend_time.reset(token)
+            latencies.append(elapsed_ms)
+            overheads.append(max(0.0, elapsed_ms - bucket[0]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, overheads, errors, time.perf_counter() - start
+
+
+async def run_scenario(
+    scenario: Scenario,
+    requests: int,
+    latency_specs: Dict[str, Dict[str, Any]],
+    seed: int,
+    karta_config: Dict[str, Any],
+) -> Dict[str, Any]:
+    env = await build_environment(scenario, latency_specs, seed, karta_config)
+    try:
+        operation = _make_operation(env, scenario)
+        if scenario.cache == "warm":
+            # Prime every key once so that the measured pass only sees repeats.
+            await _drive(operation, list(range(WARM_KEY_POOL)), scenario.concurrency)
+        calls_before = env.backend_calls()
+        latencies, overheads, errors, elapsed = await _drive(
+            operation, list(range(requests)), scenario.concurrency
+        )
+        calls_after = env.backend_calls()
+    finally:
+        await env.close()
+
+    return {
+        "name": scenario.name,
+        **asdict(scenario),
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _percentiles(latencies),
+        "overhead_ms": _percentiles(overheads),
+        "backend_calls_per_request": {
+            name: round((calls_after[name] - calls_before[name]) / requests, 4) for name in calls_after
+        },
+    }
+
+
+def build_scenarios(args: argparse.Namespace) -> List[Scenario]:
+    scenarios = []
+    for operation, concurrency, cache in itertools.product(args.operations, args.concurrency, args.cache):
+        strategies = args.strategies if operation == "lookup_fact" else ["semantic"]
+        for strategy in strategies:
+            scenarios.append(Scenario(operation, concurrency, cache, strategy))
+    return scenarios
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run Karta's offline benchmark suite.")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--cache", nargs="+", choices=CACHE_STATES, default=list(CACHE_STATES))
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=sorted(STRATEGIES))
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario.")
+    parser.add_argument("--profile", choices=sorted(LATENCY_PROFILES), default="fast")
+    parser.add_argument(
+        "--latency-config", help="JSON file overriding latency models per backend, merged over --profile."
+    )
+    parser.add_argument("--karta-config", help="JSON file merged into the `karta` extension configuration.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file.")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    latency_specs = copy.deepcopy(LATENCY_PROFILES[args.profile])
+    if args.latency_config:
+        with open(args.latency_config, encoding="utf-8") as f:
+            latency_specs = _deep_merge(latency_specs, json.load(f))
+    karta_config: Dict[str, Any] = {}
+    if args.karta_config:
+        with open(args.karta_config, encoding="utf-8") as f:
+            karta_config = json.load(f)
+
+    results = []
+    for scenario in build_scenarios(args):
+        result = await run_scenario(scenario, args.requests, latency_specs, args.seed, karta_config)
+        results.append(result)
+        print(
+            f"{result['name']:<45} {result['throughput_rps']:>9.1f} rps  "
+            f"p50 {result['latency_ms']['p50']:>8.2f} ms  p99 {result['latency_ms']['p99']:>8.2f} ms  "
+            f"overhead p50 {result['overhead_ms']['p50']:>7.3f} ms"
+        )
+
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "settings": {
+            "profile": args.profile,
+            "latency": latency_specs,
+            "karta_config": karta_config,
+            "requests": args.requests,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.ERROR)
+    args = _parse_args(argv)
+    report = asyncio.run(_main(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
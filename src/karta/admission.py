@@ -0,0 +1,283 @@
+# karta-engine/src/karta/admission.py
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from karta.deadline import remaining_time
+from karta.observability import NOOP_INSTRUMENTATION, Instrumentation
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+# Lower values are admitted first.
+PRIORITIES = {INTERACTIVE: 0, BATCH: 1}
+
+# Key under which LLM calls made through the scheduler are limited.
+LLM_LIMIT_KEY = "llm"
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a call would have to wait longer for capacity than it is allowed to."""
+
+    def __init__(self, key: str, reason: str, wait_ms: Optional[float] = None):
+        self.key = key
+        self.reason = reason
+        self.wait_ms = wait_ms
+        detail = f" (estimated wait {wait_ms:.0f} ms)" if wait_ms is not None else ""
+        super().__init__(f"Admission to '{key}' rejected: {reason}{detail}.")
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations: a caller takes a token now and
+    learns how long it must wait for it, so waits can be rejected up front.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[float] = None):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst if burst is not None else max(1.0, rate_per_second))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token would be available, without reserving it."""
+        self._refill()
+        return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    def reserve(self) -> float:
+        """Takes a token, possibly on credit, and returns how many seconds to wait before using it."""
+        self._refill()
+        self._tokens -= 1.0
+        return max(0.0, -self._tokens / self.rate)
+
+    def refund(self) -> None:
+        """Returns a reserved token that was never used."""
+        self._tokens = min(self.capacity, self._tokens + 1.0)
+
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class PrioritySemaphore:
+    """A concurrency limit whose waiters are admitted by priority class, then FIFO."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def try_acquire(self) -> bool:
+        if self.in_use < self.limit and not self.queue_depth:
+            self.in_use += 1
+            return True
+        return False
+
+    async def acquire(self, priority: int) -> None:
+        if self.try_acquire():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the waiter gave up; pass it on.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter; `in_use` is unchanged.
+                future.set_result(None)
+                return
+        self.in_use -= 1
+
+
+class PriorityRateLimiter:
+    """
+    Hands out a token bucket's tokens to queued callers by priority class,
+    then FIFO, so batch callers waiting for tokens never delay interactive ones.
+    """
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def estimated_wait(self, priority: int) -> float:
+        """Seconds a caller of `priority` would wait, behind the queued callers of equal or higher priority."""
+        ahead = sum(1 for rank, _, future in self._waiters if rank <= priority and not future.done())
+        return max(0.0, (ahead + 1 - self.bucket.available()) / self.bucket.rate)
+
+    def try_acquire(self) -> bool:
+        if not self.queue_depth and self.bucket.available() >= 1.0:
+            self.bucket.reserve()
+            return True
+        return False
+
+    async def acquire(self, priority: int) -> None:
+        if self.try_acquire():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was handed over just as the waiter gave up; put it back.
+                self.bucket.refund()
+            raise
+
+    async def _drain(self) -> None:
+        """Releases one token per refill interval to the highest-priority waiter."""
+        while True:
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                return
+            wait_s = self.bucket.wait_time()
+            if wait_s > 0:
+                await asyncio.sleep(wait_s)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            self.bucket.reserve()
+            future.set_result(None)
+
+
+class _Limit:
+    def __init__(self, config: Dict[str, Any]):
+        rate = config.get("rate_per_second")
+        self.rate_limiter = PriorityRateLimiter(TokenBucket(rate, config.get("burst"))) if rate else None
+        max_concurrency = config.get("max_concurrency")
+        self.semaphore = PrioritySemaphore(int(max_concurrency)) if max_concurrency else None
+        self.max_queue_wait_ms = config.get("max_queue_wait_ms", 1000.0)
+
+
+class AdmissionController:
+    """
+    Per-provider rate limits and concurrency caps, enforced before each call.
+
+    Limits are configured per key (a provider ID, or "llm" for LLM calls), with
+    `default` applying to keys not listed. Callers whose estimated wait exceeds
+    `max_queue_wait_ms`, or the time left before their deadline, are rejected
+    immediately with `AdmissionRejected` rather than queued, so overload
+    degrades into fast failures instead of ever-growing queues. Interactive
+    callers are admitted ahead of batch ones.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, instrumentation: Optional[Instrumentation] = None):
+        config = config or {}
+        self.metrics = instrumentation or NOOP_INSTRUMENTATION
+        self._default_config: Dict[str, Any] = config.get("default", {})
+        self._configs: Dict[str, Dict[str, Any]] = config.get("providers", {})
+        self._limits: Dict[str, Optional[_Limit]] = {}
+
+    def _limit_for(self, key: str) -> Optional[_Limit]:
+        if key not in self._limits:
+            limit_config = {**self._default_config, **self._configs.get(key, {})}
+            limit = _Limit(limit_config)
+            self._limits[key] = limit if (limit.rate_limiter or limit.semaphore) else None
+        return self._limits[key]
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {
+            key: sum(queue.queue_depth for queue in (limit.rate_limiter, limit.semaphore) if queue is not None)
+            for key, limit in self._limits.items()
+            if limit
+        }
+
+    def _reject(self, key: str, reason: str, wait_ms: Optional[float] = None) -> AdmissionRejected:
+        self.metrics.increment("karta.admission.rejected", key=key, reason=reason)
+        return AdmissionRejected(key, reason, wait_ms)
+
+    @asynccontextmanager
+    async def admit(self, key: str, priority: Optional[str] = None) -> AsyncIterator[None]:
+        limit = self._limit_for(key)
+        if limit is None:
+            yield
+            return
+
+        started = time.monotonic()
+        rank = PRIORITIES.get(priority or current_priority(), PRIORITIES[BATCH])
+        # Never queue past the caller's deadline.
+        max_wait_s = remaining_time(None if limit.max_queue_wait_ms is None else limit.max_queue_wait_ms / 1000.0)
+        if limit.rate_limiter is not None and not limit.rate_limiter.try_acquire():
+            # Only callers of equal or higher priority are ahead; queued batch callers are not.
+            wait_s = limit.rate_limiter.estimated_wait(rank)
+            if max_wait_s is not None and wait_s > max_wait_s:
+                raise self._reject(key, "rate_limited", wait_s * 1000.0)
+            try:
+                await asyncio.wait_for(limit.rate_limiter.acquire(rank), timeout=max_wait_s)
+            except asyncio.TimeoutError:
+                # Overtaken by higher-priority callers while queued.
+                raise self._reject(key, "rate_limited", (time.monotonic() - started) * 1000.0) from None
+
+        if limit.semaphore is not None and not limit.semaphore.try_acquire():
+            remaining_s = None if max_wait_s is None else max(0.0, max_wait_s - (time.monotonic() - started))
+            self.metrics.set_gauge("karta.admission.queue_depth", limit.semaphore.queue_depth + 1, key=key)
+            try:
+                await asyncio.wait_for(limit.semaphore.acquire(rank), timeout=remaining_s)
+            except asyncio.TimeoutError:
+                raise self._reject(key, "queue_timeout", (time.monotonic() - started) * 1000.0) from None
+            finally:
+                self.metrics.set_gauge("karta.admission.queue_depth", limit.semaphore.queue_depth, key=key)
+
+        self.metrics.observe("karta.admission.wait_ms", (time.monotonic() - started) * 1000.0, key=key)
+        try:
+            yield
+        finally:
+            if limit.semaphore is not None:
+                limit.semaphore.release()
+
+
+_current_priority: ContextVar[str] = ContextVar("karta_priority", default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    """Returns the priority class of the Karta call currently executing."""
+    return _current_priority.get()
+
+
+@contextmanager
+def use_priority(priority: Optional[str]) -> Iterator[None]:
+    """
+    Marks calls made within the block as `priority` ("interactive" or "batch").
+    None keeps the enclosing priority.
+    """
+    if priority is None:
+        yield
+        return
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority '{priority}'; expected one of {sorted(PRIORITIES)}.")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
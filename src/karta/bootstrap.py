@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 from genie_tooling.bootstrap import BootstrapPlugin
 from karta.interface import KartaInterface
 from karta.manager import KartaManager
+from karta.startup import StartupReport
 
 if TYPE_CHECKING:
     from genie_tooling.genie import Genie
@@ -17,13 +18,18 @@ class KartaEngineBootstrapPlugin(BootstrapPlugin):
 
     async def bootstrap(self, genie: "Genie") -> None:
         logger.info("KartaEngineBootstrapPlugin: Executing bootstrap logic...")
+        startup_report = StartupReport()
+        with startup_report.phase("bootstrap.total"):
+            await self._bootstrap(genie, startup_report)
+        startup_report.log()
 
-        
+    async def _bootstrap(self, genie: "Genie", startup_report: StartupReport) -> None:
         karta_config = genie._config.extension_configurations.get("karta", {})
 
         # Use the new public accessors for shared components.
-        core_embedder = await genie.get_default_embedder()
-        core_vector_store = await genie.get_default_vector_store()
+        with startup_report.phase("bootstrap.resolve_core_services"):
+            core_embedder = await genie.get_default_embedder()
+            core_vector_store = await genie.get_default_vector_store()
 
         if not core_embedder:
             raise RuntimeError("Karta Engine requires a default embedder to be configured in Genie.")
@@ -40,9 +46,11 @@ class KartaEngineBootstrapPlugin(BootstrapPlugin):
             plugin_manager=plugin_manager,
             embedder=core_embedder,
             vector_store=core_vector_store,
-            config=karta_config
+            config=karta_config,
+            startup_report=startup_report,
         )
-        await karta_manager.setup()
+        with startup_report.phase("bootstrap.manager_setup"):
+            await karta_manager.setup()
 
         karta_interface = KartaInterface(manager=karta_manager)
         setattr(genie, "karta", karta_interface)
@@ -0,0 +1,301 @@
+# karta-engine/src/karta/cache/backends.py
+"""
+Byte-oriented cache backends that Karta's caches can share across processes.
+
+`MemoryCacheBackend` is private to one process. `SqliteCacheBackend` keeps
+entries in a SQLite database in WAL mode, so every worker on a host that opens
+the same file shares them. `RespCacheBackend` speaks the Redis protocol (RESP)
+to Redis or any compatible server, sharing entries across hosts. Backends hold
+opaque bytes under string keys with an optional TTL; callers choose the
+encoding and namespace their keys.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """An in-process LRU; entries are lost with the process and not shared."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry[1]:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = float("inf") if ttl_seconds is None else time.monotonic() + ttl_seconds
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+class SqliteCacheBackend:
+    """
+    A cache in a SQLite database, shared by every process on the host that
+    opens the same file. WAL mode lets readers proceed while one process
+    writes. Expired rows are skipped on read and purged periodically.
+    """
+
+    _PURGE_EVERY = 1000
+
+    def __init__(self, path: str, max_entries: Optional[int] = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL) WITHOUT ROWID"
+        )
+        self._writes = 0
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl_seconds: Optional[float]) -> None:
+        expires_at = None if ttl_seconds is None else time.time() + ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self._PURGE_EVERY == 0:
+                self._purge()
+
+    def _purge(self) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        if self.max_entries is not None:
+            # Evict the entries closest to expiry (those without a TTL last).
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires_at IS NULL, expires_at "
+                "LIMIT max(0, (SELECT COUNT(*) FROM cache) - ?))",
+                (self.max_entries,),
+            )
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RespError(RuntimeError):
+    """An error reply from a Redis-protocol server."""
+
+
+RespValue = Union[None, int, bytes, str, List[Any]]
+
+
+class RespCacheBackend:
+    """
+    A minimal client for Redis and Redis-protocol servers, using GET, SET with
+    PX and DEL over one connection. Requests on the connection are serialized;
+    a dropped connection is re-opened on the next request.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        connect_timeout: float = 2.0,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.connect_timeout = connect_timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def _encode(*args: Union[str, bytes]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode("utf-8") if isinstance(arg, str) else arg
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> RespValue:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis-protocol server closed the connection.")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RespError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [await self._read_reply() for _ in range(count)]
+        raise ConnectionError(f"Unexpected Redis-protocol reply: {line[:32]!r}")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.connect_timeout
+        )
+        try:
+            if self.password:
+                await self._send("AUTH", self.password)
+            if self.db:
+                await self._send("SELECT", str(self.db))
+        except RespError:
+            await self._disconnect()
+            raise
+
+    async def _send(self, *args: Union[str, bytes]) -> RespValue:
+        try:
+            self._writer.write(self._encode(*args))
+            await self._writer.drain()
+            return await self._read_reply()
+        except RespError:
+            raise
+        except BaseException:
+            # Interrupted (e.g. cancelled) with the reply still in flight: the next command
+            # would read it as its own, so the connection cannot be reused.
+            self._abort()
+            raise
+
+    def _abort(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def execute(self, *args: Union[str, bytes]) -> RespValue:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            reconnected = self._writer is None
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(*args)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                await self._disconnect()
+                if reconnected:
+                    raise
+            # An idle connection may have been dropped by the server; retry once on a fresh one.
+            try:
+                await self._connect()
+                return await self._send(*args)
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                await self._disconnect()
+                raise
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._reader = self._writer = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        if ttl_seconds is None:
+            await self.execute("SET", key, value)
+        else:
+            await self.execute("SET", key, value, "PX", str(max(1, int(ttl_seconds * 1000))))
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def close(self) -> None:
+        if self._lock is None:
+            await self._disconnect()
+            return
+        async with self._lock:
+            await self._disconnect()
+
+
+def create_cache_backend(config: Optional[Dict[str, Any]]) -> Optional[CacheBackend]:
+    """
+    Builds a shared cache backend from a `backend` configuration block.
+
+    Config keys:
+        type (str): "memory", "sqlite" or "redis". No backend if unset.
+        max_entries (int): Entry limit for "memory" and "sqlite".
+        path (str): Database file for "sqlite".
+        host, port, db, password: Server address for "redis".
+    """
+    config = config or {}
+    backend_type = config.get("type")
+    if not backend_type:
+        return None
+    if backend_type == "memory":
+        return MemoryCacheBackend(max_entries=int(config.get("max_entries", 4096)))
+    if backend_type == "sqlite":
+        if not config.get("path"):
+            raise ValueError("The 'sqlite' cache backend requires a `path`.")
+        return SqliteCacheBackend(config["path"], max_entries=config.get("max_entries", 100_000))
+    if backend_type == "redis":
+        return RespCacheBackend(
+            host=config.get("host", "127.0.0.1"),
+            port=int(config.get("port", 6379)),
+            db=int(config.get("db", 0)),
+            password=config.get("password"),
+        )
+    raise ValueError(f"Unknown cache backend type '{backend_type}'; expected 'memory', 'sqlite' or 'redis'.")
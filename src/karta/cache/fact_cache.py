@@ -0,0 +1,151 @@
+# karta-engine/src/karta/cache/fact_cache.py
+
+import heapq
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from karta.types import Fact
+
+FactKey = Tuple[str, str]
+
+
+class _Entry:
+    __slots__ = ("fact", "expires_at", "hits", "query")
+
+    def __init__(self, fact: Fact, expires_at: float, query: Optional[Tuple[str, str]]):
+        self.fact = fact
+        self.expires_at = expires_at
+        self.hits = 0
+        # The (entity, attribute) as asked, before normalization, for re-resolving the entry.
+        self.query = query
+
+
+class FactCache:
+    """
+    An in-process LRU cache of resolved facts keyed by canonical
+    (entity, attribute), with an optional time-to-live.
+
+    With `stale_seconds`, an expired entry is kept for that much longer and
+    `lookup` still returns it, flagged as stale, so the caller can answer
+    immediately and refresh in the background. Each entry's TTL is shortened
+    by a random fraction of up to `ttl_jitter`, so entries stored together do
+    not all expire together.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: Optional[float] = 300.0,
+        stale_seconds: float = 0.0,
+        ttl_jitter: float = 0.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.ttl_jitter = ttl_jitter
+        self._entries: "OrderedDict[FactKey, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: FactKey) -> Tuple[Optional[Fact], bool]:
+        """Returns (fact, is_stale), or (None, False) on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        now = time.monotonic()
+        stale = now > entry.expires_at
+        if stale and now > entry.expires_at + self.stale_seconds:
+            del self._entries[key]
+            return None, False
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        return entry.fact, stale
+
+    def get(self, key: FactKey) -> Optional[Fact]:
+        """Returns the fact only while it is fresh."""
+        fact, stale = self.lookup(key)
+        return None if stale else fact
+
+    def put(self, key: FactKey, fact: Fact, query: Optional[Tuple[str, str]] = None) -> None:
+        if self.ttl_seconds is None:
+            expires_at = float("inf")
+        else:
+            ttl = self.ttl_seconds * (1.0 - self.ttl_jitter * random.random())
+            expires_at = time.monotonic() + ttl
+        entry = _Entry(fact, expires_at, query)
+        previous = self._entries.get(key)
+        if previous is not None:
+            # A refresh keeps the key's hotness.
+            entry.hits = previous.hits
+            entry.query = query or previous.query
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def query_for(self, key: FactKey) -> Tuple[str, str]:
+        """The (entity, attribute) the entry was resolved for, falling back to the normalized key."""
+        entry = self._entries.get(key)
+        return entry.query if entry is not None and entry.query else key
+
+    def hottest(self, n: int, expiring_within: Optional[float] = None) -> List[FactKey]:
+        """
+        The `n` most requested keys, optionally only those that expire (or have
+        expired) within `expiring_within` seconds.
+        """
+        candidates = self._entries.items()
+        if expiring_within is not None:
+            horizon = time.monotonic() + expiring_within
+            candidates = [(key, entry) for key, entry in candidates if entry.expires_at <= horizon]
+        ranked = heapq.nlargest(n, candidates, key=lambda item: item[1].hits)
+        return [key for key, entry in ranked if entry.hits > 0]
+
+    def decay_hits(self, factor: float = 0.5) -> None:
+        """Scales down hit counts so that hotness reflects recent traffic."""
+        for entry in self._entries.values():
+            entry.hits = int(entry.hits * factor)
+
+    def export_entries(self) -> List[Dict[str, Any]]:
+        """Entries in LRU order, with their remaining TTL in seconds (None for no expiry)."""
+        now = time.monotonic()
+        return [
+            {
+                "key": list(key),
+                "query": list(entry.query) if entry.query else None,
+                "fact": entry.fact.model_dump(),
+                "ttl": None if entry.expires_at == float("inf") else round(entry.expires_at - now, 3),
+                "hits": entry.hits,
+            }
+            for key, entry in self._entries.items()
+        ]
+
+    def restore_entries(self, entries: List[Dict[str, Any]], age_seconds: float = 0.0) -> int:
+        """
+        Loads entries written by `export_entries` `age_seconds` ago, skipping
+        those that are past their stale window by now. Returns how many were loaded.
+        """
+        now = time.monotonic()
+        restored = 0
+        for record in entries:
+            ttl = record.get("ttl")
+            if ttl is not None and ttl - age_seconds + self.stale_seconds < 0:
+                continue
+            entry = _Entry(
+                Fact(**record["fact"]),
+                float("inf") if ttl is None else now + ttl - age_seconds,
+                tuple(record["query"]) if record.get("query") else None,
+            )
+            entry.hits = int(record.get("hits", 0))
+            key = tuple(record["key"])
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            restored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return restored
+
+    def clear(self) -> None:
+        self._entries.clear()
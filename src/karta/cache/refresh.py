@@ -0,0 +1,102 @@
+# karta-engine/src/karta/cache/refresh.py
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from karta.cache.fact_cache import FactCache, FactKey
+from karta.observability import NOOP_INSTRUMENTATION, Instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class FactRefresher:
+    """
+    Re-resolves cached facts in the background.
+
+    Stale entries served by the cache are queued for refresh with
+    `request_refresh`. With `prewarm_top_n`, a periodic pass also refreshes the
+    hottest keys that are about to expire, so they never go stale at all. At
+    most `max_concurrent` refreshes run at once and at most `max_pending` wait;
+    further requests are dropped, since the stale value is still being served.
+    Every refresh starts after a random delay of up to `jitter_seconds` so that
+    keys requested together are not all re-resolved together.
+    """
+
+    def __init__(
+        self,
+        cache: FactCache,
+        refresh: Callable[[FactKey], Awaitable[Any]],
+        config: Optional[Dict[str, Any]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        config = config or {}
+        self.cache = cache
+        self._refresh = refresh
+        self.metrics = instrumentation or NOOP_INSTRUMENTATION
+        self.max_concurrent = int(config.get("max_concurrent", 4))
+        self.max_pending = int(config.get("max_pending", 256))
+        self.jitter_seconds = float(config.get("jitter_seconds", 1.0))
+        self.prewarm_top_n = int(config.get("prewarm_top_n", 0))
+        self.prewarm_interval_seconds = float(config.get("prewarm_interval_seconds", 60.0))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_progress: Set[FactKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._prewarm_task: Optional[asyncio.Task] = None
+
+    def request_refresh(self, key: FactKey) -> bool:
+        """Schedules a background refresh of `key`; returns False if it was already queued or dropped."""
+        if key in self._in_progress:
+            return False
+        if len(self._in_progress) >= self.max_concurrent + self.max_pending:
+            self.metrics.increment("karta.fact_cache.refreshes", outcome="dropped")
+            return False
+        self._in_progress.add(key)
+        task = asyncio.create_task(self._run(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, key: FactKey) -> None:
+        try:
+            if self.jitter_seconds > 0:
+                await asyncio.sleep(random.uniform(0.0, self.jitter_seconds))
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            async with self._semaphore:
+                with self.metrics.timer("karta.fact_cache.refresh_ms"):
+                    await self._refresh(key)
+            self.metrics.increment("karta.fact_cache.refreshes", outcome="done")
+        except Exception as e:
+            self.metrics.increment("karta.fact_cache.refreshes", outcome="error")
+            logger.warning(f"Background refresh of {key} failed: {e}", exc_info=True)
+        finally:
+            self._in_progress.discard(key)
+
+    def prewarm(self) -> int:
+        """Queues refreshes for the hottest keys expiring before the next pass; returns how many were queued."""
+        keys = self.cache.hottest(self.prewarm_top_n, expiring_within=self.prewarm_interval_seconds)
+        self.cache.decay_hits()
+        return sum(self.request_refresh(key) for key in keys)
+
+    async def _prewarm_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.prewarm_interval_seconds * random.uniform(0.9, 1.1))
+            queued = self.prewarm()
+            if queued:
+                logger.debug(f"Pre-warming {queued} hot facts.")
+
+    def start(self) -> None:
+        """Starts the periodic pre-warm pass, if `prewarm_top_n` is set."""
+        if self.prewarm_top_n > 0 and self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self._prewarm_loop())
+
+    async def close(self) -> None:
+        """Stops pre-warming and waits for in-flight refreshes."""
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            await asyncio.gather(self._prewarm_task, return_exceptions=True)
+            self._prewarm_task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
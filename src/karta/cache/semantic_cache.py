@@ -0,0 +1,117 @@
+# karta-engine/src/karta/cache/semantic_cache.py
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from karta.types import Fact
+
+
+class SemanticFactCache:
+    """
+    Answers paraphrased questions from facts already resolved for a similar query.
+
+    Query embeddings are kept as unit vectors in a fixed-size ring buffer, so a
+    lookup is one matrix-vector product against every cached query. The
+    embedding is the one `KnowledgeRouter` computes for routing, so a lookup
+    adds no embedding call. With `match_entity` (the default) a hit also
+    requires the same canonical entity, which keeps "population of France"
+    from answering "population of Germany".
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.93,
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = 300.0,
+        match_entity: bool = True,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.match_entity = match_entity
+        self._matrix: Optional[np.ndarray] = None
+        self._stored_at = np.full(max_entries, -np.inf)
+        self._facts: List[Optional[Fact]] = [None] * max_entries
+        self._entity_keys: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _unit(vector: Any) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else None
+
+    def lookup(self, query_embedding: Any, entity_key: str) -> Optional[Tuple[Fact, float]]:
+        """Returns the cached fact most similar to the query, with its similarity, if above threshold."""
+        if not self._size:
+            return None
+        vector = self._unit(query_embedding)
+        if vector is None or vector.shape[0] != self._matrix.shape[1]:
+            return None
+        similarities = self._matrix[: self._size] @ vector
+        if self.ttl_seconds is not None:
+            expired = self._stored_at[: self._size] < time.monotonic() - self.ttl_seconds
+            similarities[expired] = -np.inf
+        candidates = np.flatnonzero(similarities >= self.threshold)
+        for row in candidates[np.argsort(-similarities[candidates])]:
+            if not self.match_entity or self._entity_keys[row] == entity_key:
+                return self._facts[row], float(similarities[row])
+        return None
+
+    def add(self, query_embedding: Any, entity_key: str, fact: Fact) -> None:
+        vector = self._unit(query_embedding)
+        if vector is None:
+            return
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            return
+        # Overwrite the oldest entry once the buffer is full.
+        row = self._next
+        self._matrix[row] = vector
+        self._stored_at[row] = time.monotonic()
+        self._facts[row] = fact
+        self._entity_keys[row] = entity_key
+        self._next = (row + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+    def _rows_oldest_first(self) -> List[int]:
+        if self._size < self.max_entries:
+            return list(range(self._size))
+        return list(range(self._next, self.max_entries)) + list(range(self._next))
+
+    def export_state(self) -> Tuple[Optional[np.ndarray], List[Dict[str, Any]]]:
+        """The cached query embeddings, oldest first, and a record per row with its entity key, fact and age."""
+        rows = self._rows_oldest_first()
+        if not rows:
+            return None, []
+        now = time.monotonic()
+        records = [
+            {"entity": self._entity_keys[row], "fact": self._facts[row].model_dump(), "age": round(now - self._stored_at[row], 3)}
+            for row in rows
+        ]
+        return self._matrix[rows], records
+
+    def restore_state(self, matrix: np.ndarray, records: List[Dict[str, Any]], age_seconds: float = 0.0) -> int:
+        """Loads what `export_state` returned `age_seconds` ago, skipping expired rows. Returns how many were loaded."""
+        if self._matrix is not None and matrix.shape[1] != self._matrix.shape[1]:
+            return 0
+        restored = 0
+        for vector, record in zip(matrix, records):
+            age = record["age"] + age_seconds
+            if self.ttl_seconds is not None and age > self.ttl_seconds:
+                continue
+            self.add(vector, record["entity"], Fact(**record["fact"]))
+            self._stored_at[(self._next - 1) % self.max_entries] = time.monotonic() - age
+            restored += 1
+        return restored
+
+    def clear(self) -> None:
+        self._size = self._next = 0
+        self._stored_at[:] = -np.inf
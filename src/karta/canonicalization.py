@@ -0,0 +1,169 @@
+# karta-engine/src/karta/canonicalization.py
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from karta.chunks import embed_texts
+from karta.normalization import normalize_text
+from karta.observability import NOOP_INSTRUMENTATION, Instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class Vocabulary:
+    """
+    Canonical names of one kind (entities or attributes) with unit-normalized
+    embeddings kept in a single matrix, so the nearest known name to a query is
+    one matrix-vector product.
+    """
+
+    def __init__(self, threshold: float, max_size: int = 50_000):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.names: List[str] = []
+        # Normalized surface form -> canonical name, for every variant already resolved.
+        self.aliases: Dict[str, str] = {}
+        self._matrix: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve_exact(self, text: str) -> Optional[str]:
+        return self.aliases.get(normalize_text(text))
+
+    def add_alias(self, alias: str, canonical: str) -> None:
+        if len(self.aliases) < self.max_size * 4:
+            self.aliases[normalize_text(alias)] = canonical
+
+    def nearest(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        if not self.names:
+            return None, 0.0
+        similarities = self._matrix[: len(self.names)] @ vector
+        best = int(np.argmax(similarities))
+        score = float(similarities[best])
+        return (self.names[best] if score >= self.threshold else None), score
+
+    def export_state(self) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        matrix = self._matrix[: len(self.names)] if self._matrix is not None and self.names else None
+        return matrix, {"names": list(self.names), "aliases": dict(self.aliases)}
+
+    def restore_state(self, matrix: Optional[np.ndarray], state: Dict[str, Any]) -> None:
+        """Adds the names and aliases of an exported vocabulary to this one."""
+        if matrix is not None:
+            for name, vector in zip(state["names"], matrix):
+                if self.resolve_exact(name) is None:
+                    self.add(name, np.array(vector, dtype=np.float32))
+        for alias, canonical in state["aliases"].items():
+            self.aliases.setdefault(alias, canonical)
+
+    def add(self, name: str, vector: np.ndarray) -> None:
+        self.add_alias(name, name)
+        if len(self.names) >= self.max_size:
+            return
+        if self._matrix is None:
+            self._matrix = np.empty((64, vector.shape[0]), dtype=np.float32)
+        elif len(self.names) == self._matrix.shape[0]:
+            # Grow geometrically so that adding names stays amortized O(1).
+            self._matrix = np.concatenate([self._matrix, np.empty_like(self._matrix)])
+        self._matrix[len(self.names)] = vector
+        self.names.append(name)
+
+
+class Canonicalizer:
+    """
+    Maps surface variants of entity and attribute names to one canonical form
+    before routing and caching.
+
+    Variants that normalize identically ("The Eiffel Tower", "eiffel tower") are
+    resolved through an alias table. With `fuzzy` enabled, names never seen
+    before are embedded and matched against known names by cosine similarity,
+    so "total height" can resolve to "height". Unmatched names become canonical
+    themselves.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,
+        config: Optional[Dict[str, Any]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        config = config or {}
+        self.embedder = embedder
+        self.fuzzy = bool(config.get("fuzzy", False))
+        self.metrics = instrumentation or NOOP_INSTRUMENTATION
+        max_size = int(config.get("max_vocabulary", 50_000))
+        self.entities = Vocabulary(float(config.get("entity_threshold", 0.92)), max_size)
+        self.attributes = Vocabulary(float(config.get("attribute_threshold", 0.85)), max_size)
+        for alias, canonical in config.get("entity_aliases", {}).items():
+            self.entities.add_alias(alias, canonical)
+        for alias, canonical in config.get("attribute_aliases", {}).items():
+            self.attributes.add_alias(alias, canonical)
+        self._lock = asyncio.Lock()
+
+    async def canonicalize(self, entity: str, attribute: str) -> Tuple[str, str]:
+        return (await self.canonicalize_many([(entity, attribute)]))[0]
+
+    async def canonicalize_many(self, pairs: Sequence[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Canonicalizes (entity, attribute) pairs. With `fuzzy` enabled, all the
+        names not resolved by alias are embedded in one call.
+        """
+        pending: Dict[Tuple[str, str], Tuple[Vocabulary, str]] = {}
+        for entity, attribute in pairs:
+            canonical_entity = self.entities.resolve_exact(entity)
+            canonical_attribute = self.attributes.resolve_exact(attribute)
+            if canonical_entity is not None and canonical_attribute is not None:
+                self.metrics.increment("karta.canonicalization.resolved", method="alias")
+                continue
+            if self.fuzzy:
+                if canonical_entity is None:
+                    pending.setdefault(("entity", entity), (self.entities, entity))
+                if canonical_attribute is None:
+                    pending.setdefault(("attribute", attribute), (self.attributes, attribute))
+
+        if pending:
+            # Embed outside the lock so that concurrent callers' embedding calls overlap.
+            items = list(pending.values())
+            vectors = await self._embed([text for _, text in items])
+            # Vocabulary updates are serialized, and names are re-checked, so that
+            # near-duplicates resolved concurrently do not both become canonical.
+            async with self._lock:
+                for (vocabulary, text), vector in zip(items, vectors):
+                    if vocabulary.resolve_exact(text) is not None:
+                        continue
+                    if vector is None:
+                        vocabulary.add_alias(text, text)
+                        continue
+                    match, score = vocabulary.nearest(vector)
+                    if match is None:
+                        vocabulary.add(text, vector)
+                    else:
+                        logger.debug(f"Canonicalized '{text}' to '{match}' (similarity {score:.3f}).")
+                        self.metrics.increment("karta.canonicalization.resolved", method="embedding")
+                        vocabulary.add_alias(text, match)
+
+        # Without `fuzzy`, normalization alone already gives variants one cache key.
+        return [
+            (self.entities.resolve_exact(entity) or entity, self.attributes.resolve_exact(attribute) or attribute)
+            for entity, attribute in pairs
+        ]
+
+    async def _embed(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        try:
+            with self.metrics.timer("karta.canonicalization.embedding_ms"):
+                embedded = await embed_texts(self.embedder, texts)
+        except Exception as e:
+            logger.warning(f"Could not embed names for canonicalization: {e}", exc_info=True)
+            return vectors
+        for i, vector in enumerate(embedded):
+            if vector is None:
+                continue
+            array = np.asarray(vector, dtype=np.float32)
+            norm = float(np.linalg.norm(array))
+            if norm > 0:
+                vectors[i] = array / norm
+        return vectors
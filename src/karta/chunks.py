@@ -0,0 +1,42 @@
+# karta-engine/src/karta/chunks.py
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+
+class TextChunk:
+    """A minimal object satisfying Genie's `Chunk` protocol, for text handed to an embedder."""
+
+    __slots__ = ("id", "content", "metadata")
+
+    def __init__(self, chunk_id: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+        self.id = chunk_id
+        self.content = content
+        self.metadata: Dict[str, Any] = metadata if metadata is not None else {}
+
+    def __repr__(self) -> str:
+        return f"TextChunk({self.id!r}, {self.content[:40]!r})"
+
+
+async def iter_chunks(chunks: Iterable[TextChunk]) -> AsyncIterator[TextChunk]:
+    """Adapts chunks already in memory to the async stream embedders consume."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def embed_texts(embedder: Any, texts: List[str]) -> List[Optional[Any]]:
+    """
+    Embeds `texts` with one embedder call. Returns the vectors in input order,
+    with None wherever the embedder returned nothing.
+    """
+    vectors: List[Optional[Any]] = [None] * len(texts)
+    if not texts:
+        return vectors
+    stream = await embedder.embed(chunks=iter_chunks(TextChunk(str(i), text) for i, text in enumerate(texts)))
+    position = 0
+    async for chunk, vector in stream:
+        # Embedders yield in input order; chunk IDs tell us the position when some are skipped.
+        index = int(chunk.id) if isinstance(chunk, TextChunk) else position
+        if index < len(vectors):
+            vectors[index] = vector
+        position = index + 1
+    return vectors
@@ -0,0 +1,210 @@
+# karta-engine/src/karta/cli.py
+"""
+Offline maintenance commands for Karta.
+
+    karta import-facts catalog.csv --wide --entity-column sku --output catalog.kfi
+    karta import-facts facts.jsonl more_facts.parquet --output facts.kfi
+    karta replay decisions.jsonl --candidate tight=tight.json --candidate rules=rules.json
+    karta train-prerouter decisions.jsonl --output prerouter.npz
+    karta precompute manifest.json --genie myapp.karta:create_genie --store facts.sqlite3
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from karta.precompute import Checkpoint, load_manifest, precompute
+from karta.routing.decision_log import read_decisions
+from karta.routing.lexical import LinearQueryClassifier
+from karta.routing.replay import replay, training_examples
+from karta.store.bulk_import import SUPPORTED_FORMATS, import_facts
+from karta.store.sqlite_store import SqliteFactStore
+
+
+def _import_facts(args: argparse.Namespace) -> int:
+    stats = import_facts(
+        args.inputs,
+        args.output,
+        fmt=args.format,
+        entity_column=args.entity_column,
+        attribute_column=args.attribute_column,
+        value_column=args.value_column,
+        source=args.source,
+        wide=args.wide,
+    )
+    print(
+        f"Wrote {stats.facts_written} facts to {args.output} "
+        f"({stats.rows_read} rows read, {stats.rows_skipped} skipped)."
+    )
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    candidates: Dict[str, Dict] = {}
+    for spec in args.candidate:
+        name, separator, path = spec.partition("=")
+        if not separator:
+            name, path = os.path.splitext(os.path.basename(spec))[0], spec
+        with open(path, encoding="utf-8") as f:
+            candidates[name] = json.load(f)
+    report = replay(read_decisions(args.logs), candidates)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "baseline": report.baseline.as_dict(),
+                    "candidates": [c.as_dict() for c in report.candidates],
+                    "savings": report.savings(),
+                },
+                indent=2,
+            )
+        )
+        return 0
+    print(f"{'config':<24} {'lookups':>8} {'calls/q':>8} {'ms/q':>9} {'answered':>9} {'changed':>8}")
+    for result in [report.baseline] + report.candidates:
+        row = result.as_dict()
+        print(
+            f"{result.name:<24} {result.lookups:>8} {row.get('calls_per_lookup', 0):>8.3f} "
+            f"{row.get('latency_ms_per_lookup', 0):>9.1f} {row.get('answer_rate', 0):>9.1%} {result.cascade_changes:>8}"
+        )
+    for saving in report.savings():
+        print(
+            f"{saving['name']}: {saving['calls_saved']:+.1f} calls, "
+            f"{saving['latency_ms_saved']:+.1f} ms saved, answer rate {saving['answer_rate_change']:+.1%}"
+        )
+    return 0
+
+
+def _train_prerouter(args: argparse.Namespace) -> int:
+    examples = training_examples(read_decisions(args.logs))
+    if not examples:
+        print("No answered lookups found in the decision log.", file=sys.stderr)
+        return 1
+    providers = {provider_id for _, provider_id in examples}
+    if len(providers) < 2:
+        # A one-class classifier is always confident and would pre-route every query to that provider.
+        print(
+            f"Need answers from at least two providers to train a pre-router; the log only has {sorted(providers)}.",
+            file=sys.stderr,
+        )
+        return 1
+    classifier = LinearQueryClassifier.fit(examples, dim=args.dim, epochs=args.epochs)
+    classifier.save(args.output)
+    print(f"Trained on {len(examples)} lookups for {len(classifier.labels)} providers; wrote {args.output}.")
+    return 0
+
+
+async def _create_genie(spec: str) -> Any:
+    module_name, separator, attribute = spec.partition(":")
+    if not separator:
+        raise ValueError(f"Expected 'module:factory', got '{spec}'.")
+    genie = getattr(importlib.import_module(module_name), attribute)()
+    return await genie if inspect.isawaitable(genie) else genie
+
+
+async def _run_precompute(args: argparse.Namespace) -> int:
+    keys = load_manifest(args.manifest)
+    genie = await _create_genie(args.genie)
+    manager = genie.karta._manager
+    checkpoint = Checkpoint(args.checkpoint or f"{args.manifest}.checkpoint")
+    store = SqliteFactStore(args.store) if args.store else None
+    try:
+        stats = await precompute(
+            manager,
+            keys,
+            concurrency=args.concurrency,
+            rate_per_second=args.rate,
+            checkpoint=checkpoint,
+            store=store,
+            timeout=args.timeout,
+        )
+        await manager.close()
+        if args.snapshot:
+            manager.export_snapshot(args.snapshot)
+    finally:
+        checkpoint.close()
+        if store is not None:
+            store.close()
+        if hasattr(genie, "close"):
+            await genie.close()
+    print(
+        f"Precomputed {stats.keys} keys in {stats.elapsed_seconds:.1f}s: {stats.found} found, "
+        f"{stats.not_found} not found, {stats.errors} errors, {stats.skipped} already done."
+    )
+    return 1 if stats.errors else 0
+
+
+def _precompute(args: argparse.Namespace) -> int:
+    return asyncio.run(_run_precompute(args))
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="karta", description="Karta Engine maintenance commands.")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser(
+        "import-facts", help="Compile CSV, JSONL or Parquet data into a memory-mapped fact index."
+    )
+    importer.add_argument("inputs", nargs="+", help="Data files; later files win on conflicting facts.")
+    importer.add_argument("--output", "-o", required=True, help="Path of the index file to write.")
+    importer.add_argument("--format", choices=SUPPORTED_FORMATS, help="Defaults to the file extension.")
+    importer.add_argument("--wide", action="store_true", help="One row per entity; other columns are attributes.")
+    importer.add_argument("--entity-column", default="entity")
+    importer.add_argument("--attribute-column", default="attribute")
+    importer.add_argument("--value-column", default="value")
+    importer.add_argument("--source", help="Source recorded on each fact. Defaults to the input file name.")
+    importer.set_defaults(handler=_import_facts)
+
+    replayer = commands.add_parser(
+        "replay", help="Re-run a routing decision log against alternative router configurations."
+    )
+    replayer.add_argument("logs", nargs="+", help="Decision log files; rotated backups are included.")
+    replayer.add_argument(
+        "--candidate", action="append", default=[], metavar="NAME=CONFIG.json",
+        help="A `fact_lookup` router config to evaluate, plus optional `top_k`. Repeatable.",
+    )
+    replayer.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    replayer.set_defaults(handler=_replay)
+
+    trainer = commands.add_parser(
+        "train-prerouter", help="Train the pre-router's linear classifier on a decision log."
+    )
+    trainer.add_argument("logs", nargs="+")
+    trainer.add_argument("--output", "-o", required=True, help="Path of the classifier file (.npz) to write.")
+    trainer.add_argument("--dim", type=int, default=4096)
+    trainer.add_argument("--epochs", type=int, default=200)
+    trainer.set_defaults(handler=_train_prerouter)
+
+    precomputer = commands.add_parser(
+        "precompute", help="Resolve every (entity, attribute) key in a manifest ahead of production traffic."
+    )
+    precomputer.add_argument("manifest", help="JSON manifest of entity and attribute sets.")
+    precomputer.add_argument(
+        "--genie", required=True, metavar="MODULE:FACTORY",
+        help="A function returning (or awaiting to) a Genie instance with Karta configured.",
+    )
+    precomputer.add_argument("--store", help="Also write found facts to this SQLite fact store.")
+    precomputer.add_argument("--snapshot", help="Write a Karta snapshot with the resolved facts when done.")
+    precomputer.add_argument("--checkpoint", help="Progress file for resuming. Defaults to MANIFEST.checkpoint.")
+    precomputer.add_argument("--concurrency", type=int, default=8, help="Lookups in flight at once.")
+    precomputer.add_argument("--rate", type=float, help="Lookups started per second at most.")
+    precomputer.add_argument("--timeout", type=float, help="Deadline per lookup, in seconds.")
+    precomputer.set_defaults(handler=_precompute)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# karta-engine/src/karta/deadline.py
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """A point in time by which a Karta call must have returned."""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, timeout_s: float):
+        self.expires_at = time.monotonic() + max(0.0, float(timeout_s))
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def remaining_ms(self) -> float:
+        return self.remaining() * 1000.0
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("karta_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Returns the deadline of the Karta call currently executing, if it has one."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def use_deadline(timeout_s: Optional[float]) -> Iterator[None]:
+    """
+    Gives calls made within the block `timeout_s` seconds to finish. A nested
+    deadline can only shorten the enclosing one. None keeps the enclosing deadline.
+    """
+    if timeout_s is None:
+        yield
+        return
+    deadline = Deadline(timeout_s)
+    enclosing = _current_deadline.get()
+    if enclosing is not None and enclosing.expires_at < deadline.expires_at:
+        deadline = enclosing
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def without_deadline() -> Iterator[None]:
+    """Lifts the deadline for work done on behalf of several callers, such as a batched LLM request."""
+    token = _current_deadline.set(None)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_time(cap: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left before the current deadline, limited to `cap`. None when
+    there is neither a deadline nor a cap.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return cap
+    remaining = deadline.remaining()
+    return remaining if cap is None else min(cap, remaining)
+
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Awaits `awaitable`, raising `asyncio.TimeoutError` if the current deadline passes first."""
+    timeout = remaining_time()
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=timeout)
@@ -1,6 +1,6 @@
 # karta-engine/src/karta/dispatchers/abc.py
 
-from typing import Protocol, List, Dict, Any, Optional, runtime_checkable
+from typing import Protocol, List, Dict, Any, Optional, Sequence, Tuple, runtime_checkable
 
 from karta.types import Entity, Fact
 from genie_tooling.core.types import Plugin
@@ -15,6 +15,27 @@ class FactLookupDispatcher(Plugin, Protocol):
     
     async def lookup_fact(self, entity: str, attribute: str, genie: Any, config: Optional[Dict[str, Any]] = None) -> Optional[Fact]: ...
 
+@runtime_checkable
+class BatchFactLookupDispatcher(Protocol):
+    """
+    A fact provider that can resolve many (entity, attribute) pairs in one
+    request, such as one MediaWiki query for many page titles. Batched lookups
+    call it once per group of queries routed to the provider. Results are
+    returned in the order of `queries`, with None for misses.
+    """
+    async def lookup_facts_batch(
+        self, queries: Sequence[Tuple[str, str]], genie: Any, config: Optional[Dict[str, Any]] = None
+    ) -> List[Optional[Fact]]: ...
+
+@runtime_checkable
+class WritableFactStore(Protocol):
+    """
+    A fact source that accepts facts resolved elsewhere. Providers that also set
+    `is_local_source = True` are tried first by the router and receive every
+    fact the manager resolves through another provider.
+    """
+    async def store_fact(self, fact: Fact) -> None: ...
+
 @runtime_checkable
 class EntityRecognitionDispatcher(Plugin, Protocol):
     async def recognize_entities(self, text: str, config: Optional[Dict[str, Any]] = None) -> List[Entity]: ...
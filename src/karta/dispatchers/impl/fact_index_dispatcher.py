@@ -0,0 +1,72 @@
+# karta-engine/src/karta/dispatchers/impl/fact_index_dispatcher.py
+
+import logging
+from typing import Any, Dict, Optional
+
+from karta.dispatchers.abc import FactLookupDispatcher, KnowledgeProvider
+from karta.store.fact_index import MmapFactIndex
+from karta.types import Fact
+
+logger = logging.getLogger(__name__)
+
+
+class FactIndexDispatcher(FactLookupDispatcher, KnowledgeProvider):
+    """
+    Answers from a reference dataset compiled with `karta import-facts`.
+
+    The index is memory-mapped read-only, so opening it costs nothing regardless
+    of its size, lookups are a hash probe with no LLM or network involved, and
+    every worker process mapping the same file shares its pages.
+    """
+
+    plugin_id: str = "fact_index_dispatcher_v1"
+    # Only a successfully opened index joins the local tier and the routing index.
+    is_local_source: bool = False
+    # Opening the index is cheap and decides whether it is routed, so it is
+    # set up even when other providers' setup is deferred.
+    eager_setup: bool = True
+    _index: Optional[MmapFactIndex] = None
+    _configured: bool = False
+    _setup_done: bool = False
+
+    @property
+    def knowledge_description(self) -> str:
+        if not self._configured:
+            return ""
+        return "Provides authoritative facts from curated reference datasets such as product catalogs and internal entity tables."
+
+    async def setup(self, config: Optional[Dict[str, Any]] = None):
+        if self._index is not None:
+            return
+        config = config or {}
+        self._setup_done = True
+        index_path = config.get("index_path")
+        if not index_path:
+            logger.debug(f"[{self.plugin_id}] No 'index_path' configured; dispatcher is inactive.")
+            return
+        try:
+            self._index = MmapFactIndex(index_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"[{self.plugin_id}] Could not open fact index '{index_path}': {e}")
+            return
+        self._configured = True
+        self.is_local_source = True
+        logger.info(f"[{self.plugin_id}] Mapped fact index '{index_path}' ({len(self._index)} facts).")
+
+    async def lookup_fact(
+        self, entity: str, attribute: str, genie: Any, config: Optional[Dict[str, Any]] = None
+    ) -> Optional[Fact]:
+        if self._index is None:
+            if self._setup_done:
+                return None
+            await self.setup(config)
+            if self._index is None:
+                return None
+        # A hash probe into mapped pages; cheap enough to run on the event loop.
+        return self._index.get(entity, attribute)
+
+    async def teardown(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+            self._setup_done = False
@@ -1,8 +1,12 @@
 # karta-engine/src/karta/dispatchers/impl/llm_dispatchers.py
 
+import asyncio
 from typing import Dict, Any, Optional
 
 from karta.dispatchers.abc import SummarizationDispatcher
+from karta.llm.budget import chunk_by_tokens, count_tokens, trim_to_tokens
+from karta.llm.scheduler import generate
+from karta.observability import current_instrumentation
 
 class LlmSummaryDispatcher(SummarizationDispatcher):
     plugin_id: str = "llm_summary_dispatcher_v1"
@@ -10,6 +14,36 @@ class LlmSummaryDispatcher(SummarizationDispatcher):
     async def summarize(self, text: str, style: str, genie: Any, config: Optional[Dict[str, Any]] = None) -> str:
         config = config or {}
         llm_provider_id = config.get("llm_provider_id")
-        prompt = f"Summarize the following text in a {style} manner:\n\n---\n{text}\n---"
-        response = await genie.llm.generate(prompt=prompt, provider_id=llm_provider_id)
-        return response.get("text", "")
\ No newline at end of file
+        # Text over the budget is either cut, or summarized chunk by chunk and then as a whole.
+        max_input_tokens = int(config.get("max_input_tokens", 3000))
+        if count_tokens(text) > max_input_tokens:
+            if config.get("overflow", "chunk") == "trim":
+                text = trim_to_tokens(text, max_input_tokens)
+            else:
+                text = await self._condense(text, max_input_tokens, genie, llm_provider_id)
+        return await self._summarize_once(text, style, genie, llm_provider_id)
+
+    async def _condense(self, text: str, max_tokens: int, genie: Any, llm_provider_id: Optional[str]) -> str:
+        """Replaces `text` with concise summaries of its chunks until they fit in `max_tokens`."""
+        metrics = current_instrumentation()
+        tokens = count_tokens(text)
+        while tokens > max_tokens:
+            chunks = chunk_by_tokens(text, max_tokens)
+            metrics.observe("karta.llm.summary_chunks", len(chunks))
+            partials = await asyncio.gather(
+                *(self._summarize_once(chunk, "concise", genie, llm_provider_id) for chunk in chunks)
+            )
+            condensed = "\n\n".join(partial.strip() for partial in partials if partial.strip())
+            condensed_tokens = count_tokens(condensed)
+            if condensed_tokens >= tokens:
+                # The model is not shortening the text; stop rather than loop.
+                return trim_to_tokens(condensed, max_tokens)
+            text, tokens = condensed, condensed_tokens
+        return text
+
+    async def _summarize_once(self, text: str, style: str, genie: Any, llm_provider_id: Optional[str]) -> str:
+        # The style goes last so that summaries of one text in several styles share a cacheable prefix.
+        prompt = f"Summarize the following text.\n\n---\n{text}\n---\n\nWrite the summary in a {style} manner."
+        with current_instrumentation().timer("karta.llm.summary_ms", dispatcher=self.plugin_id):
+            response = await generate(genie, prompt, provider_id=llm_provider_id)
+        return response.get("text", "")
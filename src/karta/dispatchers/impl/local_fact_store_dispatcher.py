@@ -0,0 +1,91 @@
+# karta-engine/src/karta/dispatchers/impl/local_fact_store_dispatcher.py
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from karta.dispatchers.abc import (
+    BatchFactLookupDispatcher,
+    FactLookupDispatcher,
+    KnowledgeProvider,
+    WritableFactStore,
+)
+from karta.store.sqlite_store import SqliteFactStore
+from karta.types import Fact
+
+logger = logging.getLogger(__name__)
+
+
+class LocalFactStoreDispatcher(FactLookupDispatcher, BatchFactLookupDispatcher, KnowledgeProvider, WritableFactStore):
+    """
+    Answers from facts Karta has already resolved, kept in an embedded SQLite store.
+
+    The router tries this provider before any other, and the manager writes back
+    every fact resolved by a remote provider, so repeat questions cost a local
+    index lookup instead of a network round trip and an LLM call.
+    """
+
+    plugin_id: str = "local_fact_store_dispatcher_v1"
+    is_local_source: bool = True
+    _store: Optional[SqliteFactStore] = None
+    _max_age_seconds: Optional[float] = None
+    _setup_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def knowledge_description(self) -> str:
+        return "Provides facts about entities that have already been looked up and verified, served instantly from a local knowledge store."
+
+    async def setup(self, config: Optional[Dict[str, Any]] = None):
+        if self._store is not None:
+            return
+        if self._setup_lock is None:
+            self._setup_lock = asyncio.Lock()
+        # Concurrent first lookups set up lazily; only one of them opens the store.
+        async with self._setup_lock:
+            if self._store is not None:
+                return
+            config = config or {}
+            # The default in-memory store lives as long as the process; set `path`
+            # to persist facts across restarts and share them between workers.
+            path = config.get("path", ":memory:")
+            store = await asyncio.to_thread(SqliteFactStore, path)
+            for alias, entity in config.get("aliases", {}).items():
+                await asyncio.to_thread(store.add_alias, alias, entity)
+            self._max_age_seconds = config.get("max_age_seconds")
+            self._store = store
+        logger.info(f"[{self.plugin_id}] Local fact store opened at '{path}'.")
+
+    async def lookup_fact(
+        self, entity: str, attribute: str, genie: Any, config: Optional[Dict[str, Any]] = None
+    ) -> Optional[Fact]:
+        if self._store is None:
+            await self.setup(config)
+        return await asyncio.to_thread(self._store.get, entity, attribute, self._max_age_seconds)
+
+    async def lookup_facts_batch(
+        self, queries: Sequence[Tuple[str, str]], genie: Any, config: Optional[Dict[str, Any]] = None
+    ) -> List[Optional[Fact]]:
+        if self._store is None:
+            await self.setup(config)
+
+        def get_all() -> List[Optional[Fact]]:
+            return [self._store.get(entity, attribute, self._max_age_seconds) for entity, attribute in queries]
+
+        # One worker-thread hop for the whole group rather than one per fact.
+        return await asyncio.to_thread(get_all)
+
+    async def store_fact(self, fact: Fact) -> None:
+        if self._store is None:
+            await self.setup()
+        await asyncio.to_thread(self._store.put, fact)
+
+    async def add_alias(self, alias: str, entity: str) -> None:
+        """Makes lookups for `alias` resolve to the facts stored for `entity`."""
+        if self._store is None:
+            await self.setup()
+        await asyncio.to_thread(self._store.add_alias, alias, entity)
+
+    async def teardown(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
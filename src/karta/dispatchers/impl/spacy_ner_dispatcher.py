@@ -1,25 +1,27 @@
 import logging
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
 from karta.dispatchers.abc import EntityRecognitionDispatcher
+from karta.lazy import lazy_import
+from karta.observability import current_instrumentation
 from karta.types import Entity
 
+if TYPE_CHECKING:
+    from spacy.language import Language
+
 logger = logging.getLogger(__name__)
 
-try:
-    import spacy
-    from spacy.language import Language
-except ImportError:
-    spacy = None
-    Language = None
+# spaCy takes seconds to import; defer it until a model is actually loaded.
+spacy = lazy_import("spacy")
 
 class SpacyNerDispatcher(EntityRecognitionDispatcher):
     """Performs named entity recognition using the spaCy library."""
     plugin_id: str = "spacy_ner_dispatcher_v1"
-    _nlp: Optional[Language] = None
+    _nlp: Optional["Language"] = None
 
     async def setup(self, config: Optional[Dict[str, Any]] = None):
-        if spacy is None:
+        if not spacy:
             raise ImportError("The 'spacy' package is required. Please install it (`pip install spacy`).")
         
         config = config or {}
@@ -37,9 +39,17 @@ class SpacyNerDispatcher(EntityRecognitionDispatcher):
         if not self._nlp:
             await self.setup(config) # Lazy loading
         
-        doc = self._nlp(text)
+        config = config or {}
+        with current_instrumentation().timer("karta.ner.inference_ms", dispatcher=self.plugin_id):
+            doc = self._nlp(text)
+        # Only spans the caller asked for become Entity objects.
+        labels = set(config.get("labels") or ())
+        spans = (ent for ent in doc.ents if not labels or ent.label_ in labels)
+        max_entities = config.get("max_entities")
+        if max_entities is not None:
+            spans = islice(spans, max_entities)
         entities = [
             Entity(text=ent.text, label=ent.label_, start_char=ent.start_char, end_char=ent.end_char)
-            for ent in doc.ents
+            for ent in spans
         ]
         return entities
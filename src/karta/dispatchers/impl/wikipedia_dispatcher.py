@@ -1,34 +1,168 @@
 # karta-engine/src/karta/dispatchers/impl/wikipedia_dispatcher.py
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from karta.dispatchers.abc import FactLookupDispatcher, KnowledgeProvider
+import httpx
+import numpy as np
+from karta.chunks import embed_texts
+from karta.deadline import remaining_time
+from karta.dispatchers.abc import BatchFactLookupDispatcher, FactLookupDispatcher, KnowledgeProvider
+from karta.lazy import lazy_import
+from karta.llm.budget import count_tokens, trim_to_tokens
+from karta.llm.scheduler import generate
+from karta.observability import current_instrumentation
 from karta.types import Fact
 
 logger = logging.getLogger(__name__)
 
-try:
-    import wikipediaapi
-except ImportError:
-    wikipediaapi = None
+wikipediaapi = lazy_import("wikipediaapi")
 
+# Replies that mean the model did not find the attribute in the text, whether
+# as a bare marker ("N/A") or within a sentence ("The height is not stated.").
+_NOT_FOUND_REPLY = re.compile(
+    r"^(unknown|n/?a|none)\b"
+    r"|\b(not found|not mentioned|not specified|not stated|not provided|not available|no information|"
+    r"does not (say|mention|state|specify))\b",
+    re.IGNORECASE,
+)
+# Phrases that signal a guess or an answer not supported by the text.
+_HEDGES = (
+    "not found", "not mentioned", "not specified", "not stated", "not provided",
+    "unclear", "unknown", "cannot", "can't", "might", "may be", "possibly", "probably", "likely",
+)
+_VALUE_TOKEN = re.compile(r"[\w.,]+")
+# MediaWiki returns intro extracts for at most 20 pages per request.
+_MAX_TITLES_PER_REQUEST = 20
+# Plain-text section headings, as in "== Early life ==".
+_HEADING = re.compile(r"^(=+)\s*(.+?)\s*\1$")
+# Sections that never hold facts about the entity itself.
+_SKIPPED_SECTIONS = {"references", "external links", "see also", "further reading", "notes", "bibliography", "sources"}
 
-class WikipediaFactDispatcher(FactLookupDispatcher, KnowledgeProvider):
+
+def split_paragraphs(text: str) -> List[Tuple[str, str]]:
+    """
+    Splits a plain-text extract (`exsectionformat=wiki`) into (section, paragraph)
+    pairs. Lead paragraphs have an empty section; reference sections are dropped.
+    """
+    paragraphs: List[Tuple[str, str]] = []
+    section = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            section = heading.group(2)
+            continue
+        if section.lower() not in _SKIPPED_SECTIONS:
+            paragraphs.append((section, line))
+    return paragraphs
+
+
+def select_context(
+    paragraphs: List[Tuple[str, str]], scores: Optional[np.ndarray], top_k: int, max_tokens: int
+) -> str:
+    """
+    Joins the `top_k` best-scoring paragraphs, in page order, within `max_tokens`.
+    Without scores, takes the lead paragraphs instead.
+    """
+    if scores is None:
+        order: Sequence[int] = range(len(paragraphs))
+    else:
+        order = np.argsort(-np.asarray(scores), kind="stable")[:top_k]
+    chosen: Dict[int, str] = {}
+    budget = max_tokens
+    for index in order:
+        paragraph = paragraphs[index][1]
+        tokens = count_tokens(paragraph)
+        if tokens > budget:
+            if chosen:
+                # Lead paragraphs stop at the budget; ranked ones skip to a shorter candidate.
+                if scores is None:
+                    break
+                continue
+            paragraph = trim_to_tokens(paragraph, budget)
+            tokens = budget
+        chosen[int(index)] = paragraph
+        budget -= tokens
+        if budget <= 0:
+            break
+    parts = []
+    for index in sorted(chosen):
+        section = paragraphs[index][0]
+        parts.append(f"[{section}] {chosen[index]}" if section else chosen[index])
+    return "\n\n".join(parts)
+
+
+class _PageText:
+    __slots__ = ("title", "text", "url", "revision")
+
+    def __init__(self, title: str, text: str, url: str, revision: int):
+        self.title = title
+        self.text = text
+        self.url = url
+        self.revision = revision
+
+
+def score_extracted_answer(answer: str, context: str) -> float:
+    """
+    Estimates how trustworthy an LLM-extracted value is, from 0 to 1.
+
+    Answers whose tokens all appear in the source text are treated as grounded;
+    hedged or rambling answers are scored low so that the manager can keep
+    cascading to a provider with a better answer.
+    """
+    lowered = answer.lower()
+    if any(hedge in lowered for hedge in _HEDGES):
+        return 0.2
+
+    tokens = _VALUE_TOKEN.findall(lowered)
+    context_lowered = context.lower()
+    grounded = bool(tokens) and all(token.strip(".,") in context_lowered for token in tokens)
+    confidence = 0.85 if grounded else 0.5
+    if len(tokens) > 25:
+        # A concise value was requested; long prose is usually an evasive reply.
+        confidence -= 0.2
+    return confidence
+
+
+class WikipediaFactDispatcher(FactLookupDispatcher, BatchFactLookupDispatcher, KnowledgeProvider):
     plugin_id: str = "wikipedia_fact_dispatcher_v1"
     _wiki: Optional[Any] = None
+    _http_client: Optional[httpx.AsyncClient] = None
+    _api_url: str = "https://en.wikipedia.org/w/api.php"
+    _context_mode: str = "summary"
+    _top_k_paragraphs: int = 5
+    _max_context_tokens: int = 500
+    _paragraph_cache: Optional["OrderedDict[Tuple[str, int], np.ndarray]"] = None
+    _paragraph_cache_size: int = 128
 
     @property
     def knowledge_description(self) -> str:
         return "Provides encyclopedic, descriptive, and qualitative information about well-known public entities, historical events, and general knowledge concepts. Best for 'what is' or 'who is' style questions."
 
     async def setup(self, config: Optional[Dict[str, Any]] = None):
-        if wikipediaapi is None:
+        if not wikipediaapi:
             raise ImportError("wikipedia-api is required.")
         config = config or {}
-        self._wiki = wikipediaapi.Wikipedia(
-            language=config.get("lang", "en"), user_agent="KartaEngine/1.0"
-        )
+        lang = config.get("lang", "en")
+        self._wiki = wikipediaapi.Wikipedia(language=lang, user_agent="KartaEngine/1.0")
+        self._api_url = f"https://{lang}.wikipedia.org/w/api.php"
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=15.0, headers={"User-Agent": "KartaEngine/1.0"})
+        # "summary" sends the page intro to the LLM; "sections" sends the
+        # paragraphs of the whole page most similar to the requested attribute.
+        self._context_mode = config.get("context", "summary")
+        self._top_k_paragraphs = int(config.get("top_k_paragraphs", 5))
+        # Measured with the tokenizer configured in the `llm` block.
+        self._max_context_tokens = int(config.get("max_context_tokens", 500))
+        self._paragraph_cache_size = int(config.get("paragraph_cache_size", 128))
+        if self._paragraph_cache is None:
+            self._paragraph_cache = OrderedDict()
 
     async def lookup_fact(
         self, entity: str, attribute: str, genie: Any, config: Optional[Dict[str, Any]] = None
@@ -36,12 +170,211 @@ class WikipediaFactDispatcher(FactLookupDispatcher, KnowledgeProvider):
         if not self._wiki:
             await self.setup(config)
 
-        page = self._wiki.page(entity)
-        if not page.exists():
+        if self._context_mode == "sections":
+            page_text = await self._fetch_page_text(entity)
+            if page_text is None:
+                return None
+            context = (await self._select_contexts(page_text, [attribute], entity, genie))[0]
+            return await self._extract(entity, attribute, context, page_text.url, genie)
+
+        metrics = current_instrumentation()
+        with metrics.timer("karta.wikipedia.page_fetch_ms"):
+            page = self._wiki.page(entity)
+            exists = page.exists()
+        if not exists:
+            return None
+
+        return await self._extract(entity, attribute, self._lead_tokens(page.summary), page.fullurl, genie)
+
+    async def lookup_facts_batch(
+        self, queries: Sequence[Tuple[str, str]], genie: Any, config: Optional[Dict[str, Any]] = None
+    ) -> List[Optional[Fact]]:
+        """
+        Fetches the intro of every page in the group with MediaWiki `titles=`
+        queries, one request per `_MAX_TITLES_PER_REQUEST` pages, then extracts
+        all the facts concurrently so the LLM scheduler can batch the prompts.
+        In "sections" mode, each page is fetched whole and its paragraphs are
+        embedded once for all the attributes asked about it.
+        """
+        if self._http_client is None:
+            await self.setup(config)
+        if self._context_mode == "sections":
+            return await self._lookup_sections_batch(queries, genie)
+        titles = list(dict.fromkeys(entity for entity, _ in queries))
+        pages: Dict[str, Tuple[str, str]] = {}
+        metrics = current_instrumentation()
+        with metrics.timer("karta.wikipedia.page_fetch_ms"):
+            for start in range(0, len(titles), _MAX_TITLES_PER_REQUEST):
+                pages.update(await self._fetch_intros(titles[start:start + _MAX_TITLES_PER_REQUEST]))
+        metrics.increment("karta.wikipedia.batched_pages", len(titles))
+
+        async def extract(entity: str, attribute: str) -> Optional[Fact]:
+            if entity not in pages:
+                return None
+            summary, url = pages[entity]
+            return await self._extract(entity, attribute, self._lead_tokens(summary), url, genie)
+
+        return list(await asyncio.gather(*(extract(entity, attribute) for entity, attribute in queries)))
+
+    async def _lookup_sections_batch(self, queries: Sequence[Tuple[str, str]], genie: Any) -> List[Optional[Fact]]:
+        attributes_by_entity: Dict[str, List[str]] = {}
+        for entity, attribute in queries:
+            attributes = attributes_by_entity.setdefault(entity, [])
+            if attribute not in attributes:
+                attributes.append(attribute)
+        entities = list(attributes_by_entity)
+        page_texts = await asyncio.gather(*(self._fetch_page_text(entity) for entity in entities))
+        current_instrumentation().increment("karta.wikipedia.batched_pages", len(entities))
+
+        async def contexts_for(entity: str, page_text: Optional[_PageText]) -> Dict[str, str]:
+            if page_text is None:
+                return {}
+            attributes = attributes_by_entity[entity]
+            return dict(zip(attributes, await self._select_contexts(page_text, attributes, entity, genie)))
+
+        contexts = dict(zip(entities, await asyncio.gather(*(contexts_for(e, p) for e, p in zip(entities, page_texts)))))
+        urls = {entity: page_text.url for entity, page_text in zip(entities, page_texts) if page_text is not None}
+
+        async def extract(entity: str, attribute: str) -> Optional[Fact]:
+            if entity not in urls:
+                return None
+            return await self._extract(entity, attribute, contexts[entity][attribute], urls[entity], genie)
+
+        return list(await asyncio.gather(*(extract(entity, attribute) for entity, attribute in queries)))
+
+    def _lead_tokens(self, text: str) -> str:
+        # The intro alone is plenty for most facts.
+        return trim_to_tokens(" ".join(text.split()), self._max_context_tokens)
+
+    async def _fetch_intros(self, titles: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Returns {requested title: (plain-text intro, page URL)} for the titles that exist."""
+        try:
+            response = await self._http_client.get(
+                self._api_url,
+                params={
+                    "action": "query",
+                    "format": "json",
+                    "formatversion": "2",
+                    "prop": "extracts|info",
+                    "inprop": "url",
+                    "exintro": "1",
+                    "explaintext": "1",
+                    "exlimit": "max",
+                    "redirects": "1",
+                    "titles": "|".join(titles),
+                },
+                timeout=remaining_time(15.0),
+            )
+            response.raise_for_status()
+            query = response.json().get("query", {})
+        except (httpx.HTTPError, ValueError) as e:
+            # A failed request makes this chunk's pages misses; the other chunks are unaffected.
+            logger.warning(f"[{self.plugin_id}] Fetching intros for {len(titles)} pages failed: {e}")
+            return {}
+        normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+        pages = {
+            page["title"]: page
+            for page in query.get("pages", [])
+            if not page.get("missing") and not page.get("invalid") and page.get("extract")
+        }
+        intros: Dict[str, Tuple[str, str]] = {}
+        for title in titles:
+            resolved = normalized.get(title, title)
+            page = pages.get(redirects.get(resolved, resolved))
+            if page is not None:
+                intros[title] = (page["extract"], page.get("fullurl", ""))
+        return intros
+
+    async def _fetch_page_text(self, title: str) -> Optional[_PageText]:
+        """Fetches the whole plain-text page, with wiki-style headings, and its revision."""
+        metrics = current_instrumentation()
+        try:
+            with metrics.timer("karta.wikipedia.page_fetch_ms"):
+                response = await self._http_client.get(
+                    self._api_url,
+                    params={
+                        "action": "query",
+                        "format": "json",
+                        "formatversion": "2",
+                        "prop": "extracts|info",
+                        "inprop": "url",
+                        "explaintext": "1",
+                        "exsectionformat": "wiki",
+                        "redirects": "1",
+                        "titles": title,
+                    },
+                    timeout=remaining_time(15.0),
+                )
+            response.raise_for_status()
+            pages = response.json().get("query", {}).get("pages", [])
+        except (httpx.HTTPError, ValueError) as e:
+            # A failed page is a miss, so the cascade (or the rest of the batch) carries on.
+            logger.warning(f"[{self.plugin_id}] Fetching page '{title}' failed: {e}")
+            return None
+        page = pages[0] if pages else {}
+        if page.get("missing") or page.get("invalid") or not page.get("extract"):
+            return None
+        return _PageText(page.get("title", title), page["extract"], page.get("fullurl", ""), int(page.get("lastrevid", 0)))
+
+    async def _select_contexts(
+        self, page_text: _PageText, attributes: List[str], entity: str, genie: Any
+    ) -> List[str]:
+        """Picks the context for each attribute from the page's most relevant paragraphs."""
+        paragraphs = split_paragraphs(page_text.text)
+        scores: Optional[np.ndarray] = None
+        if sum(count_tokens(paragraph) for _, paragraph in paragraphs) > self._max_context_tokens:
+            try:
+                scores = await self._score_paragraphs(page_text, paragraphs, attributes, entity, genie)
+            except Exception as e:
+                logger.warning(f"[{self.plugin_id}] Paragraph ranking failed for '{page_text.title}', using the lead: {e}")
+        contexts = [
+            select_context(paragraphs, None if scores is None else scores[i], self._top_k_paragraphs, self._max_context_tokens)
+            for i in range(len(attributes))
+        ]
+        metrics = current_instrumentation()
+        if metrics.enabled:
+            for context in contexts:
+                metrics.observe("karta.wikipedia.context_tokens", count_tokens(context))
+        return contexts
+
+    async def _score_paragraphs(
+        self, page_text: _PageText, paragraphs: List[Tuple[str, str]], attributes: List[str], entity: str, genie: Any
+    ) -> Optional[np.ndarray]:
+        """
+        Returns the cosine similarity of each attribute to each paragraph, as an
+        (attributes, paragraphs) matrix, or None without a default embedder.
+        Paragraph embeddings are cached per page revision, so later lookups on
+        the same page only embed the attribute.
+        """
+        embedder = await genie.get_default_embedder() if hasattr(genie, "get_default_embedder") else None
+        if embedder is None:
+            return None
+        metrics = current_instrumentation()
+        key = (page_text.title, page_text.revision)
+        cached = self._paragraph_cache.get(key)
+        texts = [f"{attribute} of {entity}" for attribute in attributes]
+        if cached is None:
+            texts += [f"{section}: {paragraph}" if section else paragraph for section, paragraph in paragraphs]
+            metrics.increment("karta.wikipedia.paragraph_cache", outcome="miss")
+        else:
+            self._paragraph_cache.move_to_end(key)
+            metrics.increment("karta.wikipedia.paragraph_cache", outcome="hit")
+        with metrics.timer("karta.wikipedia.embedding_ms"):
+            vectors = await embed_texts(embedder, texts)
+        if any(vector is None for vector in vectors):
             return None
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        if cached is None:
+            cached = matrix[len(attributes):]
+            self._paragraph_cache[key] = cached
+            while len(self._paragraph_cache) > self._paragraph_cache_size:
+                self._paragraph_cache.popitem(last=False)
+        return matrix[: len(attributes)] @ cached.T
 
-        # Take the first 500 words for context, which is plenty for most facts.
-        summary = " ".join(page.summary.split()[:500])
+    async def _extract(self, entity: str, attribute: str, summary: str, source: str, genie: Any) -> Optional[Fact]:
         if not summary:
             return None
 
@@ -50,23 +383,33 @@ class WikipediaFactDispatcher(FactLookupDispatcher, KnowledgeProvider):
             return None
 
         try:
+            # Instructions and page text come first and the question last, so that
+            # lookups of different attributes of one page share a cacheable prefix.
             extraction_prompt = (
-                f"Based on the following text, what is the '{attribute}' of '{entity}'? "
-                "Provide only the value as a concise answer. If the information is not present, respond with 'Not found.'\n\n"
-                f"Text:\n---\n{summary}\n---"
+                "Answer the question using only the text below. Provide only the value as a concise answer. "
+                "If the information is not present, respond with 'Not found.'\n\n"
+                f"Text:\n---\n{summary}\n---\n\n"
+                f"Question: what is the '{attribute}' of '{entity}'?"
             )
-            response = await genie.llm.generate(prompt=extraction_prompt, temperature=0.0)
+            with current_instrumentation().timer("karta.llm.extraction_ms", dispatcher=self.plugin_id):
+                response = await generate(genie, extraction_prompt, temperature=0.0)
             answer = response.get("text", "").strip()
 
-            if "not found" in answer.lower() or not answer:
+            if not answer or _NOT_FOUND_REPLY.search(answer):
                 return None
 
             return Fact(
                 entity=entity,
                 attribute=attribute,
                 value=answer,
-                source=page.fullurl,
+                source=source,
+                confidence=score_extracted_answer(answer, summary),
             )
         except Exception as e:
             logger.error(f"LLM-based fact extraction failed for '{entity} - {attribute}': {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+    async def teardown(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
\ No newline at end of file
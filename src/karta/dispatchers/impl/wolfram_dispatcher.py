@@ -5,15 +5,15 @@ import xml.etree.ElementTree as ET
 from typing import Any, Dict, Optional
 
 import httpx
+from karta.deadline import current_deadline, remaining_time
 from karta.dispatchers.abc import FactLookupDispatcher, KnowledgeProvider
+from karta.lazy import lazy_import
+from karta.observability import current_instrumentation
 from karta.types import Fact
 
 logger = logging.getLogger(__name__)
 
-try:
-    import wolframalpha
-except ImportError:
-    wolframalpha = None
+wolframalpha = lazy_import("wolframalpha")
 
 
 class WolframAlphaDispatcher(FactLookupDispatcher, KnowledgeProvider):
@@ -28,7 +28,7 @@ class WolframAlphaDispatcher(FactLookupDispatcher, KnowledgeProvider):
         return "Provides expert-level answers for mathematical computations, unit conversions, scientific formulas, algorithmically derived data, and quantitative facts. Best for queries that require calculation or precise scientific data."
 
     async def setup(self, config: Optional[Dict[str, Any]] = None):
-        if wolframalpha is None:
+        if not wolframalpha:
             raise ImportError(
                 "The 'wolframalpha' package is required. Install with `poetry add 'genie-tooling-karta[computation]'`."
             )
@@ -77,8 +77,12 @@ class WolframAlphaDispatcher(FactLookupDispatcher, KnowledgeProvider):
                 "appid": self._client.app_id,
                 "format": "plaintext",  # Request plaintext for easier parsing
             }
+            if current_deadline() is not None:
+                # Let WolframAlpha stop computing once the caller's deadline has passed.
+                params["totaltimeout"] = f"{remaining_time():.1f}"
 
-            response = await self._http_client.get(api_url, params=params)
+            with current_instrumentation().timer("karta.wolfram.request_ms"):
+                response = await self._http_client.get(api_url, params=params, timeout=remaining_time(15.0))
             response.raise_for_status()
             xml_content = response.content
 
@@ -95,21 +99,25 @@ class WolframAlphaDispatcher(FactLookupDispatcher, KnowledgeProvider):
             # Find the primary result, which is typically in the pod with title="Result".
             # If not found, fall back to the first pod with plaintext.
             answer = None
+            confidence = None
             result_pod = xml_root.find('.//pod[@title="Result"]')
             if result_pod is not None:
                 plaintext_element = result_pod.find(".//plaintext")
                 if plaintext_element is not None and plaintext_element.text:
                     answer = plaintext_element.text.strip()
+                    confidence = 0.95
 
             # Fallback if the "Result" pod isn't present
             if answer is None:
                 first_plaintext = xml_root.find(".//pod/subpod/plaintext")
                 if first_plaintext is not None and first_plaintext.text:
                     answer = first_plaintext.text.strip()
+                    # The first pod is often just the input interpretation.
+                    confidence = 0.6
 
             if answer:
                 return Fact(
-                    entity=entity, attribute=attribute, value=answer, source="WolframAlpha"
+                    entity=entity, attribute=attribute, value=answer, source="WolframAlpha", confidence=confidence
                 )
             else:
                 logger.debug(f"WolframAlpha query '{query}' returned no parsable result in pods.")
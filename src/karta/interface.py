@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from karta.manager import KartaManager
 from karta.types import Entity, Fact
@@ -12,14 +12,95 @@ class KartaInterface:
         self._manager = manager
         logger.info("KartaInterface created and attached to KartaManager.")
 
-    async def recognize_entities(self, text: str, dispatcher_id: Optional[str] = None) -> List[Entity]:
-        """Extracts named entities from a block of text."""
-        return await self._manager.recognize_entities(text, dispatcher_id=dispatcher_id)
+    async def recognize_entities(
+        self,
+        text: str,
+        dispatcher_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        labels: Optional[Sequence[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Entity]:
+        """
+        Extracts named entities from a block of text.
 
-    async def summarize(self, text: str, style: str = "concise", dispatcher_id: Optional[str] = None) -> str:
-        """Generates a summary of a text."""
-        return await self._manager.summarize(text, style=style, dispatcher_id=dispatcher_id)
+        `labels` keeps only entities with those labels (e.g. ["PERSON", "GPE"]).
+        `offset` and `limit` return one page of the matching entities, in text
+        order. Raises `asyncio.TimeoutError` if `timeout` seconds pass first.
+        """
+        return await self._manager.recognize_entities(
+            text, dispatcher_id=dispatcher_id, timeout=timeout, labels=labels, offset=offset, limit=limit
+        )
 
-    async def lookup_fact(self, entity: str, attribute: str, dispatcher_id: Optional[str] = None) -> Optional[Fact]:
-        """Looks up a single attribute or fact about a given entity."""
-        return await self._manager.lookup_fact(entity, attribute, dispatcher_id=dispatcher_id)
+    async def summarize(
+        self,
+        text: str,
+        style: str = "concise",
+        dispatcher_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Generates a summary of a text.
+
+        `priority` is "interactive" (the default) or "batch"; batch calls queue
+        behind interactive ones for rate-limited backends. Raises
+        `asyncio.TimeoutError` if `timeout` seconds pass first.
+        """
+        return await self._manager.summarize(
+            text, style=style, dispatcher_id=dispatcher_id, priority=priority, timeout=timeout
+        )
+
+    async def lookup_fact(
+        self,
+        entity: str,
+        attribute: str,
+        dispatcher_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[Fact]:
+        """
+        Looks up a single attribute or fact about a given entity.
+
+        `priority` is "interactive" (the default) or "batch"; batch calls queue
+        behind interactive ones for rate-limited providers. With `timeout` (in
+        seconds), providers that cannot answer in the time left are skipped and
+        the best fact found before the deadline is returned, or None.
+        """
+        return await self._manager.lookup_fact(
+            entity, attribute, dispatcher_id=dispatcher_id, priority=priority, timeout=timeout
+        )
+
+    async def lookup_facts(
+        self,
+        queries: List[Tuple[str, str]],
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Optional[Fact]]:
+        """
+        Looks up many (entity, attribute) pairs at once, returning a fact or None
+        for each, in order. Lookups bound for the same provider are sent to it
+        together, which takes far fewer round trips than one `lookup_fact` call
+        per pair.
+        """
+        return await self._manager.lookup_facts(queries, priority=priority, timeout=timeout)
+
+    async def readiness(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Probes every routable provider with a canary lookup. Returns
+        {"ready": bool, "providers": {provider_id: {"status", "latency_ms"}}};
+        providers that fail are skipped by lookups until a later probe passes.
+        """
+        return await self._manager.probe_readiness(timeout=timeout)
+
+    def startup_report(self) -> Dict[str, Any]:
+        """Returns the time spent in each phase of Karta's bootstrap, in milliseconds."""
+        return self._manager.startup_report.as_dict()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns Karta's recorded metrics: latency histograms per stage and per
+        provider, call counters, and cascade depth. Empty unless the `metrics`
+        configuration block sets `enabled: True`.
+        """
+        return self._manager.stats()
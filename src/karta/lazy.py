@@ -0,0 +1,67 @@
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule:
+    """
+    A stand-in for an optional third-party module that defers the real import
+    until one of its attributes is first accessed.
+
+    Dispatcher modules are imported eagerly during plugin discovery, so importing
+    heavy optional backends (spaCy, wolframalpha, wikipedia-api) at module level
+    makes every Karta startup pay for them. The proxy is truthy only when the
+    module can actually be imported, so `if not spacy:` replaces the previous
+    `if spacy is None:` availability check.
+    """
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_available", None)
+
+    def _load(self) -> ModuleType:
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", module)
+            object.__setattr__(self, "_available", True)
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_") and not self:
+            # Introspection (mock.patch, inspect, copy) probes private names; an
+            # absent optional module should look like an object without them.
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __bool__(self) -> bool:
+        if self._available is None:
+            # `find_spec` locates the module without executing it.
+            try:
+                available = importlib.util.find_spec(self._name) is not None
+            except (ImportError, ValueError):
+                available = False
+            object.__setattr__(self, "_available", available)
+        return self._available
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a proxy for `name` that imports the module on first attribute access."""
+    return LazyModule(name)
+
@@ -0,0 +1,125 @@
+# karta-engine/src/karta/llm/budget.py
+"""
+Token counting and prompt budgeting for LLM-backed dispatchers.
+
+Dispatchers size their prompt context with the active tokenizer instead of
+word counts, so a configured budget bounds what is actually sent to the model.
+The default `WordTokenizer` needs no dependencies and approximates subword
+tokenizers; configure `"tiktoken:<encoding>"` or your own tokenizer for exact
+counts.
+"""
+
+import importlib
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional, Protocol, runtime_checkable
+
+from karta.lazy import lazy_import
+
+tiktoken = lazy_import("tiktoken")
+
+# A word with its trailing whitespace, so that decoding restores the original spacing.
+_WORD = re.compile(r"\S+\s*")
+
+
+@runtime_checkable
+class Tokenizer(Protocol):
+    """Anything that turns text into a list of tokens and back."""
+
+    def encode(self, text: str) -> List[Any]:
+        ...
+
+    def decode(self, tokens: List[Any]) -> str:
+        ...
+
+
+class WordTokenizer:
+    """Treats each whitespace-separated word as one token. Undercounts subword tokenizers by roughly a third."""
+
+    def encode(self, text: str) -> List[str]:
+        return _WORD.findall(text.lstrip())
+
+    def decode(self, tokens: List[Any]) -> str:
+        return "".join(tokens).rstrip()
+
+
+class TiktokenTokenizer:
+    """Exact counts for OpenAI-style BPE encodings. Requires `tiktoken`."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        if not tiktoken:
+            raise ImportError("tiktoken is required for the 'tiktoken' tokenizer.")
+        self._encoding = tiktoken.get_encoding(encoding)
+
+    def encode(self, text: str) -> List[int]:
+        return self._encoding.encode(text)
+
+    def decode(self, tokens: List[Any]) -> str:
+        return self._encoding.decode(tokens)
+
+
+def create_tokenizer(spec: Any = None) -> Tokenizer:
+    """
+    Builds a tokenizer from the `llm.tokenizer` setting: None or "words" for
+    `WordTokenizer`, "tiktoken[:<encoding>]", "module:factory" for a callable
+    returning a tokenizer, or a tokenizer instance.
+    """
+    if spec is None or spec == "words":
+        return WordTokenizer()
+    if isinstance(spec, Tokenizer):
+        return spec
+    name, _, argument = str(spec).partition(":")
+    if name == "tiktoken":
+        return TiktokenTokenizer(argument or "cl100k_base")
+    if not argument:
+        raise ValueError(f"Unknown tokenizer '{spec}'. Use 'words', 'tiktoken[:<encoding>]' or 'module:factory'.")
+    tokenizer = getattr(importlib.import_module(name), argument)()
+    if not isinstance(tokenizer, Tokenizer):
+        raise TypeError(f"'{spec}' did not produce an object with encode() and decode().")
+    return tokenizer
+
+
+_DEFAULT_TOKENIZER = WordTokenizer()
+_current_tokenizer: ContextVar[Optional[Tokenizer]] = ContextVar("karta_tokenizer", default=None)
+
+
+def current_tokenizer() -> Tokenizer:
+    return _current_tokenizer.get() or _DEFAULT_TOKENIZER
+
+
+@contextmanager
+def use_tokenizer(tokenizer: Optional[Tokenizer]) -> Iterator[None]:
+    """Makes dispatchers within the block count and trim tokens with `tokenizer`."""
+    token = _current_tokenizer.set(tokenizer)
+    try:
+        yield
+    finally:
+        _current_tokenizer.reset(token)
+
+
+def count_tokens(text: str, tokenizer: Optional[Tokenizer] = None) -> int:
+    return len((tokenizer or current_tokenizer()).encode(text))
+
+
+def trim_to_tokens(text: str, max_tokens: int, tokenizer: Optional[Tokenizer] = None) -> str:
+    """Returns the longest prefix of `text` that fits in `max_tokens`."""
+    tokenizer = tokenizer or current_tokenizer()
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return tokenizer.decode(tokens[: max(max_tokens, 0)])
+
+
+def chunk_by_tokens(
+    text: str, max_tokens: int, overlap: int = 0, tokenizer: Optional[Tokenizer] = None
+) -> List[str]:
+    """Splits `text` into pieces of at most `max_tokens`, each repeating the last `overlap` tokens of the previous one."""
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive.")
+    tokenizer = tokenizer or current_tokenizer()
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return [text] if tokens else []
+    step = max(max_tokens - max(overlap, 0), 1)
+    return [tokenizer.decode(tokens[start:start + max_tokens]) for start in range(0, len(tokens) - overlap, step)]
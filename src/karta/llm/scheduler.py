@@ -0,0 +1,195 @@
+# karta-engine/src/karta/llm/scheduler.py
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from karta.admission import LLM_LIMIT_KEY, PRIORITIES, AdmissionController, current_priority
+from karta.deadline import without_deadline
+from karta.llm.budget import count_tokens
+from karta.observability import NOOP_INSTRUMENTATION, Instrumentation, current_instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingPrompt:
+    prompt: str
+    kwargs: Dict[str, Any]
+    future: asyncio.Future
+    priority: str
+
+
+class LlmScheduler:
+    """
+    Funnels every LLM call Karta's dispatchers make through one queue.
+
+    Prompts submitted within `batch_window_ms` of each other are collected and
+    grouped by their generation parameters. Within a group they are sorted so
+    that prompts sharing a prefix (the same instructions and page text) are
+    sent back to back and can reuse the backend's prefix/KV cache. When
+    `batch_method` names a method on `genie.llm` that takes a list of prompts,
+    each group is sent as one batched request. All calls share a global cap
+    of `max_in_flight` concurrent requests.
+    """
+
+    def __init__(
+        self,
+        genie: Any,
+        config: Optional[Dict[str, Any]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        admission: Optional[AdmissionController] = None,
+    ):
+        config = config or {}
+        self.genie = genie
+        self.metrics = instrumentation or NOOP_INSTRUMENTATION
+        # Rate limits and concurrency caps configured for the "llm" key apply on top of `max_in_flight`.
+        self.admission = admission or AdmissionController()
+        self.max_in_flight = int(config.get("max_in_flight", 16))
+        self.max_batch_size = int(config.get("max_batch_size", 16))
+        self.batch_window_s = float(config.get("batch_window_ms", 0.0)) / 1000.0
+        self.batch_method: Optional[str] = config.get("batch_method")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: List[_PendingPrompt] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+
+    async def generate(self, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+        """Queues a prompt and returns the backend's response once it has been sent."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingPrompt(prompt, kwargs, future, current_priority()))
+        self.metrics.set_gauge("karta.llm.queue_depth", len(self._pending))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_task is None:
+            # Even a zero-length window lets prompts submitted in the same event
+            # loop iteration (e.g. by concurrent lookups) be grouped.
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.batch_window_s)
+        self._flush_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        # Callers that gave up (e.g. their deadline passed) no longer need an answer.
+        pending = [item for item in self._pending if not item.future.done()]
+        self._pending = []
+        self.metrics.set_gauge("karta.llm.queue_depth", 0)
+        groups: Dict[Tuple[Tuple[str, str], ...], List[_PendingPrompt]] = {}
+        for item in pending:
+            key = tuple(sorted((name, repr(value)) for name, value in item.kwargs.items()))
+            groups.setdefault(key, []).append(item)
+        for items in groups.values():
+            items.sort(key=lambda item: item.prompt)
+            for start in range(0, len(items), self.max_batch_size):
+                self._spawn(self._send(items[start:start + self.max_batch_size]))
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _limiter(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    async def _send(self, batch: List[_PendingPrompt]) -> None:
+        self.metrics.increment("karta.llm.batches")
+        self.metrics.observe("karta.llm.batch_size", len(batch))
+        batch_call = getattr(self.genie.llm, self.batch_method, None) if self.batch_method else None
+        if batch_call is not None and len(batch) > 1:
+            await self._call(batch, lambda: batch_call(prompts=[item.prompt for item in batch], **batch[0].kwargs))
+            return
+        # Issue calls in prefix order; the semaphore admits waiters first come, first served.
+        await asyncio.gather(
+            *(self._call([item], lambda item=item: self.genie.llm.generate(prompt=item.prompt, **item.kwargs)) for item in batch)
+        )
+
+    async def _call(self, batch: List[_PendingPrompt], request: Any) -> None:
+        async with self._limiter():
+            self._in_flight += 1
+            self.metrics.set_gauge("karta.llm.in_flight", self._in_flight)
+            try:
+                # A batch serves several callers, so no single caller's deadline applies to it.
+                with without_deadline():
+                    # Sent from whichever caller's context started the flush, so rank
+                    # the batch by its most urgent prompt rather than by that caller.
+                    priority = min((item.priority for item in batch), key=PRIORITIES.__getitem__)
+                    async with self.admission.admit(LLM_LIMIT_KEY, priority):
+                        response = await request()
+            except Exception as e:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                return
+            finally:
+                self._in_flight -= 1
+                self.metrics.set_gauge("karta.llm.in_flight", self._in_flight)
+        responses = response if len(batch) > 1 else [response]
+        if len(responses) != len(batch):
+            error = RuntimeError(f"Batched LLM call returned {len(responses)} responses for {len(batch)} prompts.")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(error)
+            return
+        for item, result in zip(batch, responses):
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+_current_scheduler: ContextVar[Optional[LlmScheduler]] = ContextVar("karta_llm_scheduler", default=None)
+
+
+def current_llm_scheduler() -> Optional[LlmScheduler]:
+    return _current_scheduler.get()
+
+
+@contextmanager
+def use_llm_scheduler(scheduler: Optional[LlmScheduler]) -> Iterator[None]:
+    """Routes LLM calls made by dispatchers within the block through `scheduler`."""
+    token = _current_scheduler.set(scheduler)
+    try:
+        yield
+    finally:
+        _current_scheduler.reset(token)
+
+
+async def generate(genie: Any, prompt: str, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Sends `prompt` through the active scheduler, or straight to `genie.llm`
+    when a dispatcher is used outside a KartaManager call. Records the prompt
+    and completion token counts of every call.
+    """
+    scheduler = current_llm_scheduler()
+    if scheduler is None:
+        response = await genie.llm.generate(prompt=prompt, **kwargs)
+    else:
+        response = await scheduler.generate(prompt, **kwargs)
+    _record_token_usage(prompt, response)
+    return response
+
+
+def _record_token_usage(prompt: str, response: Any) -> None:
+    metrics = current_instrumentation()
+    if not metrics.enabled:
+        # Tokenizing whole prompts is not free; skip it when nothing records the counts.
+        return
+    # Counts reported by the backend are exact; the local tokenizer fills in when it reports none.
+    usage = response.get("usage") if isinstance(response, dict) else None
+    usage = usage if isinstance(usage, dict) else {}
+    prompt_tokens = usage.get("prompt_tokens")
+    completion_tokens = usage.get("completion_tokens")
+    if prompt_tokens is None:
+        prompt_tokens = count_tokens(prompt)
+    if completion_tokens is None:
+        text = response.get("text") if isinstance(response, dict) else None
+        completion_tokens = count_tokens(text) if isinstance(text, str) else 0
+    metrics.observe("karta.llm.prompt_tokens", prompt_tokens)
+    metrics.observe("karta.llm.completion_tokens", completion_tokens)
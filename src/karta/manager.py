@@ -1,68 +1,876 @@
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, Optional
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 from genie_tooling.tools.manager import ToolManager
+from karta.admission import BATCH, AdmissionController, AdmissionRejected, use_priority
+from karta.cache.backends import CacheBackend, create_cache_backend
+from karta.cache.fact_cache import FactCache, FactKey
+from karta.cache.refresh import FactRefresher
+from karta.cache.semantic_cache import SemanticFactCache
+from karta.canonicalization import Canonicalizer
+from karta.deadline import Deadline, current_deadline, use_deadline, within_deadline, without_deadline
 from karta.dispatchers.abc import (
+    BatchFactLookupDispatcher,
     FactLookupDispatcher,
     SummarizationDispatcher,
+    WritableFactStore,
 )
-from karta.routing.router import KnowledgeRouter
-from karta.types import Fact
+from karta.llm.budget import Tokenizer, create_tokenizer, use_tokenizer
+from karta.llm.scheduler import LlmScheduler, use_llm_scheduler
+from karta.normalization import fact_key
+from karta.observability import create_instrumentation, use_instrumentation
+from karta.routing.decision_log import DecisionLog
+from karta.routing.router import KnowledgeRouter, RoutingDecision
+from karta.snapshot import Snapshot, SnapshotData, SnapshotError, embedding_model_version, write_snapshot
+from karta.startup import StartupReport
+from karta.types import Entity, Fact
 
 logger = logging.getLogger(__name__)
 
+
+def _shared_fact_key(key: FactKey) -> str:
+    return f"karta:fact:{key[0]}\x1f{key[1]}"
+
+
+class _BatchLookup:
+    """Progress of one canonical key through its cascade during `KartaManager.lookup_facts`."""
+
+    __slots__ = (
+        "entity", "attribute", "cache_key", "decision", "cascade", "position",
+        "best", "best_provider_id", "depth", "steps", "done",
+    )
+
+    def __init__(self, entity: str, attribute: str, cache_key: FactKey, decision: RoutingDecision, log: bool):
+        self.entity = entity
+        self.attribute = attribute
+        self.cache_key = cache_key
+        self.decision = decision
+        self.cascade = decision.cascade
+        self.position = 0
+        self.best: Optional[Fact] = None
+        self.best_provider_id: Optional[str] = None
+        self.depth = 0
+        self.steps: Optional[List[Dict[str, Any]]] = [] if log else None
+        self.done = False
+
+
 class KartaManager:
     """Orchestrates knowledge tasks by using the KnowledgeRouter."""
-    def __init__(self, genie: Any, plugin_manager: Any, embedder: Any, vector_store: Any, config: Dict[str, Any]):
+    def __init__(
+        self,
+        genie: Any,
+        plugin_manager: Any,
+        embedder: Any,
+        vector_store: Any,
+        config: Dict[str, Any],
+        startup_report: Optional[StartupReport] = None,
+    ):
         self.genie = genie
         self.plugin_manager = plugin_manager
         
         self.config = config
-        self.router = KnowledgeRouter(plugin_manager, embedder, vector_store, self.config.get("fact_lookup", {}))
+        self.startup_report = startup_report or StartupReport()
+        self.metrics = create_instrumentation(self.config.get("metrics"))
+        fact_lookup_config = self.config.get("fact_lookup", {})
+        # A fact at or above this confidence ends the cascade. 0.0 accepts the first answer.
+        self.min_confidence = float(fact_lookup_config.get("min_confidence", 0.0))
+        # Confidence assumed for facts whose provider does not score them.
+        self.default_confidence = float(fact_lookup_config.get("default_confidence", 1.0))
+        # Once exceeded, the cascade returns the best answer found so far instead of continuing.
+        self.latency_budget_ms = fact_lookup_config.get("latency_budget_ms")
+        # Facts resolved by remote providers are copied into local fact stores.
+        self.write_back = bool(fact_lookup_config.get("write_back", True))
+        self.write_back_min_confidence = float(fact_lookup_config.get("write_back_min_confidence", 0.5))
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._router_setup_task: Optional[asyncio.Task] = None
+        self.admission = AdmissionController(self.config.get("admission"), instrumentation=self.metrics)
+        llm_config = self.config.get("llm", {})
+        # Shared by every dispatcher call this manager makes; None sends prompts directly.
+        self.llm_scheduler: Optional[LlmScheduler] = (
+            LlmScheduler(genie, llm_config, instrumentation=self.metrics, admission=self.admission)
+            if llm_config.get("scheduler", True)
+            else None
+        )
+        # Counts and trims prompt tokens for dispatchers; the default approximates by words.
+        self.tokenizer: Tokenizer = create_tokenizer(llm_config.get("tokenizer"))
+        self.canonicalizer = Canonicalizer(
+            embedder, fact_lookup_config.get("canonicalization"), instrumentation=self.metrics
+        )
+        cache_config = fact_lookup_config.get("cache", {})
+        # Shared by every worker using the same backend; in-process caches sit in front of it.
+        self.cache_backend: Optional[CacheBackend] = create_cache_backend(self.config.get("cache_backend"))
+        self.fact_ttl_seconds: Optional[float] = cache_config.get("ttl_seconds", 300.0)
+        self.fact_cache: Optional[FactCache] = None
+        self.fact_refresher: Optional[FactRefresher] = None
+        if cache_config.get("enabled", True):
+            self.fact_cache = FactCache(
+                max_entries=int(cache_config.get("max_entries", 4096)),
+                ttl_seconds=cache_config.get("ttl_seconds", 300.0),
+                # Expired facts are still served for this long while they are refreshed.
+                stale_seconds=float(cache_config.get("stale_while_revalidate_seconds", 0.0)),
+                ttl_jitter=float(cache_config.get("ttl_jitter", 0.1)),
+            )
+            self.fact_refresher = FactRefresher(
+                self.fact_cache, self._refresh_fact, cache_config.get("refresh"), instrumentation=self.metrics
+            )
+        semantic_cache_config = fact_lookup_config.get("semantic_cache", {})
+        self.semantic_cache: Optional[SemanticFactCache] = None
+        if semantic_cache_config.get("enabled", False):
+            self.semantic_cache = SemanticFactCache(
+                threshold=float(semantic_cache_config.get("threshold", 0.93)),
+                max_entries=int(semantic_cache_config.get("max_entries", 10_000)),
+                ttl_seconds=semantic_cache_config.get("ttl_seconds", 300.0),
+                match_entity=bool(semantic_cache_config.get("match_entity", True)),
+            )
+        decision_log_config = fact_lookup_config.get("decision_log", {})
+        self.decision_log: Optional[DecisionLog] = None
+        if decision_log_config.get("path"):
+            self.decision_log = DecisionLog(
+                decision_log_config["path"],
+                max_bytes=int(decision_log_config.get("max_bytes", 10 * 1024 * 1024)),
+                backup_count=int(decision_log_config.get("backup_count", 5)),
+                sample_rate=float(decision_log_config.get("sample_rate", 1.0)),
+            )
+        self.embedder = embedder
+        self.snapshot_config: Dict[str, Any] = self.config.get("snapshot", {})
+        self.router = KnowledgeRouter(
+            plugin_manager,
+            embedder,
+            vector_store,
+            self.config.get("fact_lookup", {}),
+            startup_report=self.startup_report,
+            instrumentation=self.metrics,
+        )
 
     async def setup(self):
-        await self.router.setup()
+        snapshot_path = self.snapshot_config.get("path")
+        if snapshot_path and self.snapshot_config.get("restore_on_startup", True) and os.path.exists(snapshot_path):
+            with self.startup_report.phase("snapshot.restore"):
+                try:
+                    self.restore_snapshot(snapshot_path)
+                except (OSError, SnapshotError, KeyError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable Karta snapshot '{snapshot_path}': {e}")
+        with self.startup_report.phase("router.setup"):
+            if self.router.config.get("background_provider_setup", False):
+                # Return once the first providers are routable; the rest join as their setup finishes.
+                self._router_setup_task = asyncio.create_task(self.router.setup())
+                await self.router.wait_until_ready(self.router.config.get("ready_timeout_s"))
+            else:
+                await self.router.setup()
+        if self.fact_refresher is not None:
+            self.fact_refresher.start()
+
+    async def close(self) -> None:
+        """Waits for pending background work, such as fact write-backs, to finish, and flushes the decision log."""
+        if self._router_setup_task is not None and not self._router_setup_task.done():
+            self._router_setup_task.cancel()
+        if self._router_setup_task is not None:
+            await asyncio.gather(self._router_setup_task, return_exceptions=True)
+        if self.fact_refresher is not None:
+            await self.fact_refresher.close()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self.cache_backend is not None:
+            await self.cache_backend.close()
+        if self.decision_log is not None:
+            self.decision_log.close()
+        if self.snapshot_config.get("path") and self.snapshot_config.get("save_on_close", False):
+            self.export_snapshot()
+
+    def _model_version(self) -> str:
+        return self.snapshot_config.get("model_version") or embedding_model_version(self.embedder)
+
+    def export_snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Writes the fact caches, the canonical-name vocabularies, the router's
+        provider embeddings and the learned provider costs to a snapshot file
+        (by default the configured `snapshot.path`). Returns its size in bytes.
+        """
+        path = path or self.snapshot_config.get("path")
+        if not path:
+            raise ValueError("No snapshot path given and none configured under `snapshot.path`.")
+        data = SnapshotData(
+            model_version=self._model_version(),
+            provider_hashes=self.router.provider_description_hashes(),
+            records={"provider_costs": self.router.cost_model.export_state()},
+        )
+        provider_ids = [p for p, _ in self.router.provider_map if p in self.router.provider_embeddings]
+        if provider_ids:
+            data.arrays["router"] = [self.router.provider_embeddings[p] for p in provider_ids]
+            data.records["router"] = provider_ids
+        if self.fact_cache is not None:
+            data.records["fact_cache"] = self.fact_cache.export_entries()
+        if self.semantic_cache is not None:
+            matrix, entries = self.semantic_cache.export_state()
+            if matrix is not None:
+                data.arrays["semantic_cache"] = matrix
+                data.records["semantic_cache"] = entries
+        for name, vocabulary in (("entities", self.canonicalizer.entities), ("attributes", self.canonicalizer.attributes)):
+            matrix, state = vocabulary.export_state()
+            data.records[f"vocabulary.{name}"] = state
+            if matrix is not None:
+                data.arrays[f"vocabulary.{name}"] = matrix
+        size = write_snapshot(data, path)
+        logger.info(f"Wrote Karta snapshot to '{path}' ({size} bytes).")
+        return size
+
+    def restore_snapshot(self, path: str) -> Dict[str, int]:
+        """
+        Loads a snapshot written by `export_snapshot`. Call it before `setup` so
+        that the router can index the restored provider embeddings instead of
+        recomputing them. Embedding-derived state is only restored if the
+        snapshot was taken with the same embedding model, and each provider's
+        embedding only if its description is unchanged.
+
+        Returns:
+            How many items of each kind were restored.
+        """
+        restored: Dict[str, int] = {}
+        with Snapshot(path) as snapshot:
+            age_seconds = max(0.0, time.time() - snapshot.created)
+            records = snapshot.records
+            self.router.cost_model.restore_state(records.get("provider_costs", {}))
+            if self.fact_cache is not None:
+                restored["facts"] = self.fact_cache.restore_entries(records.get("fact_cache", []), age_seconds)
+
+            if snapshot.model_version != self._model_version():
+                logger.warning(
+                    f"Snapshot '{path}' was taken with embedding model '{snapshot.model_version}', not "
+                    f"'{self._model_version()}'; only cached facts and provider costs were restored."
+                )
+                return restored
+
+            router_matrix = snapshot.array("router")
+            if router_matrix is not None:
+                self.router.preload_embeddings(
+                    {
+                        provider_id: (snapshot.provider_hashes.get(provider_id), np.array(router_matrix[row]))
+                        for row, provider_id in enumerate(records.get("router", []))
+                    }
+                )
+                restored["provider_embeddings"] = len(records.get("router", []))
+            semantic_matrix = snapshot.array("semantic_cache")
+            if self.semantic_cache is not None and semantic_matrix is not None:
+                restored["semantic_cache"] = self.semantic_cache.restore_state(
+                    semantic_matrix, records.get("semantic_cache", []), age_seconds
+                )
+            for name, vocabulary in (("entities", self.canonicalizer.entities), ("attributes", self.canonicalizer.attributes)):
+                state = records.get(f"vocabulary.{name}")
+                if state is not None:
+                    vocabulary.restore_state(snapshot.array(f"vocabulary.{name}"), state)
+                    restored[f"vocabulary.{name}"] = len(state["names"])
+            # Drop the views into the mapped file so that it can be unmapped.
+            del router_matrix, semantic_matrix
+        logger.info(f"Restored Karta snapshot '{path}': {restored}.")
+        return restored
+
+    async def _shared_get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.cache_backend.get(key)
+        except Exception as e:
+            # The shared cache is an optimization; never fail a call because it is unavailable.
+            logger.warning(f"Shared cache read of '{key}' failed: {e}")
+            self.metrics.increment("karta.cache_backend.errors", operation="get")
+            return None
+        self.metrics.increment("karta.cache_backend.lookups", outcome="miss" if value is None else "hit")
+        return value
+
+    async def _shared_set(self, key: str, value: bytes, ttl_seconds: Optional[float]) -> None:
+        try:
+            await self.cache_backend.set(key, value, ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Shared cache write of '{key}' failed: {e}")
+            self.metrics.increment("karta.cache_backend.errors", operation="set")
+
+    def _spawn(self, coro: Any) -> asyncio.Task:
+        # Keep a reference so the task is not garbage collected mid-flight.
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def probe_readiness(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Runs a cheap canary lookup against every routable provider, concurrently
+        and at batch priority. Providers whose canary raises or times out are
+        skipped by cascades until a later probe succeeds; a canary that finds
+        nothing still counts as healthy.
+
+        The canary is set in `fact_lookup.readiness` as `canary` (default Earth's
+        mass), with per-provider overrides under `canaries`. Returns whether
+        Karta is ready and the status and latency of each provider.
+        """
+        readiness_config = self.router.config.get("readiness", {})
+        timeout = float(readiness_config.get("timeout_s", 5.0)) if timeout is None else timeout
+        default_canary = readiness_config.get("canary", {"entity": "Earth", "attribute": "mass"})
+        canaries = readiness_config.get("canaries", {})
+        provider_ids = list(dict.fromkeys(self.router.local_provider_ids + [p for p, _ in self.router.provider_map]))
+
+        async def probe(provider_id: str) -> Dict[str, Any]:
+            canary = canaries.get(provider_id, default_canary)
+            provider = await self.plugin_manager.get_plugin_instance(provider_id)
+            result: Dict[str, Any] = {}
+            started = time.perf_counter()
+            try:
+                if not isinstance(provider, FactLookupDispatcher):
+                    result["status"] = "unprobed"
+                else:
+                    with self._call_context(priority=BATCH, timeout=timeout):
+                        async with self.admission.admit(provider_id):
+                            fact = await within_deadline(
+                                provider.lookup_fact(
+                                    canary["entity"], canary["attribute"], self.genie,
+                                    self.router.get_dispatcher_config(provider_id),
+                                )
+                            )
+                    result["status"] = "ok" if fact else "miss"
+            except AdmissionRejected:
+                # Busy serving traffic is not a failure.
+                result["status"] = "busy"
+            except asyncio.TimeoutError:
+                result["status"] = "timeout"
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+            result["latency_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+            self.metrics.increment("karta.readiness.probes", provider=provider_id, status=result["status"])
+            return result
+
+        results = dict(zip(provider_ids, await asyncio.gather(*(probe(p) for p in provider_ids))))
+        unhealthy = {p for p, result in results.items() if result["status"] in ("error", "timeout")}
+        if unhealthy:
+            logger.warning(f"Readiness probe failed for {sorted(unhealthy)}; cascades will skip them.")
+        self.router.unhealthy_provider_ids = unhealthy
+        return {
+            "ready": self.router.is_ready and len(unhealthy) < len(results),
+            "providers": results,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns recorded metrics together with the bootstrap timings."""
+        return {
+            "metrics_enabled": self.metrics.enabled,
+            "metrics": self.metrics.snapshot(),
+            "startup": self.startup_report.as_dict(),
+            "provider_costs": self.router.cost_model.snapshot(),
+            "admission_queues": self.admission.queue_depths(),
+        }
+
+    @contextmanager
+    def _call_context(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Makes this manager's instrumentation, LLM scheduler and tokenizer, and
+        the caller's priority and deadline, visible to the router and dispatchers.
+        """
+        with (
+            use_instrumentation(self.metrics),
+            use_llm_scheduler(self.llm_scheduler),
+            use_tokenizer(self.tokenizer),
+            use_priority(priority),
+            use_deadline(timeout),
+        ):
+            yield
+
+    async def lookup_fact(
+        self,
+        entity: str,
+        attribute: str,
+        dispatcher_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        with self._call_context(priority, timeout), self.metrics.timer("karta.lookup_fact.latency_ms"):
+            result, depth = await self._lookup_fact(entity, attribute, dispatcher_id)
+        self.metrics.observe("karta.cascade.depth", depth)
+        self.metrics.increment("karta.lookup_fact.results", outcome="found" if result else "not_found")
+        if result:
+            self.metrics.observe("karta.lookup_fact.confidence", self._confidence_of(result))
+        return result
+
+    async def lookup_facts(
+        self,
+        queries: Sequence[Tuple[str, str]],
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Optional[Fact]]:
+        """
+        Looks up many (entity, attribute) pairs together, returning facts in the
+        order of `queries`. Misses are routed with one batched embedding call.
+        The cascades then advance in rounds: every lookup still unanswered is
+        grouped with the others whose next provider is the same, and each group
+        is sent to that provider at once. Providers implementing
+        `BatchFactLookupDispatcher` get one request per group; the others are
+        called for each member of the group concurrently.
+        """
+        with self._call_context(priority, timeout), self.metrics.timer("karta.lookup_facts.latency_ms"):
+            results = await self._lookup_facts(list(queries))
+        self.metrics.observe("karta.lookup_facts.size", len(results))
+        for result in results:
+            self.metrics.increment("karta.lookup_fact.results", outcome="found" if result else "not_found")
+        return results
+
+    def _confidence_of(self, fact: Fact) -> float:
+        return self.default_confidence if fact.confidence is None else fact.confidence
+
+    async def _refresh_fact(self, key: FactKey) -> None:
+        entity, attribute = self.fact_cache.query_for(key)
+        # Refreshes run on behalf of no caller: at batch priority and without a deadline.
+        with self._call_context(BATCH), without_deadline():
+            await self._lookup_fact(entity, attribute, None, refresh=True)
+
+    async def _lookup_fact(self, entity: str, attribute: str, dispatcher_id: Optional[str], refresh: bool = False):
+        """
+        Runs the provider cascade, returning the fact and how many providers were tried.
+
+        The cascade stops at the first fact whose confidence meets `min_confidence`.
+        Weaker facts are kept as candidates while later providers are tried, and the
+        most confident candidate is returned if the cascade runs out or the latency
+        budget is spent. With `refresh`, cached answers and local stores are skipped
+        and the fresh answer replaces them.
+
+        Under a deadline, remote providers whose estimated cost exceeds the time
+        left are skipped, each call is cut off when the deadline passes, and the
+        best fact found by then is returned.
+        """
+        started = time.perf_counter()
+        cache_key = None
+        if not dispatcher_id:
+            # Route and cache on the canonical form so that surface variants of a
+            # question share one cascade result.
+            entity, attribute = await self.canonicalizer.canonicalize(entity, attribute)
+            cache_key = fact_key(entity, attribute)
+            if not refresh:
+                cached = await self._cached_fact(cache_key, entity, attribute)
+                if cached is not None:
+                    return cached, 0
 
-    async def lookup_fact(self, entity: str, attribute: str, dispatcher_id: Optional[str] = None):
+        query_embedding = None
+        decision = None
         if dispatcher_id:
             cascade = [dispatcher_id]
         else:
-            cascade = await self.router.get_provider_cascade(f"{entity} {attribute}")
+            with self.metrics.timer("karta.routing.latency_ms"):
+                decision = await self.router.route(f"{entity} {attribute}")
+            cascade, query_embedding = decision.cascade, decision.query_embedding
+            if not refresh:
+                similar = self._semantic_cache_hit(cache_key, entity, attribute, query_embedding)
+                if similar is not None:
+                    return similar, 0
 
+        best: Optional[Fact] = None
+        best_provider_id: Optional[str] = None
+        depth = 0
+        steps: Optional[List[Dict[str, Any]]] = [] if self.decision_log is not None and decision is not None else None
+        deadline = current_deadline()
         for provider_id in cascade:
-            
+            if best and self.latency_budget_ms is not None:
+                if (time.perf_counter() - started) * 1000.0 >= self.latency_budget_ms:
+                    self.metrics.increment("karta.cascade.budget_exhausted")
+                    break
+            if deadline is not None:
+                if deadline.expired:
+                    self.metrics.increment("karta.deadline.exceeded", stage="cascade")
+                    break
+                if self._too_slow_for_deadline(provider_id, deadline):
+                    continue
+            if provider_id in self.router.unhealthy_provider_ids:
+                continue
+            if refresh and provider_id in self.router.local_provider_ids:
+                # Local stores hold the copy being refreshed; it is overwritten by write-back.
+                continue
+
             provider = await self.plugin_manager.get_plugin_instance(provider_id)
             if not provider:
                 continue
 
-            result = None
-            if isinstance(provider, FactLookupDispatcher):
-                result = await provider.lookup_fact(entity, attribute, self.genie)
-            
-            elif isinstance(provider, ToolManager):
-                tool_result = await provider.execute(params={"query": f"{attribute} of {entity}"}, context={})
-                if tool_result and not tool_result.get("error"):
-                    answer = tool_result.get("answer") or tool_result.get("result")
-                    if answer:
-                        result = Fact(entity=entity, attribute=attribute, value=str(answer), source=provider.plugin_id)
-
-            if result:
-                return result
+            depth += 1
+            step_started = time.perf_counter()
+            result = await self._query_provider(provider_id, provider, entity, attribute)
+            if steps is not None:
+                steps.append(
+                    {
+                        "provider": provider_id,
+                        "outcome": "hit" if result else "miss",
+                        "ms": round((time.perf_counter() - step_started) * 1000.0, 3),
+                        "confidence": None if not result else self._confidence_of(result),
+                    }
+                )
+            if not result:
+                continue
+            if best is None or self._confidence_of(result) > self._confidence_of(best):
+                best, best_provider_id = result, provider_id
+            if self._confidence_of(result) >= self.min_confidence:
+                break
+
+        if steps is not None:
+            self.decision_log.record(
+                decision,
+                steps,
+                best_provider_id,
+                (time.perf_counter() - started) * 1000.0,
+                local_providers=self.router.local_provider_ids,
+            )
+        self._remember(cache_key, entity, attribute, best, best_provider_id, query_embedding)
+        return best, depth
+
+    async def _cached_fact(self, cache_key: FactKey, entity: str, attribute: str) -> Optional[Fact]:
+        """Returns the fact cached for `cache_key` in process or in the shared backend, if any."""
+        if self.fact_cache is not None:
+            cached, stale = self.fact_cache.lookup(cache_key)
+            self.metrics.increment(
+                "karta.fact_cache.lookups", outcome="miss" if cached is None else ("stale" if stale else "hit")
+            )
+            if cached is not None:
+                if stale:
+                    self.fact_refresher.request_refresh(cache_key)
+                return cached
+        if self.cache_backend is not None:
+            shared = await self._shared_get(_shared_fact_key(cache_key))
+            if shared is not None:
+                fact = Fact.model_validate_json(shared)
+                if self.fact_cache is not None:
+                    self.fact_cache.put(cache_key, fact, query=(entity, attribute))
+                return fact
+        return None
+
+    def _semantic_cache_hit(
+        self, cache_key: FactKey, entity: str, attribute: str, query_embedding: Optional[Any]
+    ) -> Optional[Fact]:
+        if self.semantic_cache is None or query_embedding is None:
+            return None
+        similar = self.semantic_cache.lookup(query_embedding, cache_key[0])
+        self.metrics.increment("karta.semantic_cache.lookups", outcome="hit" if similar else "miss")
+        if similar is None:
+            return None
+        fact, similarity = similar
+        logger.debug(f"Semantic cache hit for '{entity} {attribute}' (similarity {similarity:.3f}).")
+        if self.fact_cache is not None:
+            self.fact_cache.put(cache_key, fact, query=(entity, attribute))
+        return fact
+
+    def _too_slow_for_deadline(self, provider_id: str, deadline: Deadline) -> bool:
+        # Local providers, and providers with no latency estimate yet, are tried;
+        # the call itself is still cut off at the deadline.
+        cost_model = self.router.cost_model
+        if provider_id in self.router.local_provider_ids or not cost_model.has_estimate(provider_id):
+            return False
+        expected_ms = cost_model.expected_cost_ms(provider_id)
+        if expected_ms <= deadline.remaining_ms():
+            return False
+        logger.debug(f"Skipping '{provider_id}': expected {expected_ms:.0f} ms, {deadline.remaining_ms():.0f} ms left.")
+        self.metrics.increment("karta.deadline.skipped", provider=provider_id)
+        return True
+
+    def _remember(
+        self,
+        cache_key: Optional[FactKey],
+        entity: str,
+        attribute: str,
+        best: Optional[Fact],
+        best_provider_id: Optional[str],
+        query_embedding: Optional[Any],
+    ) -> None:
+        """Caches a cascade's answer and schedules its write-back to local stores."""
+        if best is None:
+            return
+        if cache_key is not None:
+            if self.fact_cache is not None:
+                self.fact_cache.put(cache_key, best, query=(entity, attribute))
+            if self.cache_backend is not None:
+                self._spawn(
+                    self._shared_set(_shared_fact_key(cache_key), best.model_dump_json().encode("utf-8"), self.fact_ttl_seconds)
+                )
+            if self.semantic_cache is not None and query_embedding is not None:
+                self.semantic_cache.add(query_embedding, cache_key[0], best)
+        if best_provider_id not in self.router.local_provider_ids:
+            self._schedule_write_back(best)
+
+    def _schedule_write_back(self, fact: Fact) -> None:
+        if not self.write_back or not self.router.local_provider_ids:
+            return
+        if self._confidence_of(fact) < self.write_back_min_confidence:
+            return
+        self._spawn(self._write_back(fact))
+
+    async def _write_back(self, fact: Fact) -> None:
+        for provider_id in self.router.local_provider_ids:
+            provider = await self.plugin_manager.get_plugin_instance(provider_id)
+            if not isinstance(provider, WritableFactStore):
+                continue
+            try:
+                await provider.store_fact(fact)
+                self.metrics.increment("karta.fact_store.write_backs", provider=provider_id)
+            except Exception as e:
+                logger.warning(f"Failed to write fact back to local store '{provider_id}': {e}", exc_info=True)
+
+    async def _query_provider(self, provider_id: str, provider: Any, entity: str, attribute: str) -> Optional[Fact]:
+        try:
+            async with self.admission.admit(provider_id):
+                return await self._call_provider(provider_id, provider, entity, attribute)
+        except AdmissionRejected as e:
+            # Skip an overloaded provider rather than queue behind it; the cascade moves on.
+            logger.info(str(e))
+            self.metrics.increment("karta.provider.calls", provider=provider_id, outcome="rejected")
+            return None
+
+    async def _call_provider(self, provider_id: str, provider: Any, entity: str, attribute: str) -> Optional[Fact]:
+        outcome = "error"
+        call_started = time.perf_counter()
+        try:
+            with self.metrics.timer("karta.provider.latency_ms", provider=provider_id):
+                result = None
+                if isinstance(provider, FactLookupDispatcher):
+                    result = await within_deadline(
+                        provider.lookup_fact(entity, attribute, self.genie, self.router.get_dispatcher_config(provider_id))
+                    )
+
+                elif isinstance(provider, ToolManager):
+                    tool_result = await within_deadline(
+                        provider.execute(params={"query": f"{attribute} of {entity}"}, context={})
+                    )
+                    if tool_result and not tool_result.get("error"):
+                        answer = tool_result.get("answer") or tool_result.get("result")
+                        if answer:
+                            result = Fact(entity=entity, attribute=attribute, value=str(answer), source=provider.plugin_id)
+            outcome = "hit" if result else "miss"
+            return result
+        except asyncio.TimeoutError:
+            logger.info(f"Provider '{provider_id}' did not answer before the deadline.")
+            outcome = "timeout"
+            return None
+        finally:
+            self.metrics.increment("karta.provider.calls", provider=provider_id, outcome=outcome)
+            self.router.cost_model.record(
+                provider_id, (time.perf_counter() - call_started) * 1000.0, hit=outcome == "hit"
+            )
+
+    async def _lookup_facts(self, queries: List[Tuple[str, str]]) -> List[Optional[Fact]]:
+        started = time.perf_counter()
+        canonical = await self.canonicalizer.canonicalize_many(queries)
+        keys = [fact_key(entity, attribute) for entity, attribute in canonical]
+        resolved: Dict[FactKey, Optional[Fact]] = {}
+        misses: Dict[FactKey, Tuple[str, str]] = {}
+        for cache_key, (entity, attribute) in zip(keys, canonical):
+            if cache_key in resolved or cache_key in misses:
+                continue
+            cached = await self._cached_fact(cache_key, entity, attribute)
+            if cached is not None:
+                resolved[cache_key] = cached
+            else:
+                misses[cache_key] = (entity, attribute)
+
+        lookups: List[_BatchLookup] = []
+        if misses:
+            with self.metrics.timer("karta.routing.latency_ms"):
+                decisions = await self.router.route_batch([f"{e} {a}" for e, a in misses.values()])
+            for (cache_key, (entity, attribute)), decision in zip(misses.items(), decisions):
+                similar = self._semantic_cache_hit(cache_key, entity, attribute, decision.query_embedding)
+                if similar is not None:
+                    resolved[cache_key] = similar
+                else:
+                    lookups.append(_BatchLookup(entity, attribute, cache_key, decision, self.decision_log is not None))
+
+        deadline = current_deadline()
+        active = lookups
+        while active:
+            groups: Dict[str, List[_BatchLookup]] = {}
+            for lookup in active:
+                provider_id = self._next_batch_provider(lookup, started, deadline)
+                if provider_id is not None:
+                    groups.setdefault(provider_id, []).append(lookup)
+            if not groups:
+                break
+            self.metrics.observe("karta.lookup_facts.groups", len(groups))
+            await asyncio.gather(*(self._query_group(provider_id, group) for provider_id, group in groups.items()))
+            active = [lookup for lookup in active if not lookup.done]
+
+        for lookup in lookups:
+            resolved[lookup.cache_key] = lookup.best
+            self.metrics.observe("karta.cascade.depth", lookup.depth)
+            if lookup.steps is not None:
+                self.decision_log.record(
+                    lookup.decision,
+                    lookup.steps,
+                    lookup.best_provider_id,
+                    (time.perf_counter() - started) * 1000.0,
+                    local_providers=self.router.local_provider_ids,
+                )
+            self._remember(
+                lookup.cache_key, lookup.entity, lookup.attribute, lookup.best, lookup.best_provider_id,
+                lookup.decision.query_embedding,
+            )
+        return [resolved[cache_key] for cache_key in keys]
+
+    def _next_batch_provider(self, lookup: _BatchLookup, started: float, deadline: Optional[Deadline]) -> Optional[str]:
+        """The provider this lookup should try next, or None once its cascade is over."""
+        while lookup.position < len(lookup.cascade):
+            if lookup.best and self.latency_budget_ms is not None:
+                if (time.perf_counter() - started) * 1000.0 >= self.latency_budget_ms:
+                    self.metrics.increment("karta.cascade.budget_exhausted")
+                    break
+            provider_id = lookup.cascade[lookup.position]
+            if deadline is not None:
+                if deadline.expired:
+                    self.metrics.increment("karta.deadline.exceeded", stage="cascade")
+                    break
+                if self._too_slow_for_deadline(provider_id, deadline):
+                    lookup.position += 1
+                    continue
+            if provider_id in self.router.unhealthy_provider_ids:
+                lookup.position += 1
+                continue
+            return provider_id
+        lookup.done = True
         return None
 
-    async def summarize(self, text: str, style: str, dispatcher_id: Optional[str] = None):
+    async def _query_group(self, provider_id: str, group: List[_BatchLookup]) -> None:
+        provider = await self.plugin_manager.get_plugin_instance(provider_id)
+        step_started = time.perf_counter()
+        if not provider:
+            results: List[Optional[Fact]] = [None] * len(group)
+        elif len(group) > 1 and isinstance(provider, BatchFactLookupDispatcher):
+            results = await self._query_provider_batch(
+                provider_id, provider, [(lookup.entity, lookup.attribute) for lookup in group]
+            )
+        else:
+            results = await asyncio.gather(
+                *(self._query_provider(provider_id, provider, lookup.entity, lookup.attribute) for lookup in group)
+            )
+        elapsed_ms = round((time.perf_counter() - step_started) * 1000.0, 3)
+        for lookup, result in zip(group, results):
+            lookup.position += 1
+            if not provider:
+                continue
+            lookup.depth += 1
+            if lookup.steps is not None:
+                lookup.steps.append(
+                    {
+                        "provider": provider_id,
+                        "outcome": "hit" if result else "miss",
+                        "ms": elapsed_ms,
+                        "confidence": None if not result else self._confidence_of(result),
+                    }
+                )
+            if not result:
+                continue
+            if lookup.best is None or self._confidence_of(result) > self._confidence_of(lookup.best):
+                lookup.best, lookup.best_provider_id = result, provider_id
+            if self._confidence_of(result) >= self.min_confidence:
+                lookup.done = True
+
+    async def _query_provider_batch(
+        self, provider_id: str, provider: Any, queries: List[Tuple[str, str]]
+    ) -> List[Optional[Fact]]:
+        """Sends a group of lookups to a batch-capable provider as one admitted call."""
+        results: List[Optional[Fact]] = [None] * len(queries)
+        outcome = "error"
+        call_started = time.perf_counter()
+        self.metrics.observe("karta.provider.batch_size", len(queries), provider=provider_id)
+        try:
+            async with self.admission.admit(provider_id):
+                with self.metrics.timer("karta.provider.batch_latency_ms", provider=provider_id):
+                    answers = await within_deadline(
+                        provider.lookup_facts_batch(queries, self.genie, self.router.get_dispatcher_config(provider_id))
+                    )
+            if len(answers) != len(queries):
+                raise ValueError(f"returned {len(answers)} results for {len(queries)} queries")
+            results = list(answers)
+            outcome = "ok"
+        except AdmissionRejected as e:
+            logger.info(str(e))
+            outcome = "rejected"
+        except asyncio.TimeoutError:
+            logger.info(f"Provider '{provider_id}' did not answer a batch of {len(queries)} before the deadline.")
+            outcome = "timeout"
+        except Exception as e:
+            logger.error(f"Batched lookup of {len(queries)} facts from '{provider_id}' failed: {e}", exc_info=True)
+        finally:
+            self.metrics.increment("karta.provider.batch_calls", provider=provider_id, outcome=outcome)
+        if outcome != "rejected":
+            # Each lookup is charged its share of the batch, which is what it cost the provider.
+            per_query_ms = (time.perf_counter() - call_started) * 1000.0 / len(queries)
+            for result in results:
+                self.metrics.increment(
+                    "karta.provider.calls", provider=provider_id, outcome=("hit" if result else "miss") if outcome == "ok" else outcome
+                )
+                self.router.cost_model.record(provider_id, per_query_ms, hit=result is not None)
+        return results
+
+    async def summarize(
+        self,
+        text: str,
+        style: str,
+        dispatcher_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
         summary_config = self.config.get("summarization", {})
         target_id = dispatcher_id or summary_config.get("dispatcher_id", "llm_summary_dispatcher_v1")
         dispatcher = await self.plugin_manager.get_plugin_instance(target_id)
         if isinstance(dispatcher, SummarizationDispatcher):
-            return await dispatcher.summarize(text, style, self.genie, summary_config.get("dispatcher_config"))
+            shared_key = None
+            if self.cache_backend is not None:
+                digest = hashlib.sha256(f"{target_id}\x1f{style}\x1f{text}".encode("utf-8")).hexdigest()
+                shared_key = f"karta:summary:{digest}"
+                cached = await self._shared_get(shared_key)
+                if cached is not None:
+                    return cached.decode("utf-8")
+            with (
+                self._call_context(priority, timeout),
+                self.metrics.timer("karta.summarize.latency_ms", dispatcher=target_id),
+            ):
+                summary = await within_deadline(
+                    dispatcher.summarize(text, style, self.genie, summary_config.get("dispatcher_config"))
+                )
+            if shared_key is not None and summary:
+                self._spawn(
+                    self._shared_set(
+                        shared_key, summary.encode("utf-8"), summary_config.get("cache_ttl_seconds", 3600.0)
+                    )
+                )
+            return summary
         return "Error: No valid summarization dispatcher found."
 
-    async def recognize_entities(self, text: str, dispatcher_id: Optional[str] = None):
+    async def recognize_entities(
+        self,
+        text: str,
+        dispatcher_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        labels: Optional[Sequence[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Entity]:
         entity_config = self.config.get("entity_recognition", {})
         target_id = dispatcher_id or entity_config.get("dispatcher_id", "spacy_ner_dispatcher_v1")
         dispatcher = await self.plugin_manager.get_plugin_instance(target_id)
         from karta.dispatchers.abc import EntityRecognitionDispatcher
         if isinstance(dispatcher, EntityRecognitionDispatcher):
-            return await dispatcher.recognize_entities(text=text, config=entity_config.get("dispatcher_config"))
+            dispatcher_config = entity_config.get("dispatcher_config")
+            if labels or limit is not None:
+                # Dispatchers that understand these skip building entities nobody asked for;
+                # the filter and window below apply to those that do not.
+                dispatcher_config = dict(dispatcher_config or {})
+                if labels:
+                    dispatcher_config["labels"] = list(labels)
+                if limit is not None:
+                    dispatcher_config["max_entities"] = offset + limit
+            with (
+                self._call_context(timeout=timeout),
+                self.metrics.timer("karta.recognize_entities.latency_ms", dispatcher=target_id),
+            ):
+                entities = await within_deadline(
+                    dispatcher.recognize_entities(text=text, config=dispatcher_config)
+                )
+            if labels:
+                wanted = set(labels)
+                entities = [entity for entity in entities if entity.label in wanted]
+            if offset or limit is not None:
+                entities = entities[offset:None if limit is None else offset + limit]
+            return entities
         return []
\ No newline at end of file
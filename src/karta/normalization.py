@@ -0,0 +1,27 @@
+# karta-engine/src/karta/normalization.py
+
+import re
+import unicodedata
+from typing import Tuple
+
+_LEADING_ARTICLE = re.compile(r"^(the|a|an)\s+")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cheap canonical form for entity and attribute names.
+
+    Case-folds, strips accents, replaces punctuation with spaces, collapses
+    whitespace and drops a leading English article, so that "The Eiffel Tower",
+    "eiffel tower" and "Eiffel-Tower" share one key.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    collapsed = " ".join(_NON_WORD.sub(" ", stripped.casefold()).split())
+    return _LEADING_ARTICLE.sub("", collapsed)
+
+
+def fact_key(entity: str, attribute: str) -> Tuple[str, str]:
+    """Returns the normalized (entity, attribute) pair used to index facts."""
+    return normalize_text(entity), normalize_text(attribute)
@@ -0,0 +1,201 @@
+import logging
+import math
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Deque, Dict, Iterator, Optional
+
+from karta.lazy import lazy_import
+
+logger = logging.getLogger(__name__)
+
+otel_trace = lazy_import("opentelemetry.trace")
+
+# Shared, stateless context manager handed out by the no-op implementation so
+# that disabled instrumentation allocates nothing per call.
+_NULL_CONTEXT = nullcontext()
+
+
+def _metric_key(name: str, tags: Dict[str, Any]) -> str:
+    if not tags:
+        return name
+    rendered = ",".join(f"{k}={tags[k]}" for k in sorted(tags))
+    return f"{name}{{{rendered}}}"
+
+
+class Instrumentation:
+    """
+    The instrumentation surface used across Karta. This base class is the
+    default and does nothing; every method returns immediately.
+    """
+
+    enabled: bool = False
+
+    def timer(self, name: str, **tags: Any) -> ContextManager[None]:
+        """Times the enclosed block in milliseconds and records it under `name`."""
+        return _NULL_CONTEXT
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        """Adds a sample to the histogram `name`."""
+
+    def increment(self, name: str, value: int = 1, **tags: Any) -> None:
+        """Adds `value` to the counter `name`."""
+
+    def set_gauge(self, name: str, value: float, **tags: Any) -> None:
+        """Sets the gauge `name` to its current value."""
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        """Opens a tracing span around the enclosed block."""
+        return _NULL_CONTEXT
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns every recorded metric as plain data."""
+        return {}
+
+
+NOOP_INSTRUMENTATION = Instrumentation()
+
+
+class Histogram:
+    """Running count/sum/min/max plus a bounded window of recent samples for percentiles."""
+
+    __slots__ = ("count", "total", "min", "max", "_samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p99": round(self.percentile(99), 3),
+        }
+
+
+class MetricsRecorder(Instrumentation):
+    """
+    In-process histograms, counters and gauges, optionally mirrored as
+    OpenTelemetry spans. Queryable through `KartaInterface.stats()`.
+    """
+
+    enabled: bool = True
+
+    def __init__(self, window: int = 1024, tracer: Optional[Any] = None):
+        self.window = window
+        self.tracer = tracer
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+
+    @contextmanager
+    def _timed(self, name: str, tags: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with self.span(name, **tags):
+                yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000.0, **tags)
+
+    def timer(self, name: str, **tags: Any) -> ContextManager[None]:
+        return self._timed(name, tags)
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        key = _metric_key(name, tags)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.window)
+        histogram.add(value)
+
+    def increment(self, name: str, value: int = 1, **tags: Any) -> None:
+        key = _metric_key(name, tags)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **tags: Any) -> None:
+        self.gauges[_metric_key(name, tags)] = value
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[None]:
+        if self.tracer is None:
+            return _NULL_CONTEXT
+        return self.tracer.start_as_current_span(
+            name, attributes={k: str(v) for k, v in attributes.items()}
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "histograms": {key: h.summary() for key, h in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": dict(sorted(self.gauges.items())),
+        }
+
+
+def create_instrumentation(config: Optional[Dict[str, Any]]) -> Instrumentation:
+    """
+    Builds Karta's instrumentation from the `metrics` configuration block.
+
+    Config keys:
+        enabled (bool): Record metrics. Defaults to False (no-op).
+        window (int): Recent samples kept per histogram for percentiles.
+        tracing (str): Set to "opentelemetry" to also emit spans via the
+            globally configured OpenTelemetry tracer provider.
+    """
+    config = config or {}
+    if not config.get("enabled", False):
+        return NOOP_INSTRUMENTATION
+
+    tracer = None
+    if config.get("tracing") == "opentelemetry":
+        if otel_trace:
+            tracer = otel_trace.get_tracer("karta")
+        else:
+            logger.warning(
+                "Karta tracing is set to 'opentelemetry' but the 'opentelemetry-api' package is not installed. "
+                "Spans will not be emitted."
+            )
+    return MetricsRecorder(window=int(config.get("window", 1024)), tracer=tracer)
+
+
+_current_instrumentation: ContextVar[Instrumentation] = ContextVar(
+    "karta_instrumentation", default=NOOP_INSTRUMENTATION
+)
+
+
+def current_instrumentation() -> Instrumentation:
+    """Returns the instrumentation of the Karta call currently executing (no-op outside one)."""
+    return _current_instrumentation.get()
+
+
+@contextmanager
+def use_instrumentation(instrumentation: Instrumentation) -> Iterator[None]:
+    """Makes `instrumentation` visible to dispatchers invoked within the block."""
+    token = _current_instrumentation.set(instrumentation)
+    try:
+        yield
+    finally:
+        _current_instrumentation.reset(token)
@@ -0,0 +1,197 @@
+# karta-engine/src/karta/precompute.py
+"""
+Offline resolution of a known workload of (entity, attribute) keys.
+
+A manifest names the keys, typically as the cross product of entity and
+attribute lists ("every attribute of every country"):
+
+    {
+      "groups": [
+        {"entities": ["France", "Germany"], "attributes": ["capital", "population"]},
+        {"entities_file": "elements.txt", "attributes": ["atomic number"]}
+      ],
+      "keys": [["Lead", "melting point"]]
+    }
+
+`entities_file` and `attributes_file` name text files with one item per line,
+relative to the manifest. Each key is looked up through `KartaManager` at batch
+priority, so the usual cascade, write-back and shared cache apply, and found
+facts can also be written to a fact store file that `local_fact_store_dispatcher_v1`
+serves. Progress is appended to a checkpoint file, so an interrupted run
+resumes where it stopped.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from karta.admission import BATCH, AdmissionController
+from karta.normalization import fact_key
+from karta.store.sqlite_store import SqliteFactStore
+from karta.types import Fact
+
+logger = logging.getLogger(__name__)
+
+# Admission key under which precompute lookups are rate limited.
+PRECOMPUTE_LIMIT_KEY = "precompute"
+
+# Outcomes recorded in the checkpoint. Keys that ended in an error are retried on resume.
+FOUND = "found"
+NOT_FOUND = "not_found"
+ERROR = "error"
+_STAT_FIELDS = {FOUND: "found", NOT_FOUND: "not_found", ERROR: "errors"}
+
+
+@dataclass
+class PrecomputeStats:
+    keys: int = 0
+    skipped: int = 0
+    found: int = 0
+    not_found: int = 0
+    errors: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def _read_lines(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_manifest(path: str) -> List[Tuple[str, str]]:
+    """Returns the manifest's (entity, attribute) keys in order, without normalized duplicates."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    def items(group: Dict[str, Any], name: str) -> List[str]:
+        values = list(group.get(name, []))
+        if group.get(f"{name}_file"):
+            values.extend(_read_lines(os.path.join(base_dir, group[f"{name}_file"])))
+        return values
+
+    pairs: List[Tuple[str, str]] = []
+    for group in manifest.get("groups", []):
+        attributes = items(group, "attributes")
+        pairs.extend((entity, attribute) for entity in items(group, "entities") for attribute in attributes)
+    pairs.extend((entity, attribute) for entity, attribute in manifest.get("keys", []))
+
+    seen: Set[Tuple[str, str]] = set()
+    keys = []
+    for entity, attribute in pairs:
+        key = fact_key(entity, attribute)
+        if key not in seen:
+            seen.add(key)
+            keys.append((entity, attribute))
+    return keys
+
+
+class Checkpoint:
+    """
+    An append-only JSON Lines record of finished keys. Every line is flushed as
+    it is written, so a crash loses at most the lookups still in flight.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[Tuple[str, str]] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash.
+                        continue
+                    if record.get("outcome") in (FOUND, NOT_FOUND):
+                        self.done.add(fact_key(record["entity"], record["attribute"]))
+        self._file = open(path, "a", encoding="utf-8")
+
+    def is_done(self, entity: str, attribute: str) -> bool:
+        return fact_key(entity, attribute) in self.done
+
+    def record(self, entity: str, attribute: str, outcome: str) -> None:
+        if outcome in (FOUND, NOT_FOUND):
+            self.done.add(fact_key(entity, attribute))
+        self._file.write(json.dumps({"entity": entity, "attribute": attribute, "outcome": outcome}) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def precompute(
+    manager: Any,
+    keys: Iterable[Tuple[str, str]],
+    concurrency: int = 8,
+    rate_per_second: Optional[float] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    store: Optional[SqliteFactStore] = None,
+    timeout: Optional[float] = None,
+    progress_every: int = 1000,
+) -> PrecomputeStats:
+    """
+    Looks up every key through `manager` at batch priority.
+
+    At most `concurrency` lookups are in flight, and no more than
+    `rate_per_second` are started per second. Keys the checkpoint already
+    records as found or not found are skipped. Found facts are written to
+    `store`, if given, before the key is checkpointed.
+    """
+    stats = PrecomputeStats()
+    started = time.monotonic()
+    # A burst of one spreads the lookups evenly instead of front-loading each second.
+    limit = {"rate_per_second": rate_per_second, "burst": 1.0, "max_queue_wait_ms": None}
+    admission = AdmissionController(
+        {"providers": {PRECOMPUTE_LIMIT_KEY: limit}},
+        instrumentation=manager.metrics,
+    )
+    queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def resolve(entity: str, attribute: str) -> str:
+        try:
+            async with admission.admit(PRECOMPUTE_LIMIT_KEY, priority=BATCH):
+                fact: Optional[Fact] = await manager.lookup_fact(entity, attribute, priority=BATCH, timeout=timeout)
+        except Exception as e:
+            # One failing key must not abort a long job; it is retried on the next run.
+            logger.warning(f"Precompute lookup of '{attribute}' of '{entity}' failed: {e}")
+            return ERROR
+        if fact is None:
+            return NOT_FOUND
+        if store is not None:
+            await asyncio.to_thread(store.put, fact)
+        return FOUND
+
+    async def worker() -> None:
+        while True:
+            entity, attribute = await queue.get()
+            try:
+                outcome = await resolve(entity, attribute)
+                counter = _STAT_FIELDS[outcome]
+                setattr(stats, counter, getattr(stats, counter) + 1)
+                if checkpoint is not None:
+                    checkpoint.record(entity, attribute, outcome)
+                finished = stats.found + stats.not_found + stats.errors
+                if progress_every and finished % progress_every == 0:
+                    logger.info(f"Precomputed {finished} keys ({stats.found} found, {stats.errors} errors).")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        for entity, attribute in keys:
+            stats.keys += 1
+            if checkpoint is not None and checkpoint.is_done(entity, attribute):
+                stats.skipped += 1
+                continue
+            await queue.put((entity, attribute))
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    stats.elapsed_seconds = time.monotonic() - started
+    return stats
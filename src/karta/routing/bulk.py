@@ -0,0 +1,162 @@
+# karta-engine/src/karta/routing/bulk.py
+"""
+Vectorized routing for offline workloads.
+
+`bulk_cascades` is the array form of `build_cascade`: it takes the similarity
+of every query to every provider as one matrix and applies top-k selection,
+pruning, expected-latency ordering, and the local, priority and fallback rules
+to all rows at once. Cascades come back as a padded matrix of provider indices
+rather than one list of strings per query.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from karta.routing.cost import ProviderCostModel
+
+# Pads cascades shorter than the widest one.
+NO_PROVIDER = -1
+
+
+@dataclass
+class BulkRouting:
+    """
+    Cascades for many queries. Row `i` of `cascades` lists indices into
+    `providers` in the order they should be tried, padded with `NO_PROVIDER`.
+    `scores` holds the routing similarity of each entry, or NaN for providers
+    placed by rule (local, priority, fallback, or pre-routed).
+    """
+
+    providers: List[str]
+    cascades: np.ndarray
+    scores: np.ndarray
+
+    def __len__(self) -> int:
+        return self.cascades.shape[0]
+
+    def cascade(self, row: int) -> List[str]:
+        return [self.providers[i] for i in self.cascades[row] if i != NO_PROVIDER]
+
+
+def _index_dtype(count: int) -> np.dtype:
+    return np.dtype(np.int16 if count < np.iinfo(np.int16).max else np.int32)
+
+
+def _compact(cascades: np.ndarray, scores: np.ndarray, count: int) -> BulkRouting:
+    """Moves each row's padding to its end and trims columns no row uses."""
+    order = np.argsort(cascades == NO_PROVIDER, axis=1, kind="stable")
+    cascades = np.take_along_axis(cascades, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    width = int((cascades != NO_PROVIDER).sum(axis=1).max()) if cascades.size else 0
+    return cascades[:, :width].astype(_index_dtype(count)), scores[:, :width].astype(np.float32)
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def bulk_cascades(
+    scores: np.ndarray,
+    provider_ids: Sequence[str],
+    config: Dict[str, Any],
+    cost_model: Optional[ProviderCostModel] = None,
+    local_providers: Sequence[str] = (),
+    top_k: int = 5,
+    valid: Optional[np.ndarray] = None,
+) -> BulkRouting:
+    """
+    Builds the cascade of every query from its similarity to each provider.
+
+    Args:
+        scores: (queries, providers) similarities, columns ordered as `provider_ids`.
+        provider_ids: The routed providers the score columns belong to.
+        config: Router configuration, as for `build_cascade`.
+        cost_model: Used for `routing_strategy: "expected_latency"`.
+        local_providers: Providers tried before all others.
+        top_k: How many of the most similar providers each query considers.
+        valid: Optional boolean mask of queries with a usable embedding. The
+            others, like a failed embedding in `KnowledgeRouter.route`, get only
+            the local providers.
+
+    Row for row, the result matches `build_cascade` on each query's top-k
+    providers.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    n = scores.shape[0]
+    valid = np.ones(n, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+    priority = list(config.get("priority_providers", []))
+    lead = list(dict.fromkeys(list(local_providers) + priority))
+    fallback = config.get("fallback_provider")
+    providers = list(dict.fromkeys(lead + list(provider_ids) + ([fallback] if fallback else [])))
+    index = {provider_id: i for i, provider_id in enumerate(providers)}
+    lead_labels = np.array([index[p] for p in lead], dtype=np.int64)
+
+    # Local providers always lead; priority providers only for queries that were routed at all.
+    lead_block = np.tile(lead_labels, (n, 1))
+    lead_is_local = np.array([p in set(local_providers) for p in lead], dtype=bool)
+    lead_block[~valid[:, None] & ~lead_is_local[None, :]] = NO_PROVIDER
+    blocks = [lead_block]
+    score_blocks = [np.full(lead_block.shape, np.nan, dtype=np.float32)]
+
+    k = min(top_k, scores.shape[1])
+    ranked = np.empty((n, 0), dtype=np.int64)
+    if k:
+        top = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        keep = np.repeat(valid[:, None], k, axis=1)
+        min_score = config.get("min_score")
+        if min_score is not None:
+            keep &= top_scores >= min_score
+        score_margin = config.get("score_margin")
+        if score_margin is not None:
+            keep &= top_scores[:, :1] - top_scores <= score_margin
+
+        if cost_model is not None and config.get("routing_strategy") == "expected_latency":
+            hit_rates = np.array([cost_model.hit_rate(p) for p in provider_ids], dtype=np.float32)
+            costs = np.array([max(cost_model.expected_cost_ms(p), 1e-3) for p in provider_ids], dtype=np.float32)
+            efficiency = np.clip(top_scores, 0.0, 1.0) * hit_rates[top] / costs[top]
+            order = np.argsort(np.where(keep, -efficiency, np.inf), axis=1, kind="stable")
+            top, top_scores, keep = (np.take_along_axis(a, order, axis=1) for a in (top, top_scores, keep))
+
+        column_labels = np.array([index[p] for p in provider_ids], dtype=np.int64)
+        ranked = column_labels[top]
+        keep &= ~np.isin(ranked, lead_labels)
+        ranked = np.where(keep, ranked, NO_PROVIDER)
+        blocks.append(ranked)
+        score_blocks.append(np.where(keep, top_scores, np.nan))
+
+    if fallback and fallback not in lead:
+        present = (ranked == index[fallback]).any(axis=1)
+        blocks.append(np.where(present | ~valid, NO_PROVIDER, index[fallback])[:, None])
+        score_blocks.append(np.full((n, 1), np.nan, dtype=np.float32))
+
+    cascades, cascade_scores = _compact(np.hstack(blocks), np.hstack(score_blocks), len(providers))
+    return BulkRouting(providers=providers, cascades=cascades, scores=cascade_scores)
+
+
+def with_fixed_cascades(routing: BulkRouting, rows: Dict[int, List[str]]) -> BulkRouting:
+    """Replaces the cascades of `rows` (row -> provider IDs), e.g. with pre-routed ones."""
+    if not rows:
+        return routing
+    providers = list(routing.providers)
+    index = {provider_id: i for i, provider_id in enumerate(providers)}
+    for cascade in rows.values():
+        for provider_id in cascade:
+            if provider_id not in index:
+                index[provider_id] = len(providers)
+                providers.append(provider_id)
+    width = max(routing.cascades.shape[1], max(len(cascade) for cascade in rows.values()))
+    cascades = np.full((len(routing), width), NO_PROVIDER, dtype=np.int64)
+    cascades[:, : routing.cascades.shape[1]] = routing.cascades
+    scores = np.full(cascades.shape, np.nan, dtype=np.float32)
+    scores[:, : routing.scores.shape[1]] = routing.scores
+    for row, cascade in rows.items():
+        cascades[row] = NO_PROVIDER
+        cascades[row, : len(cascade)] = [index[p] for p in cascade]
+        scores[row] = np.nan
+    cascades, scores = _compact(cascades, scores, len(providers))
+    return BulkRouting(providers=providers, cascades=cascades, scores=scores)
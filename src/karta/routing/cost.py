@@ -0,0 +1,93 @@
+# karta-engine/src/karta/routing/cost.py
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COST_MS = 500.0
+DEFAULT_HIT_RATE = 0.5
+
+
+class ProviderCostModel:
+    """
+    Tracks what calling each knowledge provider costs and how often it answers.
+
+    Latency and hit rate are exponentially weighted moving averages of what the
+    manager observes, seeded from `provider_costs_ms` in the router config so
+    that the model is usable before any traffic has been seen.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.smoothing = float(config.get("cost_smoothing", 0.2))
+        self.default_cost_ms = float(config.get("default_provider_cost_ms", DEFAULT_COST_MS))
+        self._latency_ms: Dict[str, float] = {
+            provider_id: float(ms) for provider_id, ms in config.get("provider_costs_ms", {}).items()
+        }
+        self._hit_rate: Dict[str, float] = {}
+        self._observations: Dict[str, int] = {}
+
+    def record(self, provider_id: str, latency_ms: float, hit: bool) -> None:
+        """Folds one observed provider call into the estimates."""
+        alpha = self.smoothing
+        previous = self._latency_ms.get(provider_id)
+        self._latency_ms[provider_id] = (
+            latency_ms if previous is None else (1 - alpha) * previous + alpha * latency_ms
+        )
+        previous_rate = self._hit_rate.get(provider_id, DEFAULT_HIT_RATE)
+        self._hit_rate[provider_id] = (1 - alpha) * previous_rate + alpha * (1.0 if hit else 0.0)
+        self._observations[provider_id] = self._observations.get(provider_id, 0) + 1
+
+    def expected_cost_ms(self, provider_id: str) -> float:
+        return self._latency_ms.get(provider_id, self.default_cost_ms)
+
+    def has_estimate(self, provider_id: str) -> bool:
+        """True once the provider's latency has been seeded or observed, rather than defaulted."""
+        return provider_id in self._latency_ms
+
+    def hit_rate(self, provider_id: str) -> float:
+        return self._hit_rate.get(provider_id, DEFAULT_HIT_RATE)
+
+    def answer_probability(self, provider_id: str, score: Optional[float]) -> float:
+        """Estimates P(provider answers this query) from its routing score and track record."""
+        relevance = 1.0 if score is None else min(1.0, max(0.0, score))
+        return relevance * self.hit_rate(provider_id)
+
+    def order_by_expected_latency(self, scored: Sequence[Tuple[str, Optional[float]]]) -> List[str]:
+        """
+        Orders providers to minimize the expected time until the first answer.
+
+        For a sequential cascade this is achieved by trying providers in
+        descending order of answer probability per millisecond of cost.
+        """
+
+        def efficiency(item: Tuple[str, Optional[float]]) -> float:
+            provider_id, score = item
+            return self.answer_probability(provider_id, score) / max(self.expected_cost_ms(provider_id), 1e-3)
+
+        return [provider_id for provider_id, _ in sorted(scored, key=efficiency, reverse=True)]
+
+    def export_state(self) -> Dict[str, List[float]]:
+        return {
+            provider_id: [self._latency_ms[provider_id], self.hit_rate(provider_id), self._observations.get(provider_id, 0)]
+            for provider_id in self._latency_ms
+        }
+
+    def restore_state(self, state: Dict[str, List[float]]) -> None:
+        """Takes over estimates learned by an earlier process; they replace configured priors."""
+        for provider_id, (latency_ms, hit_rate, observations) in state.items():
+            self._latency_ms[provider_id] = float(latency_ms)
+            self._hit_rate[provider_id] = float(hit_rate)
+            self._observations[provider_id] = int(observations)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        provider_ids = set(self._latency_ms) | set(self._hit_rate)
+        return {
+            provider_id: {
+                "expected_cost_ms": round(self.expected_cost_ms(provider_id), 3),
+                "hit_rate": round(self.hit_rate(provider_id), 4),
+                "observations": self._observations.get(provider_id, 0),
+            }
+            for provider_id in sorted(provider_ids)
+        }
@@ -0,0 +1,107 @@
+# karta-engine/src/karta/routing/decision_log.py
+
+import glob
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from karta.routing.router import RoutingDecision
+
+logger = logging.getLogger(__name__)
+
+RECORD_VERSION = 1
+
+
+class DecisionLog:
+    """
+    Appends one compact JSON line per routed lookup to a size-rotated file.
+
+    Records are handed to a background thread through a queue, so logging never
+    blocks the event loop on disk I/O. Each record holds the query, how it was
+    routed, the provider scores, the cascade, every provider call with its
+    outcome and latency, and which provider answered.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        sample_rate: float = 1.0,
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._handler = handler
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        # A private logger, detached from the hierarchy so records never reach app handlers.
+        self._logger = logging.Logger(f"karta.decision_log.{path}")
+        self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+
+    def record(
+        self,
+        decision: RoutingDecision,
+        steps: List[Dict[str, Any]],
+        answered_by: Optional[str],
+        total_ms: float,
+        local_providers: Iterable[str] = (),
+    ) -> None:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        entry: Dict[str, Any] = {
+            "v": RECORD_VERSION,
+            "ts": round(time.time(), 3),
+            "query": decision.query,
+            "source": decision.source,
+            "scores": {p: (None if s is None else round(float(s), 4)) for p, s in decision.scores.items()},
+            "cascade": decision.cascade,
+            "steps": steps,
+            "answered_by": answered_by,
+            "total_ms": round(total_ms, 3),
+        }
+        if decision.pruned:
+            entry["pruned"] = decision.pruned
+        local = list(local_providers)
+        if local:
+            entry["local"] = local
+        if self._listener is None:
+            self._listener = logging.handlers.QueueListener(self._queue, self._handler)
+            self._listener.start()
+        self._logger.info(json.dumps(entry, separators=(",", ":"), ensure_ascii=False))
+
+    def close(self) -> None:
+        """Writes out queued records. Logging again afterwards reopens the file."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._handler.close()
+
+
+def read_decisions(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields logged decision records, oldest first. Each path also picks up its
+    rotated backups (`path.1`, `path.2`, ...).
+    """
+    for path in paths:
+        backups = sorted(glob.glob(f"{glob.escape(path)}.[0-9]*"), key=lambda p: int(p.rsplit(".", 1)[1]), reverse=True)
+        for file_path in backups + [path]:
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError:
+                            # A crash mid-write leaves a truncated last line.
+                            logger.warning(f"Skipping malformed decision record in '{file_path}'.")
+            except FileNotFoundError:
+                logger.warning(f"Decision log '{file_path}' not found; skipping.")
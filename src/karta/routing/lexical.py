@@ -0,0 +1,176 @@
+# karta-engine/src/karta/routing/lexical.py
+"""
+A first-stage router that resolves obvious queries without an embedding.
+
+Compiled regex rules catch queries whose provider is clear from their surface
+form (arithmetic and unit conversions go to WolframAlpha, "who is X" goes to
+Wikipedia). An optional linear classifier, trained on logged routing decisions,
+handles the next tier of easy queries. Anything neither stage is confident
+about falls through to the semantic router.
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WOLFRAM_PROVIDER_ID = "wolfram_alpha_dispatcher_v1"
+WIKIPEDIA_PROVIDER_ID = "wikipedia_fact_dispatcher_v1"
+
+_UNITS = (
+    # Single-letter symbols are left out: "5 g network" and "Windows 10 m" are not quantities.
+    r"km|kilometers?|meters?|cm|mm|mi|miles?|ft|feet|foot|inch(?:es)?|kg|kilograms?|grams?|lbs?|pounds?|"
+    r"oz|ounces?|liters?|litres?|gallons?|°[cfk]|celsius|fahrenheit|kelvin|mph|kph|km/h|m/s|"
+    r"usd|eur|gbp|jpy|dollars?|euros?|hz|khz|mhz|ghz|kb|mb|gb|tb|joules?|kwh|watts?"
+)
+
+DEFAULT_RULES: Tuple[Tuple[str, Sequence[str]], ...] = (
+    # Pure arithmetic such as "2 + 2" or "(3.5*4)^2".
+    (r"^[\s\d.,()]*\d[\s\d.,()]*[-+*/^×÷%][\s\d.,()+\-*/^×÷%]*$", (WOLFRAM_PROVIDER_ID,)),
+    # Quantities with units and conversions: "12 km in miles", "convert 30 °C".
+    (rf"\b\d+(?:[.,]\d+)?\s*(?:{_UNITS})\b|\bconvert\b|\b(?:{_UNITS})\s+(?:to|in)\s+(?:{_UNITS})\b", (WOLFRAM_PROVIDER_ID,)),
+    (r"\b(?:square root|derivative|integral|factorial|logarithm|sqrt)\b|\blog\s*\(?\d", (WOLFRAM_PROVIDER_ID,)),
+    # Biographical questions.
+    (r"^(?:who|whom)\s+(?:is|was|were|are)\b|\b(?:biography|birthplace|born|spouse|nationality)\b", (WIKIPEDIA_PROVIDER_ID,)),
+)
+
+
+@dataclass
+class LexicalRule:
+    pattern: Pattern[str]
+    providers: List[str]
+
+
+@dataclass
+class PreRoute:
+    """A confident first-stage routing result."""
+
+    providers: List[str]
+    score: float
+    method: str
+
+
+def _tokens(query: str) -> List[str]:
+    return re.findall(r"[a-z]+|\d+|[^\sa-z\d]", query.lower())
+
+
+class LinearQueryClassifier:
+    """
+    A multinomial logistic regression over hashed token features.
+
+    Small enough to evaluate in microseconds and to train in-process on a few
+    thousand logged (query, answering provider) pairs.
+    """
+
+    def __init__(self, labels: Sequence[str], dim: int = 4096, weights: Optional[np.ndarray] = None):
+        self.labels = list(labels)
+        self.dim = dim
+        self.weights = weights if weights is not None else np.zeros((dim + 1, len(self.labels)), dtype=np.float32)
+
+    def featurize(self, query: str) -> np.ndarray:
+        features = np.zeros(self.dim + 1, dtype=np.float32)
+        features[self.dim] = 1.0  # bias
+        tokens = _tokens(query)
+        for token in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest()
+            features[int.from_bytes(digest, "little") % self.dim] += 1.0
+        norm = float(np.linalg.norm(features[: self.dim]))
+        if norm > 0:
+            features[: self.dim] /= norm
+        return features
+
+    def predict_proba(self, query: str) -> np.ndarray:
+        logits = self.featurize(query) @ self.weights
+        logits -= logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        probabilities = self.predict_proba(query)
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+    @classmethod
+    def fit(
+        cls,
+        examples: Iterable[Tuple[str, str]],
+        dim: int = 4096,
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "LinearQueryClassifier":
+        """Trains on (query, provider_id) pairs with full-batch gradient descent."""
+        examples = list(examples)
+        if not examples:
+            raise ValueError("Cannot train a query classifier without examples.")
+        labels = sorted({label for _, label in examples})
+        if len(labels) < 2:
+            # Softmax over a single class is always 1.0, so every query would be pre-routed to it.
+            raise ValueError(f"A query classifier needs examples for at least two providers, got {labels}.")
+        classifier = cls(labels, dim)
+        features = np.stack([classifier.featurize(query) for query, _ in examples])
+        targets = np.zeros((len(examples), len(labels)), dtype=np.float32)
+        for row, (_, label) in enumerate(examples):
+            targets[row, labels.index(label)] = 1.0
+        weights = classifier.weights
+        for _ in range(epochs):
+            logits = features @ weights
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            gradient = features.T @ (probabilities - targets) / len(examples) + l2 * weights
+            weights -= learning_rate * gradient
+        return classifier
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(f, weights=self.weights, labels=np.array(self.labels), dim=self.dim)
+
+    @classmethod
+    def load(cls, path: str) -> "LinearQueryClassifier":
+        with np.load(path) as data:
+            return cls([str(label) for label in data["labels"]], int(data["dim"]), data["weights"])
+
+
+class LexicalPreRouter:
+    """Resolves confidently routable queries before the semantic router is consulted."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        rule_specs: List[Tuple[str, Sequence[str]]] = []
+        if config.get("use_default_rules", True):
+            rule_specs.extend(DEFAULT_RULES)
+        rule_specs.extend((rule["pattern"], rule["providers"]) for rule in config.get("rules", []))
+        self.rules = [
+            LexicalRule(re.compile(pattern, re.IGNORECASE), list(providers)) for pattern, providers in rule_specs
+        ]
+        self.classifier_threshold = float(config.get("classifier_threshold", 0.9))
+        self.classifier: Optional[LinearQueryClassifier] = None
+        classifier_path = config.get("classifier_path")
+        if classifier_path:
+            try:
+                self.classifier = LinearQueryClassifier.load(classifier_path)
+            except (OSError, KeyError, ValueError) as e:
+                logger.error(f"Could not load pre-router classifier from '{classifier_path}': {e}")
+
+    def route(self, query: str, available: Optional[Iterable[str]] = None) -> Optional[PreRoute]:
+        """
+        Returns the providers for `query` if a rule or the classifier is confident,
+        otherwise None. Providers not in `available` are ignored.
+        """
+        allowed = set(available) if available is not None else None
+        for rule in self.rules:
+            if rule.pattern.search(query):
+                providers = [p for p in rule.providers if allowed is None or p in allowed]
+                if providers:
+                    return PreRoute(providers=providers, score=1.0, method="rule")
+        if self.classifier is not None:
+            provider_id, probability = self.classifier.predict(query)
+            if probability >= self.classifier_threshold and (allowed is None or provider_id in allowed):
+                return PreRoute(providers=[provider_id], score=probability, method="classifier")
+        return None
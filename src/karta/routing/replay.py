@@ -0,0 +1,191 @@
+# karta-engine/src/karta/routing/replay.py
+"""
+Offline evaluation of router configurations against a decision log.
+
+Each logged lookup is re-routed with the candidate configuration, using the
+logged provider scores instead of a live embedding, and its cascade is
+simulated. Provider calls observed in the log keep their recorded outcome and
+latency. For providers the original cascade never reached, the per-provider
+hit rate and mean latency across the whole log are used, so results for those
+steps are expectations rather than observations.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from karta.routing.lexical import LexicalPreRouter
+from karta.routing.router import build_cascade
+
+DEFAULT_UNSEEN_LATENCY_MS = 500.0
+DEFAULT_UNSEEN_HIT_RATE = 0.5
+
+
+@dataclass
+class ProviderProfile:
+    calls: int = 0
+    hits: int = 0
+    total_ms: float = 0.0
+
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else DEFAULT_UNSEEN_HIT_RATE
+
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else DEFAULT_UNSEEN_LATENCY_MS
+
+
+@dataclass
+class ReplayResult:
+    name: str
+    lookups: int = 0
+    expected_calls: float = 0.0
+    expected_latency_ms: float = 0.0
+    expected_answer_rate: float = 0.0
+    estimated_steps: float = 0.0
+    cascade_changes: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if self.lookups:
+            data["calls_per_lookup"] = round(self.expected_calls / self.lookups, 4)
+            data["latency_ms_per_lookup"] = round(self.expected_latency_ms / self.lookups, 3)
+            data["answer_rate"] = round(self.expected_answer_rate / self.lookups, 4)
+        return data
+
+
+@dataclass
+class ReplayReport:
+    baseline: ReplayResult
+    candidates: List[ReplayResult] = field(default_factory=list)
+
+    def savings(self) -> List[Dict[str, Any]]:
+        rows = []
+        for candidate in self.candidates:
+            rows.append(
+                {
+                    "name": candidate.name,
+                    "calls_saved": round(self.baseline.expected_calls - candidate.expected_calls, 3),
+                    "latency_ms_saved": round(self.baseline.expected_latency_ms - candidate.expected_latency_ms, 3),
+                    "answer_rate_change": round(
+                        (candidate.expected_answer_rate - self.baseline.expected_answer_rate)
+                        / max(self.baseline.lookups, 1),
+                        4,
+                    ),
+                }
+            )
+        return rows
+
+
+def build_profiles(records: Iterable[Dict[str, Any]]) -> Dict[str, ProviderProfile]:
+    profiles: Dict[str, ProviderProfile] = {}
+    for record in records:
+        for step in record.get("steps", []):
+            profile = profiles.setdefault(step["provider"], ProviderProfile())
+            profile.calls += 1
+            profile.hits += step["outcome"] == "hit"
+            profile.total_ms += step["ms"]
+    return profiles
+
+
+def candidate_cascade(
+    record: Dict[str, Any],
+    config: Dict[str, Any],
+    pre_router: Optional[LexicalPreRouter] = None,
+) -> List[str]:
+    """Re-derives the cascade a logged query would get under `config`."""
+    local = record.get("local", [])
+    scores: Dict[str, Optional[float]] = record.get("scores", {})
+    if pre_router is not None:
+        pre_route = pre_router.route(record["query"])
+        if pre_route is not None:
+            cascade, _ = build_cascade(
+                [(p, pre_route.score) for p in pre_route.providers], config, local_providers=local
+            )
+            return cascade
+    scored = [(p, s) for p, s in scores.items() if p not in local]
+    scored.sort(key=lambda item: -1.0 if item[1] is None else item[1], reverse=True)
+    top_k = config.get("top_k")
+    if top_k is not None:
+        scored = scored[:top_k]
+    cascade, _ = build_cascade(scored, config, local_providers=local)
+    return cascade
+
+
+def simulate(
+    record: Dict[str, Any], cascade: List[str], profiles: Dict[str, ProviderProfile]
+) -> Tuple[float, float, float, float]:
+    """
+    Walks `cascade` for one logged lookup.
+
+    Returns:
+        Expected (provider calls, latency in ms, probability of an answer,
+        number of estimated rather than observed steps).
+    """
+    observed = {step["provider"]: step for step in record.get("steps", [])}
+    reach = 1.0
+    calls = latency = estimated = 0.0
+    for provider_id in cascade:
+        step = observed.get(provider_id)
+        if step is not None:
+            hit_probability = 1.0 if step["outcome"] == "hit" else 0.0
+            step_ms = step["ms"]
+        else:
+            profile = profiles.get(provider_id, ProviderProfile())
+            hit_probability, step_ms = profile.hit_rate(), profile.mean_ms()
+            estimated += reach
+        calls += reach
+        latency += reach * step_ms
+        reach *= 1.0 - hit_probability
+        if reach <= 0.0:
+            break
+    return calls, latency, 1.0 - reach, estimated
+
+
+def replay(
+    records: Iterable[Dict[str, Any]],
+    candidates: Dict[str, Dict[str, Any]],
+) -> ReplayReport:
+    """
+    Compares the logged cascades against each candidate router configuration.
+
+    A candidate config uses the same keys as the `fact_lookup` router config
+    (`min_score`, `score_margin`, `priority_providers`, `fallback_provider`,
+    `pre_router`), plus `top_k`.
+    """
+    records = list(records)
+    profiles = build_profiles(records)
+    report = ReplayReport(baseline=ReplayResult(name="logged"))
+    runs = []
+    for name, config in candidates.items():
+        pre_router_config = config.get("pre_router", {})
+        pre_router = LexicalPreRouter(pre_router_config) if pre_router_config.get("enabled", False) else None
+        runs.append((ReplayResult(name=name), config, pre_router))
+        report.candidates.append(runs[-1][0])
+
+    for record in records:
+        logged = record["cascade"]
+        baseline = report.baseline
+        calls, latency, answered, estimated = simulate(record, logged, profiles)
+        baseline.lookups += 1
+        baseline.expected_calls += calls
+        baseline.expected_latency_ms += latency
+        baseline.expected_answer_rate += answered
+        baseline.estimated_steps += estimated
+        for result, config, pre_router in runs:
+            cascade = candidate_cascade(record, config, pre_router)
+            calls, latency, answered, estimated = simulate(record, cascade, profiles)
+            result.lookups += 1
+            result.expected_calls += calls
+            result.expected_latency_ms += latency
+            result.expected_answer_rate += answered
+            result.estimated_steps += estimated
+            result.cascade_changes += cascade != logged
+    return report
+
+
+def training_examples(records: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """(query, answering provider) pairs for `LinearQueryClassifier.fit`, excluding local providers."""
+    return [
+        (record["query"], record["answered_by"])
+        for record in records
+        if record.get("answered_by") and record["answered_by"] not in record.get("local", [])
+    ]
@@ -1,13 +1,87 @@
 # karta-engine/src/karta/routing/router.py
 
+import asyncio
 import logging
-from typing import Any, AsyncIterable, Dict, List, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 from genie_tooling.core.types import Chunk
+from karta.chunks import TextChunk, embed_texts
+from karta.deadline import within_deadline
 from karta.dispatchers.abc import KnowledgeProvider
+from karta.observability import NOOP_INSTRUMENTATION, Instrumentation
+from karta.routing.bulk import BulkRouting, bulk_cascades, unit_rows, with_fixed_cascades
+from karta.routing.cost import ProviderCostModel
+from karta.routing.lexical import LexicalPreRouter
+from karta.snapshot import description_hash
+from karta.startup import StartupReport
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of the query stream inside `route_stream`.
+_END_OF_STREAM = object()
+
+
+@dataclass
+class RoutingDecision:
+    """The outcome of routing one query: the cascade to try and how it was derived."""
+
+    query: str
+    cascade: List[str]
+    scores: Dict[str, Optional[float]] = field(default_factory=dict)
+    pruned: List[str] = field(default_factory=list)
+    query_embedding: Optional[Any] = None
+    source: str = "semantic"
+
+
+def build_cascade(
+    scored: Sequence[Tuple[str, Optional[float]]],
+    config: Dict[str, Any],
+    cost_model: Optional[ProviderCostModel] = None,
+    local_providers: Sequence[str] = (),
+) -> Tuple[List[str], List[str]]:
+    """
+    Turns similarity-ranked providers into the cascade the manager will try.
+
+    Providers scoring below `min_score`, or more than `score_margin` below the
+    best score, are pruned. With `routing_strategy: "expected_latency"` the
+    survivors are reordered by the cost model instead of raw similarity.
+    Local providers lead, then priority providers; the fallback provider
+    always trails. None of these are subject to pruning.
+
+    Returns:
+        A tuple of (cascade, pruned provider IDs).
+    """
+    min_score = config.get("min_score")
+    score_margin = config.get("score_margin")
+    known_scores = [score for _, score in scored if score is not None]
+    best_score = max(known_scores) if known_scores else None
+
+    kept: List[Tuple[str, Optional[float]]] = []
+    pruned: List[str] = []
+    for provider_id, score in scored:
+        if score is not None and (
+            (min_score is not None and score < min_score)
+            or (score_margin is not None and best_score - score > score_margin)
+        ):
+            pruned.append(provider_id)
+        else:
+            kept.append((provider_id, score))
+
+    if cost_model is not None and config.get("routing_strategy") == "expected_latency":
+        ranked_ids = cost_model.order_by_expected_latency(kept)
+    else:
+        ranked_ids = [provider_id for provider_id, _ in kept]
+
+    priority_list = config.get("priority_providers", [])
+    cascade = list(dict.fromkeys(list(local_providers) + priority_list + ranked_ids))
+    fallback = config.get("fallback_provider")
+    if fallback and fallback not in cascade:
+        cascade.append(fallback)
+    return cascade, [provider_id for provider_id in pruned if provider_id not in cascade]
+
 
 class KnowledgeRouter:
     """Intelligently routes a knowledge query by using the core framework's embedding and vector store services."""
@@ -18,6 +92,8 @@ class KnowledgeRouter:
         embedder: Any,
         vector_store: Any,
         config: Dict[str, Any],
+        startup_report: Optional[StartupReport] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ):
         """
         Initializes the router with injected dependencies from the core framework.
@@ -27,121 +103,432 @@ class KnowledgeRouter:
             embedder: The core embedding provider.
             vector_store: The core vector store provider (e.g., from the RAG facade).
             config: The configuration for the router.
+            startup_report: Optional report that receives the duration of each setup phase.
+            instrumentation: Optional metrics sink for per-query routing timings.
         """
         self.plugin_manager = plugin_manager
         self.embedder = embedder
         self.vector_store = vector_store
         self.config = config
+        self.startup_report = startup_report or StartupReport()
+        self.metrics = instrumentation or NOOP_INSTRUMENTATION
+        self.cost_model = ProviderCostModel(self.config)
         self.provider_map: List[Tuple[str, str]] = []  # (plugin_id, description)
+        # Description embeddings as indexed, kept for snapshots.
+        self.provider_embeddings: Dict[str, np.ndarray] = {}
+        self._preloaded_embeddings: Dict[str, Tuple[str, np.ndarray]] = {}
+        # Providers answering from on-host data; always tried first.
+        self.local_provider_ids: List[str] = []
         self.is_ready = False
+        # Set once the first providers are indexed, or when setup ends without any.
+        self._ready_event = asyncio.Event()
+        self._indexing_ms = 0.0
+        # Providers whose last readiness probe failed; the manager skips them in cascades.
+        self.unhealthy_provider_ids: Set[str] = set()
         self.collection_name = self.config.get(
             "collection_name", "karta_knowledge_providers"
         )
+        pre_router_config = self.config.get("pre_router", {})
+        self.pre_router: Optional[LexicalPreRouter] = (
+            LexicalPreRouter(pre_router_config) if pre_router_config.get("enabled", False) else None
+        )
+
+    def preload_embeddings(self, embeddings: Dict[str, Tuple[str, np.ndarray]]) -> None:
+        """
+        Supplies description embeddings, keyed by provider ID as (description
+        hash, vector), for `setup` to index instead of re-embedding.
+        """
+        self._preloaded_embeddings = dict(embeddings)
+
+    def provider_description_hashes(self) -> Dict[str, str]:
+        return {plugin_id: description_hash(desc) for plugin_id, desc in self.provider_map}
+
+    def get_dispatcher_config(self, plugin_id: str) -> Dict[str, Any]:
+        """Returns the router-level configuration block for a specific dispatcher."""
+        return self.config.get("dispatcher_specific_configs", {}).get(plugin_id, {})
+
+    async def _setup_provider(self, plugin_instance: Any) -> None:
+        with self.startup_report.phase(f"provider_setup.{plugin_instance.plugin_id}"):
+            # Pass this specific config to the plugin's setup method.
+            setup = plugin_instance.setup(self.get_dispatcher_config(plugin_instance.plugin_id))
+            timeout = self.config.get("provider_setup_timeout_s", 30.0)
+            await (asyncio.wait_for(setup, timeout) if timeout is not None else setup)
 
     async def setup(self):
-        """Discovers knowledge providers and adds their descriptions to the vector store."""
+        """
+        Discovers knowledge providers, sets them up concurrently and adds their
+        descriptions to the vector store.
+
+        Providers are indexed as soon as their own setup finishes, so the router
+        is ready, and routes to the providers online so far, once the first one
+        is indexed. A provider whose setup fails or exceeds
+        `provider_setup_timeout_s` is left out of routing.
+        """
         logger.info(
             "KnowledgeRouter setup: Discovering and indexing knowledge providers..."
         )
 
-        all_knowledge_providers = (
-            await self.plugin_manager.get_all_plugin_instances_by_type(KnowledgeProvider)
-        )
+        with self.startup_report.phase("router.discovery"):
+            all_knowledge_providers = (
+                await self.plugin_manager.get_all_plugin_instances_by_type(KnowledgeProvider)
+            )
 
         exclude_list = self.config.get("exclude_providers", [])
+        self._indexing_ms = 0.0
+        try:
+            if self.config.get("defer_provider_setup", False):
+                # Dispatchers initialize themselves on first use; the manager hands them
+                # their dispatcher-specific config on every call.
+                logger.info("KnowledgeRouter: Deferring knowledge provider setup until first use.")
+                # Providers whose cheap setup decides whether they can be routed at all are still set up.
+                eager = [p for p in all_knowledge_providers if getattr(p, "eager_setup", False) is True]
+                await self._set_up_and_bring_online(eager, exclude_list)
+                await self._bring_online(
+                    [p for p in all_knowledge_providers if p not in eager and p.plugin_id not in exclude_list]
+                )
+            else:
+                await self._set_up_and_bring_online(all_knowledge_providers, exclude_list)
+        finally:
+            self._preloaded_embeddings = {}
+            self.startup_report.record("router.provider_indexing", self._indexing_ms)
+            self._ready_event.set()
 
-        for plugin_instance in all_knowledge_providers:
-            # Get config for this specific dispatcher from the router's main config
-            dispatcher_config = self.config.get("dispatcher_specific_configs", {}).get(
-                plugin_instance.plugin_id, {}
+        if not self.provider_map:
+            logger.warning("No knowledge providers found to index.")
+        else:
+            logger.info(
+                f"KnowledgeRouter indexed {len(self.provider_map)} providers into collection '{self.collection_name}'."
             )
-            # Pass this specific config to the plugin's setup method.
-            await plugin_instance.setup(dispatcher_config)
 
-            if plugin_instance.plugin_id in exclude_list:
-                continue
+    async def _set_up_and_bring_online(self, providers: List[Any], exclude_list: Sequence[str]) -> None:
+        # Providers are independent, so one slow setup (e.g. a network check)
+        # must not serialize the others.
+        tasks = {asyncio.create_task(self._setup_provider(p)): p for p in providers}
+        pending = set(tasks)
+        with self.startup_report.phase("router.provider_setup"):
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    online = []
+                    for task in done:
+                        plugin_instance = tasks[task]
+                        error = task.exception()
+                        if error is not None:
+                            reason = "timed out" if isinstance(error, asyncio.TimeoutError) else "failed"
+                            logger.error(
+                                f"Knowledge provider '{plugin_instance.plugin_id}' {reason} during setup and will not be routed to: {error}",
+                                exc_info=error,
+                            )
+                            self.metrics.increment("karta.router.provider_setup", provider=plugin_instance.plugin_id, outcome=reason)
+                        elif plugin_instance.plugin_id not in exclude_list:
+                            online.append(plugin_instance)
+                    # Setups that finish while a group is being indexed form the next group.
+                    await self._bring_online(sorted(online, key=providers.index))
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    async def _bring_online(self, providers: List[Any]) -> None:
+        """Indexes the descriptions of newly set-up providers and makes them routable."""
+        entries: List[Tuple[str, str]] = []
+        for plugin_instance in providers:
+            if getattr(plugin_instance, "is_local_source", False) is True:
+                self.local_provider_ids.append(plugin_instance.plugin_id)
             description = plugin_instance.knowledge_description
             if description:
-                self.provider_map.append((plugin_instance.plugin_id, description))
-
-        if not self.provider_map:
-            logger.warning("No knowledge providers found to index.")
+                entries.append((plugin_instance.plugin_id, description))
+        if not entries:
             return
 
+        # Embeddings restored from a snapshot are reused while the description they were computed from is unchanged.
+        reused = {
+            plugin_id: self._preloaded_embeddings[plugin_id][1]
+            for plugin_id, desc in entries
+            if plugin_id in self._preloaded_embeddings
+            and self._preloaded_embeddings[plugin_id][0] == description_hash(desc)
+        }
+        descriptions = dict(entries)
+        embeddings: Dict[str, np.ndarray] = {}
+
         async def _provider_chunks() -> AsyncIterable[Chunk]:
             """Helper async generator to create Chunk objects for the embedder."""
+            for plugin_id, desc in entries:
+                if plugin_id not in reused:
+                    yield TextChunk(plugin_id, desc)
 
-            class ProviderChunk(Chunk):
-                def __init__(self, _id, _content):
-                    self.id = _id
-                    self.content = _content
-                    self.metadata = {}
-
-            for plugin_id, desc in self.provider_map:
-                yield ProviderChunk(plugin_id, desc)
+        async def _provider_embeddings(embedding_stream: Optional[AsyncIterable[Any]]) -> AsyncIterable[Tuple[Chunk, Any]]:
+            for plugin_id, vector in reused.items():
+                embeddings[plugin_id] = vector
+                yield TextChunk(plugin_id, descriptions[plugin_id]), vector.tolist()
+            if embedding_stream is not None:
+                async for chunk, vector in embedding_stream:
+                    embeddings[chunk.id] = np.asarray(vector, dtype=np.float32)
+                    yield chunk, vector
 
+        started = time.perf_counter()
         try:
-            
-            embedding_stream = await self.embedder.embed(chunks=_provider_chunks())
+            embedding_stream = (
+                await self.embedder.embed(chunks=_provider_chunks()) if len(reused) < len(entries) else None
+            )
             await self.vector_store.add(
-                embeddings=embedding_stream,
+                embeddings=_provider_embeddings(embedding_stream),
                 config={"collection_name": self.collection_name},
             )
-            self.is_ready = True
-            logger.info(
-                f"KnowledgeRouter indexed {len(self.provider_map)} providers into collection '{self.collection_name}'."
-            )
         except Exception as e:
             logger.error(
-                f"Failed to index knowledge providers in vector store: {e}",
+                f"Failed to index knowledge providers {[plugin_id for plugin_id, _ in entries]} in vector store: {e}",
                 exc_info=True,
             )
-            self.is_ready = False
+            return
+        finally:
+            self._indexing_ms += (time.perf_counter() - started) * 1000.0
 
-    async def get_provider_cascade(self, query: str, top_k: int = 5) -> List[str]:
+        self.provider_embeddings.update(embeddings)
+        self.provider_map.extend(entries)
         if not self.is_ready:
-            return (
-                [self.config.get("fallback_provider")]
-                if self.config.get("fallback_provider")
-                else []
-            )
+            self.is_ready = True
+            self._ready_event.set()
+        self.metrics.set_gauge("karta.router.providers_online", len(self.provider_map))
+        logger.info(
+            f"KnowledgeRouter: {[plugin_id for plugin_id, _ in entries]} online"
+            f" ({len(reused)} embeddings reused from a snapshot)."
+        )
 
-        class QueryChunk(Chunk):
-            def __init__(self, content):
-                self.id = "query"
-                self.content = content
-                self.metadata = {}
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the first providers are routable, or until setup has
+        finished without any. Returns `is_ready`, or False on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._ready_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.is_ready
 
-        async def query_chunk_generator() -> AsyncIterable[Chunk]:
-            yield QueryChunk(query)
+    async def get_provider_cascade(self, query: str, top_k: int = 5) -> List[str]:
+        return (await self.route(query, top_k=top_k)).cascade
+
+    def _fallback_decision(self, query: str) -> RoutingDecision:
+        cascade, _ = build_cascade(
+            [], {"fallback_provider": self.config.get("fallback_provider")}, local_providers=self.local_provider_ids
+        )
+        return RoutingDecision(query=query, cascade=cascade, source="fallback")
 
+    def _pre_route(self, query: str) -> Optional[RoutingDecision]:
+        if self.pre_router is None:
+            return None
+        pre_route = self.pre_router.route(query, available=(p for p, _ in self.provider_map))
+        if pre_route is None:
+            return None
+        self.metrics.increment("karta.routing.pre_routed", method=pre_route.method)
+        cascade, _ = build_cascade(
+            [(provider_id, pre_route.score) for provider_id in pre_route.providers],
+            self.config,
+            self.cost_model,
+            local_providers=self.local_provider_ids,
+        )
+        return RoutingDecision(
+            query=query,
+            cascade=cascade,
+            scores={provider_id: pre_route.score for provider_id in pre_route.providers},
+            source=f"lexical_{pre_route.method}",
+        )
+
+    async def _decide(self, query: str, query_vector: Any, top_k: int) -> RoutingDecision:
         try:
-            
-            query_embedding_stream = await self.embedder.embed(
-                chunks=query_chunk_generator()
+            with self.metrics.timer("karta.routing.search_ms"):
+                search_results = await within_deadline(
+                    self.vector_store.search(
+                        query_embedding=query_vector,
+                        top_k=min(top_k, len(self.provider_map)),
+                        config={"collection_name": self.collection_name},
+                    )
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline passed while searching providers for '{query}'; routing to local providers only.")
+            self.metrics.increment("karta.deadline.exceeded", stage="routing")
+            return RoutingDecision(
+                query=query, cascade=list(self.local_provider_ids), query_embedding=query_vector, source="deadline"
             )
-            query_embedding_result = [res async for res in query_embedding_stream]
-        except Exception as e:
-            logger.error(f"Error getting query embedding: {e}", exc_info=True)
-            query_embedding_result = []
+        scored = [(chunk.id, getattr(chunk, "score", None)) for chunk in search_results if chunk.id]
 
-        if not query_embedding_result:
-            logger.warning("Could not generate embedding for query.")
-            return []
-        query_vector = query_embedding_result[0][1]
+        final_cascade, pruned = build_cascade(
+            scored, self.config, self.cost_model, local_providers=self.local_provider_ids
+        )
+        if pruned:
+            self.metrics.increment("karta.routing.pruned", len(pruned))
 
-        search_results = await self.vector_store.search(
+        logger.debug(f"Knowledge cascade for query '{query}': {final_cascade} (pruned: {pruned})")
+        return RoutingDecision(
+            query=query,
+            cascade=final_cascade,
+            scores=dict(scored),
+            pruned=pruned,
             query_embedding=query_vector,
-            top_k=min(top_k, len(self.provider_map)),
-            config={"collection_name": self.collection_name},
         )
-        ranked_ids = [chunk.id for chunk in search_results if chunk.id]
 
-        priority_list = self.config.get("priority_providers", [])
-        final_cascade = list(dict.fromkeys(priority_list + ranked_ids))
-        fallback = self.config.get("fallback_provider")
-        if fallback and fallback not in final_cascade:
-            final_cascade.append(fallback)
+    async def route_batch(self, queries: Sequence[str], top_k: int = 5) -> List[RoutingDecision]:
+        """
+        Routes several queries at once. Queries the pre-router cannot decide are
+        embedded in a single embedder call, and their vector searches run
+        concurrently. Decisions are returned in input order.
+        """
+        if not self.is_ready:
+            return [self._fallback_decision(query) for query in queries]
 
-        logger.debug(f"Knowledge cascade for query '{query}': {final_cascade}")
-        return final_cascade
\ No newline at end of file
+        decisions: List[Optional[RoutingDecision]] = [self._pre_route(query) for query in queries]
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+        if not pending:
+            return decisions
+
+        self.metrics.observe("karta.routing.embedding_batch_size", len(pending))
+        try:
+            with self.metrics.timer("karta.routing.embedding_ms"):
+                vectors = await within_deadline(embed_texts(self.embedder, [queries[i] for i in pending]))
+        except asyncio.TimeoutError:
+            # Out of time: only local providers are cheap enough to still be worth trying.
+            logger.warning(f"Deadline passed while embedding {len(pending)} queries; routing to local providers only.")
+            self.metrics.increment("karta.deadline.exceeded", stage="routing")
+            for i in pending:
+                decisions[i] = RoutingDecision(query=queries[i], cascade=list(self.local_provider_ids), source="deadline")
+            return decisions
+        except Exception as e:
+            logger.error(f"Error getting query embeddings: {e}", exc_info=True)
+            vectors = [None] * len(pending)
+
+        searches = []
+        for i, vector in zip(pending, vectors):
+            if vector is None:
+                logger.warning(f"Could not generate embedding for query '{queries[i]}'.")
+                decisions[i] = RoutingDecision(query=queries[i], cascade=list(self.local_provider_ids), source="none")
+            else:
+                searches.append((i, self._decide(queries[i], vector, top_k)))
+        for (i, _), decision in zip(searches, await asyncio.gather(*(search for _, search in searches))):
+            decisions[i] = decision
+        return decisions
+
+    async def route_bulk(
+        self, queries: Sequence[str], top_k: int = 5, batch_size: int = 1024, use_pre_router: bool = True
+    ) -> BulkRouting:
+        """
+        Routes a large offline workload in bulk. Queries are embedded
+        `batch_size` at a time and scored against every provider's description
+        embedding with one matrix product, and the cascade rules are applied to
+        all queries as arrays. Scores are cosine similarities, whatever metric
+        the vector store uses, so `min_score` and `score_margin` are read as
+        cosine thresholds.
+        """
+        provider_ids = [p for p, _ in self.provider_map if p in self.provider_embeddings]
+        if not self.is_ready or not provider_ids:
+            return bulk_cascades(
+                np.zeros((len(queries), 0), dtype=np.float32),
+                [],
+                {"fallback_provider": self.config.get("fallback_provider")},
+                local_providers=self.local_provider_ids,
+            )
+
+        pre_routed: Dict[int, List[str]] = {}
+        if use_pre_router and self.pre_router is not None:
+            for i, query in enumerate(queries):
+                decision = self._pre_route(query)
+                if decision is not None:
+                    pre_routed[i] = decision.cascade
+        pending = [i for i in range(len(queries)) if i not in pre_routed]
+
+        provider_matrix = unit_rows(np.stack([self.provider_embeddings[p] for p in provider_ids]))
+        scores = np.zeros((len(queries), len(provider_ids)), dtype=np.float32)
+        valid = np.zeros(len(queries), dtype=bool)
+        with self.metrics.timer("karta.routing.bulk_ms"):
+            for start in range(0, len(pending), batch_size):
+                rows = pending[start:start + batch_size]
+                try:
+                    vectors = await embed_texts(self.embedder, [queries[i] for i in rows])
+                except Exception as e:
+                    logger.error(f"Error embedding {len(rows)} queries for bulk routing: {e}", exc_info=True)
+                    continue
+                embedded = [(row, vector) for row, vector in zip(rows, vectors) if vector is not None]
+                if not embedded:
+                    continue
+                embedded_rows = np.array([row for row, _ in embedded])
+                query_matrix = unit_rows(np.stack([np.asarray(vector, dtype=np.float32) for _, vector in embedded]))
+                scores[embedded_rows] = query_matrix @ provider_matrix.T
+                valid[embedded_rows] = True
+            routing = bulk_cascades(
+                scores, provider_ids, self.config, self.cost_model, self.local_provider_ids, top_k=top_k, valid=valid
+            )
+        self.metrics.increment("karta.routing.bulk_queries", len(queries))
+        return with_fixed_cascades(routing, pre_routed)
+
+    async def route(self, query: str, top_k: int = 5) -> RoutingDecision:
+        """
+        Routes a query to a cascade of providers, keeping the similarity score of
+        each candidate, the providers pruned for low relevance, and the query
+        embedding so that callers can reuse it.
+
+        If the current deadline passes while the query is embedded or searched,
+        the cascade is cut down to the local providers.
+        """
+        return (await self.route_batch([query], top_k=top_k))[0]
+
+    async def route_stream(
+        self,
+        queries: AsyncIterable[str],
+        top_k: int = 5,
+        batch_size: int = 64,
+        batch_window_ms: float = 5.0,
+    ) -> AsyncIterator[RoutingDecision]:
+        """
+        Routes a stream of queries, yielding one decision per query in input
+        order. Queries that arrive within `batch_window_ms` of each other are
+        routed together, up to `batch_size` at a time, so the embedder sees
+        batches instead of single queries. Suited to long-lived stages in
+        streaming ingestion jobs: the pipeline runs until `queries` is exhausted,
+        and reading ahead stops once `2 * batch_size` queries are waiting.
+        """
+        queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=batch_size * 2)
+
+        async def produce() -> None:
+            # No sentinel when cancelled: the consumer has gone, and with a full
+            # queue the put would never return.
+            try:
+                async for query in queries:
+                    await queue.put(query)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await queue.put(_END_OF_STREAM)
+                raise
+            await queue.put(_END_OF_STREAM)
+
+        loop = asyncio.get_running_loop()
+        producer = asyncio.create_task(produce())
+        try:
+            finished = False
+            while not finished:
+                batch = [await queue.get()]
+                if batch[0] is _END_OF_STREAM:
+                    break
+                window_ends = loop.time() + batch_window_ms / 1000.0
+                while len(batch) < batch_size:
+                    if queue.empty():
+                        remaining = window_ends - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            query = await asyncio.wait_for(queue.get(), timeout=remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        query = queue.get_nowait()
+                    if query is _END_OF_STREAM:
+                        finished = True
+                        break
+                    batch.append(query)
+                for decision in await self.route_batch(batch, top_k=top_k):
+                    yield decision
+            # Surface an error raised by the query source.
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
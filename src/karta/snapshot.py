@@ -0,0 +1,168 @@
+# karta-engine/src/karta/snapshot.py
+"""
+A versioned binary snapshot of Karta's in-memory state.
+
+File layout (integers little-endian):
+
+    preamble  magic, format version u32, header length u32
+    header    UTF-8 JSON: embedding model version, a hash of each provider's
+              description, the offset and shape of every array, and the
+              record section's offset and length; offsets are relative to
+              the data section, which starts at the next 64-byte boundary
+    arrays    raw float32 matrices (router, vocabulary and semantic cache
+              embeddings), each aligned to 64 bytes
+    records   zlib-compressed JSON: cached facts, vocabulary names and
+              aliases, provider cost estimates
+
+The file is memory-mapped on restore, so arrays are read straight from the
+mapped pages and sections that fail validation are never read at all.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b"KARTASNP"
+VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a snapshot this version of Karta can read."""
+
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+
+def embedding_model_version(embedder: Any) -> str:
+    """Identifies the embedding model, so embeddings from another model are never restored."""
+    parts = [getattr(embedder, "plugin_id", None) or type(embedder).__name__]
+    for attribute in ("model_name", "model_name_or_path", "model"):
+        value = getattr(embedder, attribute, None)
+        if isinstance(value, str) and value:
+            parts.append(value)
+            break
+    return ":".join(parts)
+
+
+@dataclass
+class SnapshotData:
+    model_version: str
+    provider_hashes: Dict[str, str] = field(default_factory=dict)
+    records: Dict[str, Any] = field(default_factory=dict)
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def write_snapshot(data: SnapshotData, path: str) -> int:
+    """
+    Writes `data` to `path`, atomically replacing any existing file.
+
+    Returns:
+        The size of the file in bytes.
+    """
+    arrays = {name: np.ascontiguousarray(array, dtype=np.float32) for name, array in data.arrays.items()}
+    records = zlib.compress(json.dumps(data.records, separators=(",", ":")).encode("utf-8"), 6)
+
+    array_specs: Dict[str, Any] = {}
+    offset = 0
+    for name, array in arrays.items():
+        array_specs[name] = {"offset": offset, "shape": list(array.shape)}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps(
+        {
+            "created": round(time.time(), 3),
+            "model_version": data.model_version,
+            "providers": data.provider_hashes,
+            "arrays": array_specs,
+            "records": {"offset": offset, "length": len(records)},
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (data_start + array_specs[name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+        f.write(b"\0" * (data_start + offset - f.tell()))
+        f.write(records)
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class Snapshot:
+    """A memory-mapped snapshot file. Arrays are views of the mapped pages, valid until `close`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mm) < _PREAMBLE.size:
+                raise SnapshotError(f"'{path}' is too short to be a Karta snapshot.")
+            magic, version, header_length = _PREAMBLE.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise SnapshotError(f"'{path}' is not a Karta snapshot.")
+            if version != VERSION:
+                raise SnapshotError(f"'{path}' has snapshot format {version}; this version of Karta reads {VERSION}.")
+            header = json.loads(bytes(self._mm[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+        except Exception:
+            self._mm.close()
+            raise
+        self.created: float = header["created"]
+        self.model_version: str = header["model_version"]
+        self.provider_hashes: Dict[str, str] = header["providers"]
+        self._arrays: Dict[str, Dict[str, Any]] = header["arrays"]
+        self._records_section: Dict[str, int] = header["records"]
+        self._data_start = _align(_PREAMBLE.size + header_length)
+        self._records: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def records(self) -> Dict[str, Any]:
+        if self._records is None:
+            start = self._data_start + self._records_section["offset"]
+            compressed = self._mm[start:start + self._records_section["length"]]
+            self._records = json.loads(zlib.decompress(compressed))
+        return self._records
+
+    def array(self, name: str) -> Optional[np.ndarray]:
+        spec = self._arrays.get(name)
+        if spec is None:
+            return None
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape)) if shape else 1
+        return np.frombuffer(
+            self._mm, dtype=np.float32, count=count, offset=self._data_start + spec["offset"]
+        ).reshape(shape)
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            # Arrays handed out are still referenced; the mapping is released with the last of them.
+            pass
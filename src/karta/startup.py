@@ -0,0 +1,34 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Records how long each phase of Karta's bootstrap took, in milliseconds."""
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the enclosed block and records it under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000.0)
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.phases[name] = round(duration_ms, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"phases_ms": dict(self.phases)}
+
+    def log(self) -> None:
+        if not self.phases:
+            return
+        breakdown = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self.phases.items())
+        logger.info(f"Karta startup timings: {breakdown}")
@@ -0,0 +1,124 @@
+# karta-engine/src/karta/store/bulk_import.py
+
+import csv
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from karta.lazy import lazy_import
+from karta.store.fact_index import compile_fact_index
+from karta.types import Fact
+
+pyarrow_parquet = lazy_import("pyarrow.parquet")
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "jsonl", "parquet")
+
+
+@dataclass
+class ImportStats:
+    rows_read: int = 0
+    rows_skipped: int = 0
+    facts_written: int = 0
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension in ("csv", "parquet"):
+        return extension
+    raise ValueError(f"Cannot infer the format of '{path}'; pass one of {SUPPORTED_FORMATS}.")
+
+
+def _iter_rows(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif fmt == "parquet":
+        if not pyarrow_parquet:
+            raise ImportError("Importing Parquet files requires 'pyarrow'. Please install it.")
+        for batch in pyarrow_parquet.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'; expected one of {SUPPORTED_FORMATS}.")
+
+
+def _present(value: Any) -> bool:
+    return value is not None and str(value).strip() != ""
+
+
+def iter_facts(
+    path: str,
+    fmt: Optional[str] = None,
+    entity_column: str = "entity",
+    attribute_column: str = "attribute",
+    value_column: str = "value",
+    source: Optional[str] = None,
+    wide: bool = False,
+    stats: Optional[ImportStats] = None,
+) -> Iterator[Fact]:
+    """
+    Reads facts from a CSV, JSONL or Parquet file.
+
+    In the default "long" layout each row holds one fact in the entity,
+    attribute and value columns (plus optional `source` and `confidence`). With
+    `wide=True` each row describes one entity and every other non-empty column
+    is an attribute, which is how most catalogs and entity tables are exported.
+    """
+    fmt = fmt or detect_format(path)
+    stats = stats if stats is not None else ImportStats()
+    source = source or os.path.basename(path)
+    for row in _iter_rows(path, fmt):
+        stats.rows_read += 1
+        entity = row.get(entity_column)
+        if not _present(entity):
+            stats.rows_skipped += 1
+            continue
+        if wide:
+            for column, value in row.items():
+                if column != entity_column and _present(value):
+                    yield Fact(entity=str(entity), attribute=str(column), value=str(value), source=source)
+            continue
+        attribute, value = row.get(attribute_column), row.get(value_column)
+        if not (_present(attribute) and _present(value)):
+            stats.rows_skipped += 1
+            continue
+        confidence = row.get("confidence")
+        yield Fact(
+            entity=str(entity),
+            attribute=str(attribute),
+            value=str(value),
+            source=str(row["source"]) if _present(row.get("source")) else source,
+            confidence=float(confidence) if _present(confidence) else None,
+        )
+
+
+def import_facts(paths: Sequence[str], output: str, **options: Any) -> ImportStats:
+    """
+    Compiles one or more data files into a memory-mapped fact index at `output`.
+
+    `options` are passed to `iter_facts`. When files disagree about a fact, the
+    one listed last wins.
+    """
+    stats = ImportStats()
+
+    def all_facts() -> Iterable[Fact]:
+        for path in paths:
+            logger.info(f"Importing facts from '{path}'.")
+            yield from iter_facts(path, stats=stats, **options)
+
+    stats.facts_written = compile_fact_index(all_facts(), output)
+    logger.info(
+        f"Wrote {stats.facts_written} facts to '{output}' "
+        f"({stats.rows_read} rows read, {stats.rows_skipped} skipped)."
+    )
+    return stats
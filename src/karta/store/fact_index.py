@@ -0,0 +1,201 @@
+# karta-engine/src/karta/store/fact_index.py
+"""
+A compact, read-only, memory-mapped fact index.
+
+File layout (all integers little-endian):
+
+    header    magic, version, record/bucket/string counts, section offsets
+    strings   (offset u32, length u32) per interned string, then the UTF-8 blob
+    records   (entity_key, attribute_key, entity, attribute, value, source) string
+              ids as u32 plus a f32 confidence (NaN when unscored), sorted by
+              (entity_key, attribute_key) for prefix scans
+    buckets   open-addressed hash table of (key hash u64, record index + 1 u32)
+
+Every string (keys, display names, values, sources) is interned once, so
+repeated attribute names and sources cost four bytes per record. Lookups hash
+the normalized key and probe the bucket table directly in the mapped pages,
+so opening an index is O(1) and its pages are shared by every worker process
+that maps the same file.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from karta.normalization import fact_key, normalize_text
+from karta.types import Fact
+
+MAGIC = b"KARTAFIX"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIIQQQQ")
+_STRING_ENTRY = struct.Struct("<II")
+_RECORD = struct.Struct("<IIIIIIf")
+_BUCKET = struct.Struct("<QI4x")
+_NO_SOURCE = 0xFFFFFFFF
+
+
+def _key_hash(entity_key: str, attribute_key: str) -> int:
+    digest = hashlib.blake2b(f"{entity_key}\x1f{attribute_key}".encode("utf-8"), digest_size=8).digest()
+    # Zero marks an empty bucket, so keep real hashes non-zero.
+    return int.from_bytes(digest, "little") or 1
+
+
+def compile_fact_index(facts: Iterable[Fact], path: str) -> int:
+    """
+    Writes `facts` to a memory-mappable index at `path`, atomically replacing
+    any existing file. Later facts for the same normalized key win.
+
+    Returns:
+        The number of records written.
+    """
+    by_key: Dict[Tuple[str, str], Fact] = {}
+    for fact in facts:
+        by_key[fact_key(fact.entity, fact.attribute)] = fact
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text)
+        return string_id
+
+    ordered_keys = sorted(by_key)
+    records = []
+    for entity_key, attribute_key in ordered_keys:
+        fact = by_key[(entity_key, attribute_key)]
+        records.append(
+            (
+                intern(entity_key),
+                intern(attribute_key),
+                intern(fact.entity),
+                intern(fact.attribute),
+                intern(fact.value),
+                _NO_SOURCE if fact.source is None else intern(fact.source),
+                math.nan if fact.confidence is None else fact.confidence,
+            )
+        )
+
+    bucket_count = 1
+    while bucket_count < max(2 * len(records), 8):
+        bucket_count <<= 1
+    buckets = [(0, 0)] * bucket_count
+    for index, (entity_key, attribute_key) in enumerate(ordered_keys):
+        key_hash = _key_hash(entity_key, attribute_key)
+        slot = key_hash & (bucket_count - 1)
+        while buckets[slot][0]:
+            slot = (slot + 1) & (bucket_count - 1)
+        buckets[slot] = (key_hash, index + 1)
+
+    encoded = [text.encode("utf-8") for text in strings]
+    string_table = bytearray()
+    blob = bytearray()
+    for data in encoded:
+        string_table += _STRING_ENTRY.pack(len(blob), len(data))
+        blob += data
+
+    strings_offset = _HEADER.size
+    records_offset = strings_offset + len(string_table) + len(blob)
+    records_offset += -records_offset % 8
+    buckets_offset = records_offset + len(records) * _RECORD.size
+    buckets_offset += -buckets_offset % 8
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC, VERSION, len(records), bucket_count, len(strings),
+                strings_offset, records_offset, buckets_offset, 0,
+            )
+        )
+        f.write(string_table)
+        f.write(blob)
+        f.write(b"\0" * (records_offset - f.tell()))
+        for record in records:
+            f.write(_RECORD.pack(*record))
+        f.write(b"\0" * (buckets_offset - f.tell()))
+        for key_hash, record_ref in buckets:
+            f.write(_BUCKET.pack(key_hash, record_ref))
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class MmapFactIndex:
+    """Read-only view over a file written by `compile_fact_index`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, self.record_count, self._bucket_count, self._string_count,
+            self._strings_offset, self._records_offset, self._buckets_offset, _,
+        ) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"'{path}' is not a Karta fact index (version {VERSION}).")
+        self._blob_offset = self._strings_offset + self._string_count * _STRING_ENTRY.size
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def _string(self, string_id: int) -> str:
+        offset, length = _STRING_ENTRY.unpack_from(self._mm, self._strings_offset + string_id * _STRING_ENTRY.size)
+        start = self._blob_offset + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _record(self, index: int) -> Tuple[int, ...]:
+        return _RECORD.unpack_from(self._mm, self._records_offset + index * _RECORD.size)
+
+    def _fact(self, record: Tuple[int, ...]) -> Fact:
+        _, _, entity_id, attribute_id, value_id, source_id, confidence = record
+        return Fact(
+            entity=self._string(entity_id),
+            attribute=self._string(attribute_id),
+            value=self._string(value_id),
+            source=None if source_id == _NO_SOURCE else self._string(source_id),
+            # Confidences are stored as f32; round away the representation noise.
+            confidence=None if math.isnan(confidence) else round(confidence, 6),
+        )
+
+    def get(self, entity: str, attribute: str) -> Optional[Fact]:
+        entity_key, attribute_key = fact_key(entity, attribute)
+        key_hash = _key_hash(entity_key, attribute_key)
+        mask = self._bucket_count - 1
+        slot = key_hash & mask
+        while True:
+            stored_hash, record_ref = _BUCKET.unpack_from(self._mm, self._buckets_offset + slot * _BUCKET.size)
+            if not stored_hash:
+                return None
+            if stored_hash == key_hash:
+                record = self._record(record_ref - 1)
+                if self._string(record[0]) == entity_key and self._string(record[1]) == attribute_key:
+                    return self._fact(record)
+            slot = (slot + 1) & mask
+
+    def facts_for_entity(self, entity: str) -> Iterator[Fact]:
+        """Yields every fact about `entity`, using the key-sorted record section."""
+        entity_key = normalize_text(entity)
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(self._record(middle)[0]) < entity_key:
+                low = middle + 1
+            else:
+                high = middle
+        index = low
+        while index < self.record_count:
+            record = self._record(index)
+            if self._string(record[0]) != entity_key:
+                break
+            yield self._fact(record)
+            index += 1
+
+    def close(self) -> None:
+        self._mm.close()
@@ -0,0 +1,116 @@
+# karta-engine/src/karta/store/sqlite_store.py
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+
+from karta.normalization import fact_key, normalize_text
+from karta.types import Fact
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    entity_key TEXT NOT NULL,
+    attribute_key TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    value TEXT NOT NULL,
+    source TEXT,
+    confidence REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (entity_key, attribute_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entity_aliases (
+    alias_key TEXT PRIMARY KEY,
+    entity_key TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SqliteFactStore:
+    """
+    An embedded fact store indexed by normalized (entity, attribute).
+
+    Entity names are normalized and then resolved through an alias table, so
+    that lookups for "The Big Apple" can hit facts stored under "New York City".
+    Methods are synchronous; async callers should run them in a worker thread.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            # WAL lets other worker processes read while this one writes.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _resolve_entity_key(self, entity_key: str) -> str:
+        row = self._conn.execute(
+            "SELECT entity_key FROM entity_aliases WHERE alias_key = ?", (entity_key,)
+        ).fetchone()
+        return row[0] if row else entity_key
+
+    def get(self, entity: str, attribute: str, max_age_seconds: Optional[float] = None) -> Optional[Fact]:
+        entity_key, attribute_key = fact_key(entity, attribute)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entity, attribute, value, source, confidence, updated_at FROM facts "
+                "WHERE entity_key = ? AND attribute_key = ?",
+                (self._resolve_entity_key(entity_key), attribute_key),
+            ).fetchone()
+        if row is None:
+            return None
+        if max_age_seconds is not None and time.time() - row[5] > max_age_seconds:
+            return None
+        return Fact(entity=row[0], attribute=row[1], value=row[2], source=row[3], confidence=row[4])
+
+    def put(self, fact: Fact) -> None:
+        entity_key, attribute_key = fact_key(fact.entity, fact.attribute)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO facts "
+                "(entity_key, attribute_key, entity, attribute, value, source, confidence, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._resolve_entity_key(entity_key),
+                    attribute_key,
+                    fact.entity,
+                    fact.attribute,
+                    fact.value,
+                    fact.source,
+                    fact.confidence,
+                    time.time(),
+                ),
+            )
+
+    def add_alias(self, alias: str, entity: str) -> None:
+        """Makes lookups for `alias` resolve to facts stored under `entity`."""
+        alias_key, entity_key = normalize_text(alias), normalize_text(entity)
+        if alias_key == entity_key:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entity_aliases (alias_key, entity_key) VALUES (?, ?)",
+                (alias_key, self._resolve_entity_key(entity_key)),
+            )
+
+    def iter_facts(self) -> Iterator[Fact]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity, attribute, value, source, confidence FROM facts"
+            ).fetchall()
+        for row in rows:
+            yield Fact(entity=row[0], attribute=row[1], value=row[2], source=row[3], confidence=row[4])
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,12 +1,17 @@
 # karta-engine/src/karta/tools/entity_recognition_tool.py
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from genie_tooling import tool
 
 
 @tool
 async def entity_recognition_tool(
-    text: str, context: Dict[str, Any]
+    text: str,
+    context: Dict[str, Any],
+    labels: Optional[List[str]] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    output_format: str = "json",
 ) -> Dict[str, Any]:
     """
     Extracts named entities (such as people, places, organizations, dates) from a given block of text.
@@ -16,14 +21,41 @@ async def entity_recognition_tool(
     Args:
         text (str): The text to extract named entities from.
         context (Dict[str, Any]): The invocation context from the framework, which contains the Genie instance.
+        labels (List[str], optional): Only return entities with these labels (e.g. ["PERSON", "GPE"]).
+        offset (int, optional): Number of matching entities to skip, for paging through long texts.
+        limit (int, optional): Maximum number of entities to return. The result's 'next_offset' fetches the next page.
+        output_format (str, optional): "json" for a list of entity objects, or "ndjson" for one JSON entity per line.
     """
     genie_instance = context.get("genie_framework_instance")
 
     if not genie_instance or not hasattr(genie_instance, "karta"):
         return {"error": "The Karta Engine subsystem is not installed or available."}
+    if output_format not in ("json", "ndjson"):
+        return {"error": f"Unknown output_format '{output_format}'. Use 'json' or 'ndjson'."}
 
     # The type hint helps with static analysis, but the object is already a full Genie instance.
     from karta.types import Entity
 
-    entities: List[Entity] = await genie_instance.karta.recognize_entities(text=text)
-    return {"entities": [entity.model_dump() for entity in entities]}
\ No newline at end of file
+    offset = max(int(offset), 0)
+    # One extra entity tells whether there is another page.
+    page_size = None if limit is None else max(int(limit), 0)
+    entities: List[Entity] = await genie_instance.karta.recognize_entities(
+        text=text, labels=labels, offset=offset, limit=None if page_size is None else page_size + 1
+    )
+    next_offset = None
+    if page_size is not None and len(entities) > page_size:
+        entities = entities[:page_size]
+        next_offset = offset + page_size
+
+    if output_format == "ndjson":
+        # Serialized straight from the models, without intermediate dicts.
+        result: Dict[str, Any] = {
+            "format": "ndjson",
+            "entities": "\n".join(entity.model_dump_json() for entity in entities),
+            "count": len(entities),
+        }
+    else:
+        result = {"entities": [entity.model_dump() for entity in entities]}
+    if page_size is not None or offset:
+        result["next_offset"] = next_offset
+    return result
@@ -3,7 +3,9 @@ from genie_tooling import tool
 
 
 @tool
-async def fact_lookup_tool(entity: str, attribute: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+async def fact_lookup_tool(
+    entity: str, attribute: str, context: Dict[str, Any] = None, output_format: str = "json"
+) -> Dict[str, Any]:
     """
     Looks up a specific attribute or fact about an entity using a smart-routing knowledge engine.
     This tool is capable of answering two main types of questions:
@@ -15,11 +17,16 @@ async def fact_lookup_tool(entity: str, attribute: str, context: Dict[str, Any]
         entity (str): The subject of the fact (e.g., 'Brazil', 'Fibonacci sequence').
         attribute (str): The property of the entity to find (e.g., 'primary language', '20th number').
         context (Dict[str, Any], optional): Invocation context from the framework.
+        output_format (str, optional): "json" for the fact as an object, or "ndjson" for the fact as one JSON line.
     """
     genie_instance = context.get("genie_framework_instance")
     if not genie_instance or not hasattr(genie_instance, "karta"):
         return {"error": "The Karta Engine subsystem is not installed or available."}
+    if output_format not in ("json", "ndjson"):
+        return {"error": f"Unknown output_format '{output_format}'. Use 'json' or 'ndjson'."}
     fact = await genie_instance.karta.lookup_fact(entity=entity, attribute=attribute)
     if not fact:
         return {"status": "not_found", "message": f"Could not find the '{attribute}' for '{entity}'."}
-    return {"status": "found", "fact": fact.model_dump()}
\ No newline at end of file
+    if output_format == "ndjson":
+        return {"status": "found", "format": "ndjson", "fact": fact.model_dump_json()}
+    return {"status": "found", "fact": fact.model_dump()}
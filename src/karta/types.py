@@ -12,3 +12,6 @@ class Fact(BaseModel):
     attribute: str = Field(..., description="The property of the entity.")
     value: str = Field(..., description="The value of the attribute.")
     source: Optional[str] = Field(None, description="The source from which this fact was derived.")
+    confidence: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="How confident the source is in the value, from 0 to 1. None if unscored."
+    )
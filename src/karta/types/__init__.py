@@ -11,4 +11,7 @@ class Fact(BaseModel):
     entity: str = Field(..., description="The subject of the fact.")
     attribute: str = Field(..., description="The property of the entity.")
     value: str = Field(..., description="The value of the attribute.")
-    source: Optional[str] = Field(None, description="The source from which this fact was derived.")
\ No newline at end of file
+    source: Optional[str] = Field(None, description="The source from which this fact was derived.")
+    confidence: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="How confident the source is in the value, from 0 to 1. None if unscored."
+    )
\ No newline at end of file
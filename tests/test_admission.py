@@ -0,0 +1,163 @@
+# karta-engine/tests/test_admission.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    PrioritySemaphore,
+    TokenBucket,
+    use_priority,
+)
+from karta.manager import KartaManager
+from karta.observability import MetricsRecorder
+from karta.routing.router import RoutingDecision
+from karta.types import Fact
+
+
+def test_token_bucket_reserves_on_credit():
+    bucket = TokenBucket(rate_per_second=10, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.wait_time() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_priority_semaphore_admits_interactive_first():
+    semaphore = PrioritySemaphore(1)
+    await semaphore.acquire(0)
+    order = []
+
+    async def waiter(name, priority):
+        await semaphore.acquire(priority)
+        order.append(name)
+        semaphore.release()
+
+    tasks = [asyncio.create_task(waiter("batch", 1)), asyncio.create_task(waiter("interactive", 0))]
+    await asyncio.sleep(0)
+    semaphore.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "batch"]
+    assert semaphore.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_calls_fail_fast():
+    metrics = MetricsRecorder()
+    controller = AdmissionController(
+        {"providers": {"wolfram": {"rate_per_second": 1, "burst": 1, "max_queue_wait_ms": 50}}}, metrics
+    )
+    async with controller.admit("wolfram"):
+        pass
+    with pytest.raises(AdmissionRejected) as excinfo:
+        async with controller.admit("wolfram"):
+            pass
+
+    assert excinfo.value.reason == "rate_limited"
+    assert metrics.snapshot()["counters"]["karta.admission.rejected{key=wolfram,reason=rate_limited}"] == 1
+    # Keys without limits are admitted without any bookkeeping.
+    async with controller.admit("wiki"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_interactive_calls_overtake_queued_batch_calls():
+    controller = AdmissionController({"default": {"rate_per_second": 20, "burst": 1, "max_queue_wait_ms": 200}})
+    order = []
+
+    async def call(name, priority):
+        with use_priority(priority):
+            async with controller.admit("wolfram"):
+                order.append(name)
+
+    async with controller.admit("wolfram"):
+        pass
+    # Far more batch work is queued than an interactive caller could wait behind.
+    batch = [asyncio.create_task(call(f"batch{i}", "batch")) for i in range(11)]
+    await asyncio.sleep(0)
+    await call("interactive", "interactive")
+    results = await asyncio.gather(*batch, return_exceptions=True)
+
+    assert order[0] == "interactive"
+    assert any(isinstance(result, AdmissionRejected) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_rate_limited_waiter_does_not_consume_a_token():
+    controller = AdmissionController({"default": {"rate_per_second": 20, "burst": 1, "max_queue_wait_ms": None}})
+    async with controller.admit("wolfram"):
+        pass
+
+    async def waiter():
+        async with controller.admit("wolfram"):
+            pass
+
+    task = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    assert controller.queue_depths() == {"wolfram": 0}
+    await asyncio.sleep(0.06)
+    # The token the cancelled waiter never used is still there for the next caller.
+    limiter = controller._limit_for("wolfram").rate_limiter
+    assert limiter.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_rejects_after_queue_wait():
+    controller = AdmissionController({"default": {"max_concurrency": 1, "max_queue_wait_ms": 20}})
+    release = asyncio.Event()
+
+    async def holder():
+        async with controller.admit("wiki"):
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    with use_priority("batch"), pytest.raises(AdmissionRejected, match="queue_timeout"):
+        async with controller.admit("wiki"):
+            pass
+    release.set()
+    await task
+    assert controller.queue_depths() == {"wiki": 0}
+
+
+def test_unknown_priority_is_rejected():
+    with pytest.raises(ValueError):
+        with use_priority("urgent"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_manager_skips_providers_that_reject_admission(mock_plugin_manager_fixture):
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=Fact(entity="e", attribute="a", value="wolfram"))
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=Fact(entity="e", attribute="a", value="wiki"))
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={
+            "fact_lookup": {"cache": {"enabled": False}},
+            "admission": {
+                "providers": {
+                    "wolfram_alpha_dispatcher_v1": {"rate_per_second": 0.001, "burst": 1, "max_queue_wait_ms": 10}
+                }
+            },
+        },
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wolfram_alpha_dispatcher_v1", "wikipedia_fact_dispatcher_v1"])
+    )
+
+    first = await manager.lookup_fact("e", "a", priority="batch")
+    second = await manager.lookup_fact("e", "a")
+
+    assert (first.value, second.value) == ("wolfram", "wiki")
+    wolfram_provider.lookup_fact.assert_called_once()
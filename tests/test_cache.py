@@ -0,0 +1,173 @@
+# karta-engine/tests/test_cache.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from karta.cache.fact_cache import FactCache
+from karta.cache.refresh import FactRefresher
+from karta.cache.semantic_cache import SemanticFactCache
+from karta.manager import KartaManager
+from karta.routing.router import RoutingDecision
+from karta.types import Fact
+
+LEAD_MELTING_POINT = Fact(entity="lead", attribute="melting point", value="327.5 °C")
+
+
+class TestSemanticFactCache:
+    """Tests the embedding-based cache for paraphrased questions."""
+
+    def test_similar_query_for_same_entity_hits(self):
+        cache = SemanticFactCache(threshold=0.9)
+        cache.add([1.0, 0.0, 0.1], "lead", LEAD_MELTING_POINT)
+
+        fact, similarity = cache.lookup([0.98, 0.05, 0.12], "lead")
+        assert fact is LEAD_MELTING_POINT and similarity > 0.9
+        assert cache.lookup([0.0, 1.0, 0.0], "lead") is None
+
+    def test_other_entity_misses_unless_disabled(self):
+        strict = SemanticFactCache(threshold=0.9)
+        strict.add([1.0, 0.0], "lead", LEAD_MELTING_POINT)
+        assert strict.lookup([1.0, 0.0], "tin") is None
+
+        loose = SemanticFactCache(threshold=0.9, match_entity=False)
+        loose.add([1.0, 0.0], "lead", LEAD_MELTING_POINT)
+        assert loose.lookup([1.0, 0.0], "tin") is not None
+
+    def test_ring_buffer_and_expiry(self):
+        cache = SemanticFactCache(threshold=0.99, max_entries=2)
+        for i, vector in enumerate(np.eye(3)):
+            cache.add(vector, "e", Fact(entity="e", attribute=str(i), value=str(i)))
+        assert len(cache) == 2
+        assert cache.lookup([1.0, 0.0, 0.0], "e") is None
+        assert cache.lookup([0.0, 0.0, 1.0], "e")[0].value == "2"
+
+        expiring = SemanticFactCache(ttl_seconds=-1)
+        expiring.add([1.0], "e", LEAD_MELTING_POINT)
+        assert expiring.lookup([1.0], "e") is None
+
+
+@pytest.mark.asyncio
+async def test_manager_answers_paraphrase_from_semantic_cache(mock_plugin_manager_fixture):
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=LEAD_MELTING_POINT)
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"semantic_cache": {"enabled": True, "threshold": 0.9}}},
+    )
+    manager.router.route = AsyncMock(
+        side_effect=[
+            RoutingDecision(query="", cascade=["wolfram_alpha_dispatcher_v1"], query_embedding=[1.0, 0.2]),
+            RoutingDecision(query="", cascade=["wolfram_alpha_dispatcher_v1"], query_embedding=[0.95, 0.25]),
+        ]
+    )
+
+    await manager.lookup_fact("lead", "melting point")
+    fact = await manager.lookup_fact("Lead", "melting temperature")
+
+    assert fact.value == "327.5 °C"
+    wolfram_provider.lookup_fact.assert_called_once()
+
+
+def test_fact_cache_serves_stale_entries_within_grace_window():
+    cache = FactCache(ttl_seconds=-1, stale_seconds=60)
+    cache.put(("lead", "melting point"), LEAD_MELTING_POINT, query=("Lead", "melting point"))
+    assert cache.lookup(("lead", "melting point")) == (LEAD_MELTING_POINT, True)
+    assert cache.get(("lead", "melting point")) is None
+    assert cache.query_for(("lead", "melting point")) == ("Lead", "melting point")
+
+    gone = FactCache(ttl_seconds=-1, stale_seconds=0)
+    gone.put(("lead", "melting point"), LEAD_MELTING_POINT)
+    assert gone.lookup(("lead", "melting point")) == (None, False)
+
+
+def test_fact_cache_ranks_hot_keys():
+    cache = FactCache(ttl_seconds=None)
+    for i, hits in enumerate([1, 5, 3]):
+        cache.put((f"e{i}", "a"), Fact(entity=f"e{i}", attribute="a", value=str(i)))
+        for _ in range(hits):
+            cache.get((f"e{i}", "a"))
+    assert cache.hottest(2) == [("e1", "a"), ("e2", "a")]
+    # Nothing in a cache without a TTL is about to expire.
+    assert cache.hottest(2, expiring_within=60) == []
+    cache.put(("e1", "a"), Fact(entity="e1", attribute="a", value="refreshed"))
+    cache.decay_hits(0.5)
+    assert cache.hottest(1) == [("e1", "a")]
+
+
+@pytest.mark.asyncio
+async def test_refresher_bounds_refresh_load():
+    release = asyncio.Event()
+    refreshed = []
+
+    async def refresh(key):
+        await release.wait()
+        refreshed.append(key)
+
+    refresher = FactRefresher(FactCache(), refresh, {"max_concurrent": 1, "max_pending": 1, "jitter_seconds": 0})
+    assert refresher.request_refresh(("a", "x"))
+    assert not refresher.request_refresh(("a", "x"))  # already in progress
+    assert refresher.request_refresh(("b", "x"))
+    assert not refresher.request_refresh(("c", "x"))  # over the pending limit
+    release.set()
+    await refresher.close()
+    assert sorted(refreshed) == [("a", "x"), ("b", "x")]
+
+
+@pytest.mark.asyncio
+async def test_refresher_prewarms_hottest_expiring_keys():
+    cache = FactCache(ttl_seconds=30)
+    for name, hits in (("hot", 3), ("warm", 1), ("cold", 0)):
+        cache.put((name, "a"), Fact(entity=name, attribute="a", value=name))
+        for _ in range(hits):
+            cache.get((name, "a"))
+    refresh = AsyncMock()
+    refresher = FactRefresher(
+        cache, refresh, {"prewarm_top_n": 1, "prewarm_interval_seconds": 60, "jitter_seconds": 0}
+    )
+
+    assert refresher.prewarm() == 1
+    await refresher.close()
+    refresh.assert_awaited_once_with(("hot", "a"))
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_stale_fact_while_refreshing(mock_plugin_manager_fixture):
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(
+        side_effect=[
+            Fact(entity="EUR", attribute="USD rate", value="1.08"),
+            Fact(entity="EUR", attribute="USD rate", value="1.09"),
+            Fact(entity="EUR", attribute="USD rate", value="1.10"),
+        ]
+    )
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={
+            "fact_lookup": {
+                "write_back": False,
+                "cache": {
+                    "ttl_seconds": -1,
+                    "ttl_jitter": 0,
+                    "stale_while_revalidate_seconds": 60,
+                    "refresh": {"jitter_seconds": 0},
+                },
+            }
+        },
+    )
+    manager.router.route = AsyncMock(return_value=RoutingDecision(query="", cascade=["wolfram_alpha_dispatcher_v1"]))
+
+    assert (await manager.lookup_fact("EUR", "USD rate")).value == "1.08"
+    # Expired, so the old value is served and a refresh runs in the background.
+    assert (await manager.lookup_fact("EUR", "USD rate")).value == "1.08"
+    await manager.close()
+    assert (await manager.lookup_fact("EUR", "USD rate")).value == "1.09"
+    wolfram_provider.lookup_fact.assert_awaited_with("EUR", "USD rate", manager.genie, {})
+    await manager.close()
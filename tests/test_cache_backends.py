@@ -0,0 +1,200 @@
+# karta-engine/tests/test_cache_backends.py
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.cache.backends import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RespCacheBackend,
+    RespError,
+    SqliteCacheBackend,
+    create_cache_backend,
+)
+from karta.manager import KartaManager
+from karta.routing.router import RoutingDecision
+from karta.types import Fact
+
+
+class RespStandIn:
+    """A local Redis-protocol server supporting the commands Karta uses."""
+
+    def __init__(self, password=None):
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.reply_delay = 0.0
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _read_command(self, reader):
+        header = await reader.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader, writer):
+        authenticated = self.password is None
+        while True:
+            args = await self._read_command(reader)
+            if args is None:
+                break
+            command = args[0].decode().upper()
+            self.commands.append(command)
+            if command == "AUTH":
+                authenticated = args[1].decode() == self.password
+                writer.write(b"+OK\r\n" if authenticated else b"-WRONGPASS invalid password\r\n")
+            elif not authenticated:
+                writer.write(b"-NOAUTH Authentication required.\r\n")
+            elif command == "SELECT":
+                writer.write(b"+OK\r\n")
+            elif command == "SET":
+                expires_at = time.monotonic() + int(args[4]) / 1000 if len(args) > 3 else None
+                self.data[args[1]] = (args[2], expires_at)
+                writer.write(b"+OK\r\n")
+            elif command == "GET":
+                await asyncio.sleep(self.reply_delay)
+                value, expires_at = self.data.get(args[1], (None, None))
+                if value is None or (expires_at is not None and time.monotonic() > expires_at):
+                    writer.write(b"$-1\r\n")
+                else:
+                    writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+            elif command == "DEL":
+                writer.write(b":%d\r\n" % int(self.data.pop(args[1], None) is not None))
+            else:
+                writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        writer.close()
+
+
+async def _exercise(backend: CacheBackend):
+    assert isinstance(backend, CacheBackend)
+    assert await backend.get("k") is None
+    await backend.set("k", b"\x00value\r\n")
+    assert await backend.get("k") == b"\x00value\r\n"
+    await backend.set("short", b"v", ttl_seconds=0.01)
+    await asyncio.sleep(0.03)
+    assert await backend.get("short") is None
+    await backend.delete("k")
+    assert await backend.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend():
+    backend = MemoryCacheBackend(max_entries=2)
+    await _exercise(backend)
+    for key in ("a", "b", "c"):
+        await backend.set(key, b"1")
+    assert await backend.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first, second = SqliteCacheBackend(path), SqliteCacheBackend(path)
+    await _exercise(first)
+    await first.set("shared", b"from first")
+    assert await second.get("shared") == b"from first"
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_resp_backend_against_stand_in():
+    server = RespStandIn(password="secret")
+    port = await server.start()
+    backend = RespCacheBackend(port=port, password="secret", db=2)
+    await _exercise(backend)
+    assert server.commands[:2] == ["AUTH", "SELECT"]
+
+    # A dropped connection is re-opened transparently.
+    backend._writer.close()
+    await backend.set("after", b"reconnect")
+    assert await backend.get("after") == b"reconnect"
+    await backend.close()
+
+    with pytest.raises(RespError, match="WRONGPASS"):
+        await RespCacheBackend(port=port, password="wrong").get("k")
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_resp_backend_drops_connection_when_cancelled_mid_reply():
+    server = RespStandIn()
+    port = await server.start()
+    backend = RespCacheBackend(port=port)
+    await backend.set("a", b"value-a")
+    await backend.set("b", b"value-b")
+
+    server.reply_delay = 0.2
+    pending = asyncio.create_task(backend.get("a"))
+    await asyncio.sleep(0.05)
+    pending.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+
+    server.reply_delay = 0.0
+    assert await backend.get("b") == b"value-b"
+    assert await backend.get("a") == b"value-a"
+    await backend.close()
+    await server.stop()
+
+
+def test_create_cache_backend(tmp_path):
+    assert create_cache_backend(None) is None
+    assert isinstance(create_cache_backend({"type": "memory"}), MemoryCacheBackend)
+    assert isinstance(create_cache_backend({"type": "redis", "port": 6380}), RespCacheBackend)
+    with pytest.raises(ValueError):
+        create_cache_backend({"type": "sqlite"})
+    with pytest.raises(ValueError):
+        create_cache_backend({"type": "memcached"})
+
+
+@pytest.mark.asyncio
+async def test_workers_share_resolved_facts_and_summaries(mock_plugin_manager_fixture, tmp_path):
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=Fact(entity="France", attribute="capital", value="Paris"))
+    summarizer = MagicMock()
+    summarizer.summarize = AsyncMock(return_value="A short summary.")
+    mock_plugin_manager_fixture._plugins["llm_summary_dispatcher_v1"] = summarizer
+
+    def worker():
+        manager = KartaManager(
+            genie=MagicMock(),
+            plugin_manager=mock_plugin_manager_fixture,
+            embedder=MagicMock(),
+            vector_store=MagicMock(),
+            config={
+                "fact_lookup": {"write_back": False},
+                "cache_backend": {"type": "sqlite", "path": str(tmp_path / "shared.sqlite3")},
+            },
+        )
+        manager.router.route = AsyncMock(
+            return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1"])
+        )
+        return manager
+
+    first, second = worker(), worker()
+    assert (await first.lookup_fact("France", "capital")).value == "Paris"
+    assert await first.summarize("Long text.", "concise") == "A short summary."
+    await first.close()
+
+    assert (await second.lookup_fact("france", "capital")).value == "Paris"
+    assert await second.summarize("Long text.", "concise") == "A short summary."
+    wiki_provider.lookup_fact.assert_awaited_once()
+    summarizer.summarize.assert_awaited_once()
+    second.router.route.assert_not_called()
+    await second.close()
@@ -0,0 +1,111 @@
+# karta-engine/tests/test_canonicalization.py
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.cache.fact_cache import FactCache
+from karta.canonicalization import Canonicalizer
+from karta.manager import KartaManager
+from karta.routing.router import RoutingDecision
+from karta.types import Fact
+
+# Hand-picked vectors: "total height" sits close to "height", "weight" does not.
+VECTORS = {
+    "height": [1.0, 0.0, 0.0],
+    "total height": [0.95, 0.1, 0.0],
+    "weight": [0.0, 1.0, 0.0],
+    "Eiffel Tower": [0.0, 0.0, 1.0],
+    "Tour Eiffel": [0.05, 0.0, 0.99],
+}
+
+
+class VectorTableEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    async def embed(self, chunks):
+        self.calls += 1
+
+        async def stream():
+            async for chunk in chunks:
+                yield chunk, VECTORS[chunk.content]
+
+        return stream()
+
+
+@pytest.mark.asyncio
+async def test_exact_variants_resolve_without_embedding():
+    embedder = VectorTableEmbedder()
+    canonicalizer = Canonicalizer(embedder, {"fuzzy": True})
+
+    assert await canonicalizer.canonicalize("Eiffel Tower", "height") == ("Eiffel Tower", "height")
+    assert await canonicalizer.canonicalize("the eiffel-tower", "Height") == ("Eiffel Tower", "height")
+    assert embedder.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_near_duplicates_map_to_known_names():
+    canonicalizer = Canonicalizer(VectorTableEmbedder(), {"fuzzy": True})
+    await canonicalizer.canonicalize("Eiffel Tower", "height")
+
+    assert await canonicalizer.canonicalize("Tour Eiffel", "total height") == ("Eiffel Tower", "height")
+    assert await canonicalizer.canonicalize("Eiffel Tower", "weight") == ("Eiffel Tower", "weight")
+    assert canonicalizer.attributes.names == ["height", "weight"]
+
+
+@pytest.mark.asyncio
+async def test_canonicalize_many_embeds_unseen_names_in_one_call():
+    embedder = VectorTableEmbedder()
+    canonicalizer = Canonicalizer(embedder, {"fuzzy": True})
+
+    canonical = await canonicalizer.canonicalize_many(
+        [("Eiffel Tower", "height"), ("Tour Eiffel", "total height"), ("Eiffel Tower", "weight")]
+    )
+
+    assert canonical == [("Eiffel Tower", "height"), ("Eiffel Tower", "height"), ("Eiffel Tower", "weight")]
+    assert embedder.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_configured_aliases_apply_without_fuzzy_matching():
+    embedder = MagicMock()
+    canonicalizer = Canonicalizer(embedder, {"attribute_aliases": {"total height": "height"}})
+
+    assert await canonicalizer.canonicalize("Eiffel Tower", "Total Height") == ("Eiffel Tower", "height")
+    embedder.embed.assert_not_called()
+
+
+def test_fact_cache_evicts_and_expires():
+    cache = FactCache(max_entries=2, ttl_seconds=None)
+    for i in range(3):
+        cache.put((f"e{i}", "a"), Fact(entity=f"e{i}", attribute="a", value=str(i)))
+    assert len(cache) == 2 and cache.get(("e0", "a")) is None
+
+    expiring = FactCache(ttl_seconds=-1)
+    expiring.put(("e", "a"), Fact(entity="e", attribute="a", value="v"))
+    assert expiring.get(("e", "a")) is None
+
+
+@pytest.mark.asyncio
+async def test_manager_serves_variants_from_one_cache_entry(mock_plugin_manager_fixture):
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="Eiffel Tower", attribute="height", value="330 m")
+    )
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=VectorTableEmbedder(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"canonicalization": {"fuzzy": True}}},
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1"])
+    )
+
+    await manager.lookup_fact("Eiffel Tower", "height")
+    fact = await manager.lookup_fact("Tour Eiffel", "total height")
+
+    assert fact.value == "330 m"
+    wiki_provider.lookup_fact.assert_called_once()
+    manager.router.route.assert_called_once()
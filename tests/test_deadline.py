@@ -0,0 +1,133 @@
+# karta-engine/tests/test_deadline.py
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.admission import AdmissionController, AdmissionRejected
+from karta.deadline import current_deadline, remaining_time, use_deadline, within_deadline
+from karta.manager import KartaManager
+from karta.observability import MetricsRecorder
+from karta.routing.router import KnowledgeRouter, RoutingDecision
+from karta.types import Fact
+
+
+def test_nested_deadlines_only_shorten():
+    assert current_deadline() is None
+    assert remaining_time(2.0) == 2.0
+    with use_deadline(0.5):
+        outer = current_deadline()
+        with use_deadline(10.0):
+            assert current_deadline() is outer
+        with use_deadline(0.1):
+            assert remaining_time() <= 0.1
+        with use_deadline(None):
+            assert current_deadline() is outer
+        assert remaining_time(0.2) <= 0.2
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_within_deadline_cuts_off_slow_awaitables():
+    with use_deadline(0.01), pytest.raises(asyncio.TimeoutError):
+        await within_deadline(asyncio.sleep(1))
+    assert await within_deadline(asyncio.sleep(0, result="done")) == "done"
+
+
+@pytest.mark.asyncio
+async def test_admission_wait_is_capped_by_deadline():
+    controller = AdmissionController({"default": {"max_concurrency": 1, "max_queue_wait_ms": None}})
+    release = asyncio.Event()
+
+    async def holder():
+        async with controller.admit("wiki"):
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    with use_deadline(0.02), pytest.raises(AdmissionRejected, match="queue_timeout"):
+        async with controller.admit("wiki"):
+            pass
+    release.set()
+    await task
+
+
+def _manager(plugin_manager, fact_lookup_config=None):
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=plugin_manager,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={
+            "fact_lookup": {"cache": {"enabled": False}, **(fact_lookup_config or {})},
+            "metrics": {"enabled": True},
+        },
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"])
+    )
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_lookup_returns_best_partial_result_at_deadline(mock_plugin_manager_fixture):
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=Fact(entity="e", attribute="a", value="wiki", confidence=0.4))
+
+    async def slow_lookup(*args, **kwargs):
+        await asyncio.sleep(5)
+        return Fact(entity="e", attribute="a", value="wolfram", confidence=0.99)
+
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = slow_lookup
+    # The slow provider's cost is not yet known, so it is tried and cut off at the deadline.
+    manager = _manager(mock_plugin_manager_fixture, {"min_confidence": 0.9})
+
+    started = time.monotonic()
+    fact = await manager.lookup_fact("e", "a", timeout=0.1)
+
+    assert time.monotonic() - started < 1.0
+    assert fact.value == "wiki"
+    counters = manager.stats()["metrics"]["counters"]
+    assert counters["karta.provider.calls{outcome=timeout,provider=wolfram_alpha_dispatcher_v1}"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_skips_providers_too_slow_for_the_deadline(mock_plugin_manager_fixture):
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=None)
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=Fact(entity="e", attribute="a", value="wolfram"))
+    manager = _manager(
+        mock_plugin_manager_fixture,
+        {"provider_costs_ms": {"wikipedia_fact_dispatcher_v1": 5, "wolfram_alpha_dispatcher_v1": 3000}},
+    )
+
+    assert await manager.lookup_fact("e", "a", timeout=0.5) is None
+    wolfram_provider.lookup_fact.assert_not_called()
+    assert manager.stats()["metrics"]["counters"]["karta.deadline.skipped{provider=wolfram_alpha_dispatcher_v1}"] == 1
+
+    # Without a deadline the same cascade reaches the slow provider.
+    assert (await manager.lookup_fact("e", "a")).value == "wolfram"
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_local_providers_when_embedding_runs_out_of_time(mock_plugin_manager_fixture):
+    async def slow_embed(chunks):
+        await asyncio.sleep(5)
+
+    embedder = MagicMock()
+    embedder.embed = slow_embed
+    router = KnowledgeRouter(
+        mock_plugin_manager_fixture, embedder, MagicMock(), {}, instrumentation=MetricsRecorder()
+    )
+    router.is_ready = True
+    router.provider_map = [("wikipedia_fact_dispatcher_v1", "wiki")]
+    router.local_provider_ids = ["local_fact_store_v1"]
+
+    with use_deadline(0.02):
+        decision = await router.route("Eiffel Tower height")
+
+    assert decision.source == "deadline"
+    assert decision.cascade == ["local_fact_store_v1"]
@@ -28,6 +28,11 @@ async def test_spacy_dispatcher(mock_spacy):
     entities = await dispatcher.recognize_entities(text="Hi, Aris Thorne here.")
     assert len(entities) == 1 and entities[0].label == "PERSON"
 
+    place = MagicMock(text="Athens", label_="GPE", start_char=22, end_char=28)
+    mock_doc.ents = [mock_ent, place, mock_ent]
+    filtered = await dispatcher.recognize_entities(text="...", config={"labels": ["PERSON"], "max_entities": 1})
+    assert [e.text for e in filtered] == ["Aris Thorne"]
+
 
 @patch("karta.dispatchers.impl.wikipedia_dispatcher.wikipediaapi.Wikipedia")
 @pytest.mark.asyncio
@@ -56,6 +61,195 @@ async def test_wikipedia_dispatcher_finds_fact(mock_wiki_class):
     assert fact is not None
     assert fact.value == "330 m"
     assert fact.source == "https://en.wikipedia.org/wiki/Eiffel_Tower"
+    assert fact.confidence == pytest.approx(0.85)
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_batch_fetches_pages_in_one_request():
+    """Tests that a group of lookups costs one MediaWiki request for all of its pages."""
+    import httpx
+
+    from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        assert request.url.params["titles"] == "Eiffel Tower|france|Atlantis"
+        return httpx.Response(
+            200,
+            json={
+                "query": {
+                    "normalized": [{"from": "france", "to": "France"}],
+                    "pages": [
+                        {"title": "Eiffel Tower", "extract": "The height is 330 m.", "fullurl": "https://w/Eiffel_Tower"},
+                        {"title": "France", "extract": "Its capital is Paris.", "fullurl": "https://w/France"},
+                        {"title": "Atlantis", "missing": True},
+                    ],
+                }
+            },
+        )
+
+    mock_genie = MagicMock()
+    mock_genie.llm.generate = AsyncMock(side_effect=[{"text": "330 m"}, {"text": "Paris"}, {"text": "Not found."}])
+    dispatcher = WikipediaFactDispatcher()
+    dispatcher._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    facts = await dispatcher.lookup_facts_batch(
+        [("Eiffel Tower", "height"), ("france", "capital"), ("Atlantis", "capital"), ("france", "anthem")],
+        genie=mock_genie,
+    )
+
+    assert len(requests) == 1
+    assert [f.value if f else None for f in facts] == ["330 m", "Paris", None, None]
+    assert facts[1].source == "https://w/France"
+    assert mock_genie.llm.generate.await_count == 3
+    await dispatcher.teardown()
+
+
+
+@pytest.mark.asyncio
+async def test_wikipedia_batch_chunk_errors_are_misses():
+    """Tests that a failed request for one chunk of titles leaves the other chunks' facts intact."""
+    import httpx
+
+    from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+
+    def handler(request):
+        titles = request.url.params["titles"].split("|")
+        if "Peru" in titles:
+            return httpx.Response(500)
+        pages = [{"title": title, "extract": f"{title} is a place.", "fullurl": f"https://w/{title}"} for title in titles]
+        return httpx.Response(200, json={"query": {"pages": pages}})
+
+    mock_genie = MagicMock()
+    mock_genie.llm.generate = AsyncMock(return_value={"text": "A place"})
+    dispatcher = WikipediaFactDispatcher()
+    dispatcher._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    queries = [(f"Town {i}", "kind") for i in range(20)] + [("Peru", "kind")]
+    facts = await dispatcher.lookup_facts_batch(queries, genie=mock_genie)
+
+    assert all(fact is not None for fact in facts[:20])
+    assert facts[20] is None
+    await dispatcher.teardown()
+
+
+@patch("karta.dispatchers.impl.wikipedia_dispatcher.wikipediaapi.Wikipedia")
+@pytest.mark.asyncio
+async def test_wikipedia_sections_context_ranks_paragraphs(mock_wiki_class):
+    """Tests that "sections" mode sends the most relevant paragraphs and caches their embeddings per revision."""
+    import httpx
+
+    from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+
+    filler = " ".join(["history"] * 40)
+    extract = (
+        f"Ada Lovelace was a mathematician. {filler}\n\n"
+        f"== Early life ==\nShe was born in London in 1815. {filler}\n\n"
+        f"== Legacy ==\nA programming language was named after her. {filler}\n\n"
+        "== References ==\nborn born born"
+    )
+
+    def handler(request):
+        assert "exintro" not in request.url.params
+        return httpx.Response(
+            200,
+            json={"query": {"pages": [
+                {"title": "Ada Lovelace", "extract": extract, "fullurl": "https://w/Ada", "lastrevid": 7}
+            ]}},
+        )
+
+    embedded = []
+
+    async def embed(chunks):
+        texts = [chunk.content async for chunk in chunks]
+        embedded.append(texts)
+
+        async def stream():
+            for text in texts:
+                yield text, [float("born" in text), float("language" in text), 0.1]
+
+        return stream()
+
+    mock_genie = MagicMock()
+    mock_genie.get_default_embedder = AsyncMock(return_value=MagicMock(embed=embed))
+    mock_genie.llm.generate = AsyncMock(return_value={"text": "London"})
+    dispatcher = WikipediaFactDispatcher()
+    dispatcher._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    await dispatcher.setup({"context": "sections", "top_k_paragraphs": 1, "max_context_tokens": 60})
+
+    fact = await dispatcher.lookup_fact("Ada Lovelace", "born", mock_genie)
+    prompt = mock_genie.llm.generate.await_args.kwargs["prompt"]
+    assert fact.value == "London"
+    assert "[Early life] She was born in London" in prompt
+    assert "mathematician" not in prompt and "References" not in prompt
+
+    await dispatcher.lookup_facts_batch([("Ada Lovelace", "language")], mock_genie)
+    prompt = mock_genie.llm.generate.await_args.kwargs["prompt"]
+    assert "[Legacy] A programming language" in prompt
+    # The second lookup reuses the cached paragraph embeddings and only embeds the attribute.
+    assert [len(texts) for texts in embedded] == [4, 1]
+    await dispatcher.teardown()
+
+
+
+@patch("karta.dispatchers.impl.wikipedia_dispatcher.wikipediaapi.Wikipedia")
+@pytest.mark.asyncio
+async def test_wikipedia_sections_fetch_errors_are_misses(mock_wiki_class):
+    """Tests that an HTTP error for one page is a miss rather than a failure of the lookup or its batch."""
+    import httpx
+
+    from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+
+    def handler(request):
+        if request.url.params["titles"] == "Busy":
+            return httpx.Response(429)
+        return httpx.Response(
+            200, json={"query": {"pages": [{"title": "Peru", "extract": "Its capital is Lima.", "fullurl": "https://w/Peru"}]}}
+        )
+
+    mock_genie = MagicMock()
+    mock_genie.llm.generate = AsyncMock(return_value={"text": "Lima"})
+    dispatcher = WikipediaFactDispatcher()
+    dispatcher._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    await dispatcher.setup({"context": "sections"})
+
+    assert await dispatcher.lookup_fact("Busy", "capital", mock_genie) is None
+    facts = await dispatcher.lookup_facts_batch([("Busy", "capital"), ("Peru", "capital")], mock_genie)
+    assert facts[0] is None and facts[1].value == "Lima"
+    await dispatcher.teardown()
+
+
+@patch("karta.dispatchers.impl.wikipedia_dispatcher.wikipediaapi.Wikipedia")
+@pytest.mark.asyncio
+async def test_wikipedia_not_found_replies_are_misses(mock_wiki_class):
+    """Tests that a reply saying the value is missing is a miss even when phrased as a sentence."""
+    from karta.dispatchers.impl.wikipedia_dispatcher import WikipediaFactDispatcher
+
+    mock_page = MagicMock()
+    mock_page.exists.return_value = True
+    mock_page.summary = "The Eiffel Tower is a wrought-iron lattice tower in Paris."
+    mock_page.fullurl = "https://en.wikipedia.org/wiki/Eiffel_Tower"
+    mock_wiki_class.return_value.page.return_value = mock_page
+
+    mock_genie = MagicMock()
+    dispatcher = WikipediaFactDispatcher()
+    for reply in ("N/A", "The height is not found in the text.", "The text does not mention its height."):
+        mock_genie.llm.generate = AsyncMock(return_value={"text": reply})
+        assert await dispatcher.lookup_fact("Eiffel Tower", "height", genie=mock_genie) is None
+
+
+def test_wikipedia_answer_scoring():
+    """Tests that grounded answers outscore ungrounded and hedged ones."""
+    from karta.dispatchers.impl.wikipedia_dispatcher import score_extracted_answer
+
+    context = "The tower is 330 m tall and was completed in 1889."
+    grounded = score_extracted_answer("330 m", context)
+    ungrounded = score_extracted_answer("312 m", context)
+    hedged = score_extracted_answer("It might be 330 m", context)
+
+    assert grounded > ungrounded > hedged
 
 
 @patch("karta.dispatchers.impl.wolfram_dispatcher.httpx.AsyncClient")
@@ -2,7 +2,7 @@ import pytest
 import numpy as np
 from unittest.mock import MagicMock, AsyncMock
 
-from karta.routing.router import KnowledgeRouter
+from karta.routing.router import KnowledgeRouter, RoutingDecision
 from karta.manager import KartaManager
 from karta.types import Fact
 
@@ -73,7 +73,9 @@ async def test_manager_executes_cascade(mock_plugin_manager_fixture):
     )
 
     manager = KartaManager(genie=MagicMock(), plugin_manager=mock_plugin_manager_fixture, embedder=mock_embedder, vector_store=mock_vector_store, config={})
-    manager.router.get_provider_cascade = AsyncMock(return_value=['wolfram_alpha_dispatcher_v1', 'wikipedia_fact_dispatcher_v1'])
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=['wolfram_alpha_dispatcher_v1', 'wikipedia_fact_dispatcher_v1'])
+    )
 
     # ACT
     result = await manager.lookup_fact("test", "test")
@@ -81,4 +83,273 @@ async def test_manager_executes_cascade(mock_plugin_manager_fixture):
     # ASSERT
     wolfram_provider.lookup_fact.assert_called_once()
     wiki_provider.lookup_fact.assert_called_once()
-    assert result and result.value == "success"
\ No newline at end of file
+    assert result and result.value == "success"
+
+@pytest.mark.asyncio
+async def test_router_sets_up_providers_concurrently(mock_plugin_manager_fixture):
+    """Tests that provider setups overlap and that a failing provider is not indexed."""
+    import asyncio
+
+    wiki_started = asyncio.Event()
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    google_provider = mock_plugin_manager_fixture._plugins["google_search_tool_v1"]
+
+    async def wiki_setup(config=None, **kwargs):
+        wiki_started.set()
+
+    async def wolfram_setup(config=None, **kwargs):
+        # Would time out if the router awaited each setup one after another.
+        await asyncio.wait_for(wiki_started.wait(), timeout=1.0)
+
+    async def google_setup(config=None, **kwargs):
+        raise ConnectionError("unreachable")
+
+    wolfram_provider.setup = wolfram_setup
+    wiki_provider.setup = wiki_setup
+    google_provider.setup = google_setup
+
+    mock_embedder = AsyncMock()
+    mock_embedder.embed = AsyncMock(return_value=async_gen([]))
+    router = KnowledgeRouter(mock_plugin_manager_fixture, mock_embedder, AsyncMock(), {})
+
+    await router.setup()
+
+    indexed_ids = [plugin_id for plugin_id, _ in router.provider_map]
+    assert "wikipedia_fact_dispatcher_v1" in indexed_ids
+    assert "wolfram_alpha_dispatcher_v1" in indexed_ids
+    assert "google_search_tool_v1" not in indexed_ids
+    assert "router.provider_setup" in router.startup_report.phases
+
+
+@pytest.mark.asyncio
+async def test_router_is_ready_before_slow_providers_finish_setup(mock_plugin_manager_fixture):
+    """Tests that providers come online as their setup finishes and that a hung setup times out."""
+    import asyncio
+
+    release = asyncio.Event()
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    google_provider = mock_plugin_manager_fixture._plugins["google_search_tool_v1"]
+    wiki_provider.setup = AsyncMock()
+
+    async def slow_setup(config=None, **kwargs):
+        await release.wait()
+
+    async def hung_setup(config=None, **kwargs):
+        await asyncio.sleep(60)
+
+    wolfram_provider.setup = slow_setup
+    google_provider.setup = hung_setup
+
+    mock_embedder = AsyncMock()
+    mock_embedder.embed = AsyncMock(side_effect=lambda chunks: async_gen([]))
+    vector_store = AsyncMock()
+    router = KnowledgeRouter(mock_plugin_manager_fixture, mock_embedder, vector_store, {"provider_setup_timeout_s": 0.2})
+
+    setup_task = asyncio.create_task(router.setup())
+    assert await router.wait_until_ready(timeout=1.0)
+    indexed_ids = [plugin_id for plugin_id, _ in router.provider_map]
+    assert "wikipedia_fact_dispatcher_v1" in indexed_ids
+    assert "wolfram_alpha_dispatcher_v1" not in indexed_ids
+
+    release.set()
+    await setup_task
+
+    indexed_ids = [plugin_id for plugin_id, _ in router.provider_map]
+    assert "wolfram_alpha_dispatcher_v1" in indexed_ids
+    assert "google_search_tool_v1" not in indexed_ids
+    assert vector_store.add.await_count >= 2
+
+
+@pytest.mark.asyncio
+async def test_readiness_probe_skips_failing_providers(mock_plugin_manager_fixture):
+    """Tests that providers failing the canary lookup are reported and skipped by cascades."""
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(side_effect=ConnectionError("unreachable"))
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=Fact(entity="Earth", attribute="mass", value="5.97e24 kg"))
+
+    manager = KartaManager(
+        genie=MagicMock(), plugin_manager=mock_plugin_manager_fixture, embedder=MagicMock(), vector_store=MagicMock(), config={}
+    )
+    manager.router.provider_map = [("wikipedia_fact_dispatcher_v1", "wiki"), ("wolfram_alpha_dispatcher_v1", "wolfram")]
+    manager.router.is_ready = True
+
+    report = await manager.probe_readiness()
+
+    assert report["ready"] is True
+    assert report["providers"]["wikipedia_fact_dispatcher_v1"]["status"] == "error"
+    assert report["providers"]["wolfram_alpha_dispatcher_v1"]["status"] == "ok"
+    assert wolfram_provider.lookup_fact.await_args.args[:2] == ("Earth", "mass")
+
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"])
+    )
+    wiki_provider.lookup_fact.reset_mock()
+    fact = await manager.lookup_fact("lead", "melting point")
+    assert fact.value == "5.97e24 kg"
+    wiki_provider.lookup_fact.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_router_defers_provider_setup(mock_plugin_manager_fixture):
+    """Tests that `defer_provider_setup` indexes providers without initializing them."""
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.setup = AsyncMock()
+
+    mock_embedder = AsyncMock()
+    mock_embedder.embed = AsyncMock(return_value=async_gen([]))
+    router = KnowledgeRouter(
+        mock_plugin_manager_fixture, mock_embedder, AsyncMock(), {"defer_provider_setup": True}
+    )
+
+    await router.setup()
+
+    wiki_provider.setup.assert_not_called()
+    assert "wikipedia_fact_dispatcher_v1" in [plugin_id for plugin_id, _ in router.provider_map]
+
+
+@pytest.mark.asyncio
+async def test_manager_continues_past_low_confidence_fact(mock_plugin_manager_fixture):
+    """Tests that a fact below `min_confidence` does not stop the cascade."""
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="lead", attribute="melting point", value="maybe hot", confidence=0.2)
+    )
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="lead", attribute="melting point", value="327.5 °C", confidence=0.95)
+    )
+
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"min_confidence": 0.7}},
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"])
+    )
+
+    result = await manager.lookup_fact("lead", "melting point")
+
+    assert result.value == "327.5 °C"
+    wolfram_provider.lookup_fact.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_manager_returns_best_fact_when_budget_is_spent(mock_plugin_manager_fixture):
+    """Tests that an exhausted latency budget returns the best candidate without trying more providers."""
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="lead", attribute="melting point", value="327 °C", confidence=0.5)
+    )
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=None)
+
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"min_confidence": 0.9, "latency_budget_ms": 0}},
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"])
+    )
+
+    result = await manager.lookup_fact("lead", "melting point")
+
+    assert result.value == "327 °C"
+    wolfram_provider.lookup_fact.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_manager_groups_batched_lookups_by_provider(mock_plugin_manager_fixture):
+    """Tests that a batch of lookups sends each provider one request, and only misses move on."""
+    class BatchWiki:
+        plugin_id = "wikipedia_fact_dispatcher_v1"
+        knowledge_description = "Provides encyclopedic information."
+
+        def __init__(self):
+            self.batches = []
+
+        async def lookup_fact(self, entity, attribute, genie, config=None):
+            raise AssertionError("grouped lookups should use lookup_facts_batch")
+
+        async def lookup_facts_batch(self, queries, genie, config=None):
+            self.batches.append(list(queries))
+            return [Fact(entity=e, attribute=a, value="Paris") if a == "capital" else None for e, a in queries]
+
+        async def setup(self, config=None):
+            pass
+
+    wiki = BatchWiki()
+    wolfram = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram.lookup_fact = AsyncMock(side_effect=lambda e, a, genie, config=None: Fact(entity=e, attribute=a, value="42"))
+    mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"] = wiki
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"write_back": False}},
+    )
+
+    async def route_batch(queries, top_k=5):
+        return [
+            RoutingDecision(query=q, cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"])
+            for q in queries
+        ]
+
+    manager.router.route_batch = AsyncMock(side_effect=route_batch)
+
+    facts = await manager.lookup_facts(
+        [("France", "capital"), ("Spain", "capital"), ("France", "population"), ("france", "Capital")]
+    )
+
+    assert [f.value for f in facts] == ["Paris", "Paris", "42", "Paris"]
+    # Three distinct keys: one grouped request to Wikipedia, then only the miss goes to WolframAlpha.
+    assert wiki.batches == [[("France", "capital"), ("Spain", "capital"), ("France", "population")]]
+    wolfram.lookup_fact.assert_awaited_once()
+    manager.router.route_batch.assert_awaited_once()
+
+    # Answers are cached like single lookups.
+    assert (await manager.lookup_fact("Spain", "capital")).value == "Paris"
+
+
+@pytest.mark.asyncio
+async def test_entity_tool_filters_and_pages_entities(mock_plugin_manager_fixture):
+    """Tests label filtering and pagination through the manager and the entity recognition tool."""
+    import json
+
+    from karta.interface import KartaInterface
+    from karta.tools.entity_recognition_tool import entity_recognition_tool
+    from karta.types import Entity
+
+    entities = [
+        Entity(text=f"e{i}", label="PERSON" if i % 2 else "GPE", start_char=i, end_char=i + 1) for i in range(7)
+    ]
+    ner = MagicMock()
+    # Ignores the pushed-down options, so the manager must apply them itself.
+    ner.recognize_entities = AsyncMock(return_value=entities)
+    mock_plugin_manager_fixture._plugins["spacy_ner_dispatcher_v1"] = ner
+    manager = KartaManager(
+        genie=MagicMock(), plugin_manager=mock_plugin_manager_fixture, embedder=MagicMock(), vector_store=MagicMock(), config={}
+    )
+    context = {"genie_framework_instance": MagicMock(karta=KartaInterface(manager))}
+
+    first = await entity_recognition_tool("text", context, labels=["PERSON"], limit=2)
+    assert [e["text"] for e in first["entities"]] == ["e1", "e3"]
+    assert first["next_offset"] == 2
+    assert ner.recognize_entities.await_args.kwargs["config"] == {"labels": ["PERSON"], "max_entities": 3}
+
+    last = await entity_recognition_tool("text", context, labels=["PERSON"], offset=2, limit=2, output_format="ndjson")
+    assert last["count"] == 1 and last["next_offset"] is None
+    assert [json.loads(line)["text"] for line in last["entities"].splitlines()] == ["e5"]
+
+    everything = await entity_recognition_tool("text", context)
+    assert len(everything["entities"]) == 7 and "next_offset" not in everything
+    assert ner.recognize_entities.await_args.kwargs["config"] is None
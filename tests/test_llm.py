@@ -0,0 +1,192 @@
+# karta-engine/tests/test_llm.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.llm.scheduler import LlmScheduler, generate, use_llm_scheduler
+
+
+class RecordingLLM:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts = []
+        self.batches = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return {"text": prompt.upper()}
+
+    async def generate_batch(self, prompts, **kwargs):
+        self.batches.append(list(prompts))
+        return [{"text": prompt.upper()} for prompt in prompts]
+
+
+def _genie(llm):
+    genie = MagicMock()
+    genie.llm = llm
+    return genie
+
+
+@pytest.mark.asyncio
+async def test_concurrent_prompts_are_sent_in_prefix_order():
+    llm = RecordingLLM()
+    scheduler = LlmScheduler(_genie(llm), {"max_in_flight": 1})
+
+    prompts = ["page B / q1", "page A / q2", "page B / q2", "page A / q1"]
+    results = await asyncio.gather(*(scheduler.generate(p, temperature=0.0) for p in prompts))
+
+    assert [r["text"] for r in results] == [p.upper() for p in prompts]
+    assert llm.prompts == sorted(prompts)
+
+
+@pytest.mark.asyncio
+async def test_groups_use_the_batch_method_when_configured():
+    llm = RecordingLLM()
+    scheduler = LlmScheduler(_genie(llm), {"batch_method": "generate_batch", "max_batch_size": 2})
+
+    results = await asyncio.gather(
+        scheduler.generate("c", temperature=0.0),
+        scheduler.generate("a", temperature=0.0),
+        scheduler.generate("b", temperature=0.0),
+        scheduler.generate("z", temperature=0.7),
+    )
+
+    assert [r["text"] for r in results] == ["C", "A", "B", "Z"]
+    # Prompts with different generation parameters are never batched together.
+    assert sorted(llm.batches) == [["a", "c"]]
+    assert sorted(llm.prompts) == ["b", "z"]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_are_capped():
+    llm = RecordingLLM(delay=0.01)
+    scheduler = LlmScheduler(_genie(llm), {"max_in_flight": 2})
+
+    await asyncio.gather(*(scheduler.generate(f"p{i}") for i in range(8)))
+
+    assert len(llm.prompts) == 8
+    assert llm.peak_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_reach_the_caller():
+    genie = MagicMock()
+    genie.llm.generate = AsyncMock(side_effect=RuntimeError("backend down"))
+    scheduler = LlmScheduler(genie)
+
+    with pytest.raises(RuntimeError, match="backend down"):
+        await scheduler.generate("p")
+
+
+@pytest.mark.asyncio
+async def test_generate_uses_the_active_scheduler():
+    direct_genie = MagicMock()
+    direct_genie.llm.generate = AsyncMock(return_value={"text": "direct"})
+    scheduled_llm = RecordingLLM()
+
+    assert (await generate(direct_genie, "p"))["text"] == "direct"
+    with use_llm_scheduler(LlmScheduler(_genie(scheduled_llm))):
+        assert (await generate(direct_genie, "p"))["text"] == "P"
+    assert scheduled_llm.prompts == ["p"]
+
+
+def test_token_budget_trims_and_chunks():
+    from karta.llm.budget import WordTokenizer, chunk_by_tokens, count_tokens, create_tokenizer, trim_to_tokens
+
+    text = "one two three four five six seven"
+    assert isinstance(create_tokenizer(None), WordTokenizer)
+    assert count_tokens(text) == 7
+    assert trim_to_tokens(text, 3) == "one two three"
+    assert trim_to_tokens(text, 10) == text
+    assert chunk_by_tokens(text, 3) == ["one two three", "four five six", "seven"]
+    assert chunk_by_tokens(text, 4, overlap=1) == ["one two three four", "four five six seven"]
+    with pytest.raises(ValueError):
+        create_tokenizer("no-such-tokenizer")
+
+
+@pytest.mark.asyncio
+async def test_generate_records_token_counts():
+    from karta.llm.budget import use_tokenizer
+    from karta.observability import MetricsRecorder, use_instrumentation
+
+    genie = MagicMock()
+    genie.llm.generate = AsyncMock(
+        side_effect=[{"text": "four words of output"}, {"text": "x", "usage": {"prompt_tokens": 11, "completion_tokens": 2}}]
+    )
+    metrics = MetricsRecorder()
+    with use_instrumentation(metrics):
+        await generate(genie, "a three word-prompt")
+        await generate(genie, "ignored")
+
+    tokenizer = MagicMock()
+    with use_tokenizer(tokenizer):
+        # Without instrumentation nothing is recorded, so nothing is tokenized.
+        await generate(MagicMock(llm=MagicMock(generate=AsyncMock(return_value={"text": "x"}))), "prompt")
+    tokenizer.encode.assert_not_called()
+    # Counted locally for the first call, taken from the reported usage for the second.
+    assert metrics.histograms["karta.llm.prompt_tokens"].total == 3 + 11
+    assert metrics.histograms["karta.llm.completion_tokens"].total == 4 + 2
+
+
+@pytest.mark.asyncio
+async def test_summary_input_over_budget_is_chunked():
+    from karta.dispatchers.impl.llm_dispatchers import LlmSummaryDispatcher
+
+    prompts = []
+
+    async def summarize_llm(prompt, **kwargs):
+        prompts.append(prompt)
+        return {"text": "short"}
+
+    genie = MagicMock()
+    genie.llm.generate = summarize_llm
+    text = " ".join(f"w{i}" for i in range(25))
+
+    summary = await LlmSummaryDispatcher().summarize(text, "bullet-point", genie, {"max_input_tokens": 10})
+
+    assert summary == "short"
+    # Three chunk summaries, then one summary of their concatenation.
+    assert len(prompts) == 4
+    assert "w0 w1" in prompts[0] and "w20 w21" in prompts[2]
+    assert "short\n\nshort\n\nshort" in prompts[3] and prompts[3].endswith("bullet-point manner.")
+
+    prompts.clear()
+    await LlmSummaryDispatcher().summarize(text, "brief", genie, {"max_input_tokens": 10, "overflow": "trim"})
+    assert len(prompts) == 1 and "w9" in prompts[0] and "w10" not in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_batched_prompts_are_admitted_at_their_highest_priority():
+    from contextlib import asynccontextmanager
+
+    from karta.admission import use_priority
+
+    priorities = []
+
+    class RecordingAdmission:
+        @asynccontextmanager
+        async def admit(self, key, priority=None):
+            priorities.append(priority)
+            yield
+
+    llm = RecordingLLM()
+    scheduler = LlmScheduler(
+        _genie(llm), {"batch_method": "generate_batch", "batch_window_ms": 10}, admission=RecordingAdmission()
+    )
+
+    async def submit(prompt, priority):
+        with use_priority(priority):
+            return await scheduler.generate(prompt)
+
+    # The batch-priority caller arrives first and starts the flush.
+    await asyncio.gather(submit("a", "batch"), submit("b", "interactive"))
+
+    assert llm.batches == [["a", "b"]]
+    assert priorities == ["interactive"]
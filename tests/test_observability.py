@@ -0,0 +1,83 @@
+# karta-engine/tests/test_observability.py
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.manager import KartaManager
+from karta.observability import (
+    NOOP_INSTRUMENTATION,
+    MetricsRecorder,
+    create_instrumentation,
+    current_instrumentation,
+    use_instrumentation,
+)
+from karta.routing.router import RoutingDecision
+from karta.types import Fact
+
+
+class TestMetricsRecorder:
+    """Tests the in-process metrics implementation."""
+
+    def test_histogram_percentiles(self):
+        recorder = MetricsRecorder()
+        for value in range(1, 101):
+            recorder.observe("karta.provider.latency_ms", float(value), provider="wiki")
+
+        summary = recorder.snapshot()["histograms"]["karta.provider.latency_ms{provider=wiki}"]
+        assert summary["count"] == 100
+        assert summary["p50"] == 50.0
+        assert summary["p99"] == 99.0
+        assert summary["max"] == 100.0
+
+    def test_counters_and_timer(self):
+        recorder = MetricsRecorder()
+        recorder.increment("karta.provider.calls", provider="wiki", outcome="hit")
+        recorder.increment("karta.provider.calls", provider="wiki", outcome="hit")
+        with recorder.timer("karta.routing.latency_ms"):
+            pass
+
+        snapshot = recorder.snapshot()
+        assert snapshot["counters"]["karta.provider.calls{outcome=hit,provider=wiki}"] == 2
+        assert snapshot["histograms"]["karta.routing.latency_ms"]["count"] == 1
+
+    def test_disabled_by_default(self):
+        assert create_instrumentation(None) is NOOP_INSTRUMENTATION
+        assert create_instrumentation({"enabled": False}) is NOOP_INSTRUMENTATION
+        assert NOOP_INSTRUMENTATION.snapshot() == {}
+
+    def test_context_propagation(self):
+        recorder = MetricsRecorder()
+        assert current_instrumentation() is NOOP_INSTRUMENTATION
+        with use_instrumentation(recorder):
+            assert current_instrumentation() is recorder
+        assert current_instrumentation() is NOOP_INSTRUMENTATION
+
+
+@pytest.mark.asyncio
+async def test_manager_records_cascade_metrics(mock_plugin_manager_fixture):
+    """Tests that a lookup records routing, per-provider and cascade-depth metrics."""
+    wolfram_provider = mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"]
+    wolfram_provider.lookup_fact = AsyncMock(return_value=None)
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="test", attribute="test", value="success", source="wiki")
+    )
+
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"metrics": {"enabled": True}},
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wolfram_alpha_dispatcher_v1", "wikipedia_fact_dispatcher_v1"])
+    )
+
+    await manager.lookup_fact("test", "test")
+    metrics = manager.stats()["metrics"]
+
+    assert metrics["histograms"]["karta.cascade.depth"]["max"] == 2
+    assert metrics["counters"]["karta.provider.calls{outcome=miss,provider=wolfram_alpha_dispatcher_v1}"] == 1
+    assert metrics["counters"]["karta.provider.calls{outcome=hit,provider=wikipedia_fact_dispatcher_v1}"] == 1
+    assert "karta.routing.latency_ms" in metrics["histograms"]
@@ -0,0 +1,125 @@
+# karta-engine/tests/test_precompute.py
+import asyncio
+import json
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from karta.cli import main as cli_main
+from karta.observability import NOOP_INSTRUMENTATION
+from karta.precompute import Checkpoint, load_manifest, precompute
+from karta.store.sqlite_store import SqliteFactStore
+from karta.types import Fact
+
+
+def _write_manifest(tmp_path):
+    (tmp_path / "elements.txt").write_text("# symbols\nLead\nGold\n", encoding="utf-8")
+    manifest = {
+        "groups": [
+            {"entities": ["France", "Germany"], "attributes": ["capital", "population"]},
+            {"entities_file": "elements.txt", "attributes": ["melting point"]},
+        ],
+        "keys": [["The Gold", "Melting Point"], ["Lead", "density"]],
+    }
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return str(path)
+
+
+def _fake_manager(answers, failures=()):
+    manager = MagicMock()
+    manager.metrics = NOOP_INSTRUMENTATION
+
+    async def lookup_fact(entity, attribute, priority=None, timeout=None):
+        assert priority == "batch"
+        if (entity, attribute) in failures:
+            raise ConnectionError("provider unavailable")
+        value = answers.get((entity, attribute))
+        return Fact(entity=entity, attribute=attribute, value=value) if value else None
+
+    manager.lookup_fact = AsyncMock(side_effect=lookup_fact)
+    return manager
+
+
+def test_load_manifest_expands_groups_and_drops_duplicates(tmp_path):
+    keys = load_manifest(_write_manifest(tmp_path))
+    assert keys == [
+        ("France", "capital"),
+        ("France", "population"),
+        ("Germany", "capital"),
+        ("Germany", "population"),
+        ("Lead", "melting point"),
+        ("Gold", "melting point"),
+        ("Lead", "density"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_precompute_writes_store_and_resumes_from_checkpoint(tmp_path):
+    keys = load_manifest(_write_manifest(tmp_path))
+    answers = {("France", "capital"): "Paris", ("Germany", "capital"): "Berlin", ("Lead", "melting point"): "327.5 °C"}
+    store = SqliteFactStore(str(tmp_path / "facts.sqlite3"))
+    checkpoint_path = str(tmp_path / "run.checkpoint")
+
+    manager = _fake_manager(answers, failures={("Gold", "melting point")})
+    checkpoint = Checkpoint(checkpoint_path)
+    stats = await precompute(manager, keys, concurrency=3, checkpoint=checkpoint, store=store)
+    checkpoint.close()
+    assert (stats.keys, stats.found, stats.not_found, stats.errors) == (7, 3, 3, 1)
+    assert store.get("germany", "capital").value == "Berlin"
+
+    # Only the failed key is retried on the next run.
+    manager = _fake_manager({("Gold", "melting point"): "1064 °C"})
+    checkpoint = Checkpoint(checkpoint_path)
+    stats = await precompute(manager, keys, checkpoint=checkpoint, store=store)
+    checkpoint.close()
+    assert (stats.skipped, stats.found, stats.errors) == (6, 1, 0)
+    manager.lookup_fact.assert_awaited_once_with("Gold", "melting point", priority="batch", timeout=None)
+    assert store.count() == 4
+
+
+@pytest.mark.asyncio
+async def test_precompute_bounds_concurrency_and_rate():
+    in_flight = peak = 0
+
+    async def lookup_fact(entity, attribute, priority=None, timeout=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return None
+
+    manager = _fake_manager({})
+    manager.lookup_fact = AsyncMock(side_effect=lookup_fact)
+    keys = [(f"entity {i}", "attribute") for i in range(12)]
+    stats = await precompute(manager, keys, concurrency=3)
+    assert stats.not_found == 12 and peak == 3
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await precompute(manager, keys[:5], concurrency=5, rate_per_second=40.0)
+    # A burst of one token, then one lookup every 25 ms.
+    assert loop.time() - started >= 0.09
+
+
+def test_precompute_command(tmp_path, monkeypatch, capsys):
+    manifest = _write_manifest(tmp_path)
+    genie = MagicMock()
+    genie.karta._manager = _fake_manager({("France", "capital"): "Paris"})
+    genie.karta._manager.close = AsyncMock()
+    genie.close = AsyncMock()
+    factory_module = types.ModuleType("precompute_app")
+    factory_module.create_genie = AsyncMock(return_value=genie)
+    monkeypatch.setitem(sys.modules, "precompute_app", factory_module)
+
+    store_path = str(tmp_path / "facts.sqlite3")
+    assert cli_main(["precompute", manifest, "--genie", "precompute_app:create_genie", "--store", store_path]) == 0
+    assert "1 found, 6 not found, 0 errors" in capsys.readouterr().out
+    assert SqliteFactStore(store_path).get("France", "capital").value == "Paris"
+    genie.close.assert_awaited_once()
+
+    assert cli_main(["precompute", manifest, "--genie", "precompute_app:create_genie"]) == 0
+    assert "7 already done" in capsys.readouterr().out
@@ -0,0 +1,390 @@
+# karta-engine/tests/test_routing.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from karta.cli import main as cli_main
+from karta.manager import KartaManager
+from karta.routing.bulk import bulk_cascades
+from karta.routing.cost import ProviderCostModel
+from karta.routing.decision_log import DecisionLog, read_decisions
+from karta.routing.lexical import LexicalPreRouter, LinearQueryClassifier
+from karta.routing.replay import replay, training_examples
+from karta.routing.router import KnowledgeRouter, RoutingDecision, build_cascade
+from karta.types import Fact
+
+SCORED = [("wiki", 0.82), ("wolfram", 0.78), ("google", 0.31)]
+
+
+class TestBuildCascade:
+    """Tests turning scored providers into a cascade."""
+
+    def test_keeps_similarity_order_without_cutoffs(self):
+        cascade, pruned = build_cascade(SCORED, {})
+        assert cascade == ["wiki", "wolfram", "google"]
+        assert pruned == []
+
+    def test_min_score_prunes_irrelevant_providers(self):
+        cascade, pruned = build_cascade(SCORED, {"min_score": 0.5})
+        assert cascade == ["wiki", "wolfram"]
+        assert pruned == ["google"]
+
+    def test_score_margin_is_relative_to_best(self):
+        cascade, pruned = build_cascade(SCORED, {"score_margin": 0.02})
+        assert cascade == ["wiki"]
+        assert pruned == ["wolfram", "google"]
+
+    def test_priority_and_fallback_are_never_pruned(self):
+        config = {"min_score": 0.9, "priority_providers": ["local"], "fallback_provider": "google"}
+        cascade, pruned = build_cascade(SCORED, config)
+        assert cascade == ["local", "google"]
+        assert pruned == ["wiki", "wolfram"]
+
+    def test_unscored_providers_are_kept(self):
+        cascade, _ = build_cascade([("wiki", None), ("wolfram", 0.1)], {"min_score": 0.5})
+        assert cascade == ["wiki"]
+
+    def test_expected_latency_strategy_prefers_cheap_providers(self):
+        cost_model = ProviderCostModel({"provider_costs_ms": {"wiki": 900.0, "wolfram": 100.0}})
+        config = {"routing_strategy": "expected_latency", "min_score": 0.5}
+        cascade, _ = build_cascade(SCORED, config, cost_model)
+        assert cascade == ["wolfram", "wiki"]
+
+
+class TestProviderCostModel:
+    """Tests the per-provider latency and hit-rate estimates."""
+
+    def test_estimates_track_observations(self):
+        model = ProviderCostModel({"cost_smoothing": 0.5})
+        model.record("wiki", 200.0, hit=True)
+        model.record("wiki", 400.0, hit=False)
+
+        assert model.expected_cost_ms("wiki") == 300.0
+        assert model.snapshot()["wiki"]["observations"] == 2
+        assert model.expected_cost_ms("unseen") == 500.0
+
+
+def test_local_providers_lead_the_cascade():
+    cascade, _ = build_cascade(
+        SCORED, {"priority_providers": ["wolfram"], "min_score": 0.5}, local_providers=["local_store"]
+    )
+    assert cascade == ["local_store", "wolfram", "wiki"]
+
+
+class TestLexicalPreRouter:
+    """Tests the regex and classifier first-stage router."""
+
+    @pytest.mark.parametrize(
+        "query",
+        ["2 + 2", "(3.5*4)^2", "12 km in miles", "water boiling point 100 °C", "square root of 2"],
+    )
+    def test_computational_queries_go_to_wolfram(self, query):
+        pre_route = LexicalPreRouter().route(query)
+        assert pre_route.providers == ["wolfram_alpha_dispatcher_v1"]
+        assert pre_route.method == "rule"
+
+    def test_biographical_queries_go_to_wikipedia(self):
+        assert LexicalPreRouter().route("who is Ada Lovelace").providers == ["wikipedia_fact_dispatcher_v1"]
+
+    def test_ambiguous_and_unavailable_queries_fall_through(self):
+        pre_router = LexicalPreRouter()
+        assert pre_router.route("France capital") is None
+        assert pre_router.route("2 + 2", available=["wikipedia_fact_dispatcher_v1"]) is None
+
+    def test_custom_rules_without_defaults(self):
+        pre_router = LexicalPreRouter(
+            {"use_default_rules": False, "rules": [{"pattern": r"\bsku-\d+", "providers": ["catalog"]}]}
+        )
+        assert pre_router.route("SKU-1234 weight").providers == ["catalog"]
+        assert pre_router.route("2 + 2") is None
+
+    def test_trained_classifier_routes_confident_queries(self, tmp_path):
+        examples = [(f"{country} capital", "wiki") for country in ("France", "Peru", "Chad", "Laos")] + [
+            (f"{element} atomic mass", "wolfram") for element in ("lead", "tin", "iron", "gold")
+        ]
+        classifier = LinearQueryClassifier.fit(examples * 5, dim=256)
+        path = str(tmp_path / "classifier.npz")
+        classifier.save(path)
+
+        pre_router = LexicalPreRouter(
+            {"use_default_rules": False, "classifier_path": path, "classifier_threshold": 0.7}
+        )
+        pre_route = pre_router.route("Spain capital")
+        assert pre_route.providers == ["wiki"] and pre_route.method == "classifier"
+        assert pre_router.route("copper atomic mass").providers == ["wolfram"]
+
+    def test_classifier_needs_two_providers(self):
+        with pytest.raises(ValueError):
+            LinearQueryClassifier.fit([(f"{country} capital", "wiki") for country in ("France", "Peru")], dim=64)
+
+
+@pytest.mark.asyncio
+async def test_router_skips_embedding_for_pre_routed_queries():
+    embedder = MagicMock()
+    embedder.embed = AsyncMock()
+    router = KnowledgeRouter(
+        MagicMock(), embedder, MagicMock(), {"pre_router": {"enabled": True}, "fallback_provider": "google"}
+    )
+    router.is_ready = True
+    router.provider_map = [("wolfram_alpha_dispatcher_v1", "math"), ("wikipedia_fact_dispatcher_v1", "people")]
+    router.local_provider_ids = ["local_store"]
+
+    decision = await router.route("3 * 7")
+
+    assert decision.cascade == ["local_store", "wolfram_alpha_dispatcher_v1", "google"]
+    assert decision.source == "lexical_rule"
+    embedder.embed.assert_not_called()
+
+
+class BatchRecordingEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    async def embed(self, chunks):
+        items = [chunk async for chunk in chunks]
+        self.batches.append([chunk.content for chunk in items])
+
+        async def stream():
+            for chunk in items:
+                yield chunk, [float(len(chunk.content)), 1.0]
+
+        return stream()
+
+
+class _Hit:
+    def __init__(self, provider_id, score):
+        self.id = provider_id
+        self.score = score
+
+
+def _streaming_router(embedder):
+    vector_store = MagicMock()
+    vector_store.search = AsyncMock(side_effect=lambda query_embedding, **kwargs: [_Hit("wiki", 0.9)])
+    router = KnowledgeRouter(MagicMock(), embedder, vector_store, {"pre_router": {"enabled": True}})
+    router.is_ready = True
+    router.provider_map = [("wiki", "encyclopedia"), ("wolfram_alpha_dispatcher_v1", "math")]
+    return router
+
+
+@pytest.mark.asyncio
+async def test_route_stream_embeds_queries_in_batches():
+    embedder = BatchRecordingEmbedder()
+    router = _streaming_router(embedder)
+    queries = ["France capital", "3 * 7", "Lead density", "Spain capital", "Gold melting point"]
+
+    async def source():
+        for query in queries:
+            yield query
+
+    decisions = [d async for d in router.route_stream(source(), batch_size=3, batch_window_ms=50)]
+
+    assert [d.query for d in decisions] == queries
+    assert decisions[1].source == "lexical_rule"
+    assert decisions[0].cascade == ["wiki"] and decisions[0].query_embedding == [14.0, 1.0]
+    # The pre-routed arithmetic query is never embedded.
+    assert embedder.batches == [["France capital", "Lead density"], ["Spain capital", "Gold melting point"]]
+
+
+@pytest.mark.asyncio
+async def test_route_stream_surfaces_source_errors():
+    router = _streaming_router(BatchRecordingEmbedder())
+
+    async def source():
+        yield "France capital"
+        raise ConnectionError("queue closed")
+
+    decisions = []
+    with pytest.raises(ConnectionError):
+        async for decision in router.route_stream(source(), batch_window_ms=0):
+            decisions.append(decision)
+    assert [d.query for d in decisions] == ["France capital"]
+
+
+@pytest.mark.asyncio
+async def test_route_stream_closes_while_read_ahead_queue_is_full():
+    router = _streaming_router(BatchRecordingEmbedder())
+
+    async def endless():
+        i = 0
+        while True:
+            yield f"entity {i} capital"
+            i += 1
+
+    stream = router.route_stream(endless(), batch_size=2, batch_window_ms=0)
+    async for decision in stream:
+        # Let the producer fill the read-ahead queue before leaving the stream.
+        await asyncio.sleep(0.01)
+        break
+    await asyncio.wait_for(stream.aclose(), timeout=2.0)
+
+
+@pytest.mark.parametrize("strategy", ["similarity", "expected_latency"])
+def test_bulk_cascades_match_build_cascade(strategy):
+    rng = np.random.default_rng(7)
+    provider_ids = ["wiki", "wolfram", "google", "news", "rag", "index"]
+    scores = rng.uniform(0.0, 1.0, size=(200, len(provider_ids))).astype(np.float32)
+    config = {
+        "min_score": 0.3,
+        "score_margin": 0.4,
+        "priority_providers": ["rag"],
+        "fallback_provider": "google",
+        "routing_strategy": strategy,
+    }
+    cost_model = ProviderCostModel({"provider_costs_ms": {"wiki": 300, "wolfram": 120, "news": 900}})
+    cost_model.record("wolfram", 150.0, hit=False)
+    valid = np.ones(len(scores), dtype=bool)
+    valid[::17] = False
+
+    routing = bulk_cascades(scores, provider_ids, config, cost_model, ["local"], top_k=4, valid=valid)
+
+    assert routing.cascades.dtype == np.int16
+    for row in range(len(scores)):
+        if not valid[row]:
+            assert routing.cascade(row) == ["local"]
+            continue
+        top = sorted(zip(provider_ids, scores[row].tolist()), key=lambda item: -item[1])[:4]
+        expected, _ = build_cascade(top, config, cost_model, local_providers=["local"])
+        assert routing.cascade(row) == expected
+
+
+@pytest.mark.asyncio
+async def test_route_bulk_scores_all_queries_against_provider_matrix():
+    embedder = MagicMock()
+
+    async def embed(chunks):
+        items = [chunk async for chunk in chunks]
+        embedder.batch_sizes.append(len(items))
+
+        async def stream():
+            for chunk in items:
+                yield chunk, [1.0, 0.0] if "capital" in chunk.content else [0.0, 1.0]
+
+        return stream()
+
+    embedder.embed = embed
+    embedder.batch_sizes = []
+    router = KnowledgeRouter(MagicMock(), embedder, MagicMock(), {"pre_router": {"enabled": True}, "min_score": 0.5})
+    router.is_ready = True
+    router.provider_map = [("wikipedia_fact_dispatcher_v1", "places"), ("wolfram_alpha_dispatcher_v1", "numbers")]
+    router.provider_embeddings = {
+        "wikipedia_fact_dispatcher_v1": np.array([2.0, 0.0], dtype=np.float32),
+        "wolfram_alpha_dispatcher_v1": np.array([0.1, 1.0], dtype=np.float32),
+    }
+    router.local_provider_ids = ["local_fact_store_dispatcher_v1"]
+    queries = ["France capital", "Lead density", "2 + 2", "Spain capital", "Gold density"]
+
+    routing = await router.route_bulk(queries, batch_size=2)
+
+    assert embedder.batch_sizes == [2, 2]
+    assert [routing.cascade(i) for i in range(len(queries))] == [
+        ["local_fact_store_dispatcher_v1", "wikipedia_fact_dispatcher_v1"],
+        ["local_fact_store_dispatcher_v1", "wolfram_alpha_dispatcher_v1"],
+        ["local_fact_store_dispatcher_v1", "wolfram_alpha_dispatcher_v1"],
+        ["local_fact_store_dispatcher_v1", "wikipedia_fact_dispatcher_v1"],
+        ["local_fact_store_dispatcher_v1", "wolfram_alpha_dispatcher_v1"],
+    ]
+    assert routing.scores[0, 1] == pytest.approx(1.0)
+    assert np.isnan(routing.scores[2, 1])
+
+
+class TestDecisionLogReplay:
+    """Tests logging routing decisions and replaying them against other configs."""
+
+    def _write_log(self, path):
+        log = DecisionLog(str(path), max_bytes=1000, backup_count=10)
+        for i in range(6):
+            # Wikipedia is routed first but only WolframAlpha ever answers.
+            decision = RoutingDecision(
+                query=f"element {i} atomic mass",
+                cascade=["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"],
+                scores={"wikipedia_fact_dispatcher_v1": 0.8, "wolfram_alpha_dispatcher_v1": 0.7},
+            )
+            steps = [
+                {"provider": "wikipedia_fact_dispatcher_v1", "outcome": "miss", "ms": 300.0, "confidence": None},
+                {"provider": "wolfram_alpha_dispatcher_v1", "outcome": "hit", "ms": 100.0, "confidence": 0.95},
+            ]
+            log.record(decision, steps, "wolfram_alpha_dispatcher_v1", 400.0)
+        log.close()
+
+    def test_rotated_log_is_read_back_in_order(self, tmp_path):
+        path = tmp_path / "decisions.jsonl"
+        self._write_log(path)
+
+        records = list(read_decisions([str(path)]))
+        assert [r["query"] for r in records] == [f"element {i} atomic mass" for i in range(6)]
+        assert (tmp_path / "decisions.jsonl.1").exists()
+
+    def test_replay_reports_calls_and_latency_saved(self, tmp_path):
+        path = tmp_path / "decisions.jsonl"
+        self._write_log(path)
+
+        report = replay(
+            read_decisions([str(path)]),
+            {"wolfram_first": {"priority_providers": ["wolfram_alpha_dispatcher_v1"]}, "top1": {"top_k": 1}},
+        )
+        wolfram_first, top1 = report.candidates
+        assert report.baseline.expected_calls == 12
+        assert wolfram_first.expected_calls == 6 and wolfram_first.cascade_changes == 6
+        assert report.savings()[0]["latency_ms_saved"] == pytest.approx(6 * 300.0)
+        assert top1.expected_answer_rate == 0
+        assert training_examples(read_decisions([str(path)]))[0] == (
+            "element 0 atomic mass",
+            "wolfram_alpha_dispatcher_v1",
+        )
+
+
+@pytest.mark.asyncio
+async def test_manager_logs_each_routed_lookup(mock_plugin_manager_fixture, tmp_path):
+    path = tmp_path / "decisions.jsonl"
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=Fact(entity="France", attribute="capital", value="Paris"))
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"decision_log": {"path": str(path)}}},
+    )
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(
+            query="France capital", cascade=["wikipedia_fact_dispatcher_v1"], scores={"wikipedia_fact_dispatcher_v1": 0.9}
+        )
+    )
+
+    await manager.lookup_fact("France", "capital")
+    await manager.lookup_fact("France", "capital")  # served by the fact cache, not logged
+    await manager.close()
+
+    (record,) = read_decisions([str(path)])
+    assert record["answered_by"] == "wikipedia_fact_dispatcher_v1"
+    assert record["steps"][0]["outcome"] == "hit"
+    assert record["scores"] == {"wikipedia_fact_dispatcher_v1": 0.9}
+
+
+def test_cli_replay_and_train_prerouter(tmp_path, capsys):
+    path = tmp_path / "decisions.jsonl"
+    TestDecisionLogReplay()._write_log(path)
+    candidate = tmp_path / "wolfram_first.json"
+    candidate.write_text('{"priority_providers": ["wolfram_alpha_dispatcher_v1"]}')
+
+    assert cli_main(["replay", str(path), "--candidate", str(candidate)]) == 0
+    assert "wolfram_first" in capsys.readouterr().out
+
+    # Every answer in this log came from WolframAlpha; a one-class model would take over all routing.
+    model = tmp_path / "prerouter.npz"
+    assert cli_main(["train-prerouter", str(path), "-o", str(model)]) == 1
+    assert "at least two providers" in capsys.readouterr().err
+    assert not model.exists()
+
+    log = DecisionLog(str(tmp_path / "more.jsonl"))
+    log.record(
+        RoutingDecision(query="France capital", cascade=["wikipedia_fact_dispatcher_v1"]),
+        [{"provider": "wikipedia_fact_dispatcher_v1", "outcome": "hit", "ms": 50.0, "confidence": 0.9}],
+        "wikipedia_fact_dispatcher_v1",
+        50.0,
+    )
+    log.close()
+    assert cli_main(["train-prerouter", str(path), str(tmp_path / "more.jsonl"), "-o", str(model)]) == 0
+    assert LinearQueryClassifier.load(str(model)).labels == ["wikipedia_fact_dispatcher_v1", "wolfram_alpha_dispatcher_v1"]
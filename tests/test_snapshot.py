@@ -0,0 +1,124 @@
+# karta-engine/tests/test_snapshot.py
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from karta.manager import KartaManager
+from karta.routing.router import RoutingDecision
+from karta.snapshot import Snapshot, SnapshotData, SnapshotError, write_snapshot
+from karta.types import Fact
+
+
+class FakeEmbedder:
+    plugin_id = "fake_embedder_v1"
+
+    def __init__(self, model_name="mini"):
+        self.model_name = model_name
+        self.embedded = []
+
+    async def embed(self, chunks, **kwargs):
+        items = [chunk async for chunk in chunks]
+        self.embedded.extend(chunk.content for chunk in items)
+
+        async def results():
+            for chunk in items:
+                yield chunk, [float(len(chunk.content)), 1.0, 0.5]
+
+        return results()
+
+
+class RecordingVectorStore:
+    def __init__(self):
+        self.vectors = {}
+
+    async def add(self, embeddings, config=None):
+        async for chunk, vector in embeddings:
+            self.vectors[chunk.id] = list(vector)
+
+
+def _manager(plugin_manager, embedder, snapshot_path):
+    # The catch-all mock matches every protocol but has no real description.
+    plugin_manager._plugins.pop("unrelated_tool_v1", None)
+    return KartaManager(
+        genie=MagicMock(),
+        plugin_manager=plugin_manager,
+        embedder=embedder,
+        vector_store=RecordingVectorStore(),
+        config={
+            "fact_lookup": {"write_back": False, "semantic_cache": {"enabled": True, "threshold": 0.9}},
+            "snapshot": {"path": str(snapshot_path)},
+        },
+    )
+
+
+def test_snapshot_round_trip_and_validation(tmp_path):
+    path = tmp_path / "state.snap"
+    matrix = np.arange(12, dtype=np.float32).reshape(4, 3)
+    data = SnapshotData(model_version="m", provider_hashes={"p": "h"}, records={"k": [1, 2]}, arrays={"a": matrix})
+    write_snapshot(data, str(path))
+
+    with Snapshot(str(path)) as snapshot:
+        assert (snapshot.model_version, snapshot.provider_hashes, snapshot.records) == ("m", {"p": "h"}, {"k": [1, 2]})
+        np.testing.assert_array_equal(snapshot.array("a"), matrix)
+        assert snapshot.array("missing") is None
+
+    (tmp_path / "junk.snap").write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        Snapshot(str(tmp_path / "junk.snap"))
+
+
+@pytest.mark.asyncio
+async def test_manager_restores_caches_and_router_embeddings(mock_plugin_manager_fixture, tmp_path):
+    path = tmp_path / "karta.snap"
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(return_value=Fact(entity="France", attribute="capital", value="Paris"))
+
+    first = _manager(mock_plugin_manager_fixture, FakeEmbedder(), path)
+    await first.setup()
+    first.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1"], query_embedding=[1.0, 0.0, 0.0])
+    )
+    await first.lookup_fact("France", "capital")
+    first.router.cost_model.record("wikipedia_fact_dispatcher_v1", 120.0, hit=True)
+    assert first.export_snapshot() > 0
+
+    # A changed description must be re-embedded; the others are reused.
+    mock_plugin_manager_fixture._plugins["wolfram_alpha_dispatcher_v1"].knowledge_description = "Computes things."
+    embedder = FakeEmbedder()
+    second = _manager(mock_plugin_manager_fixture, embedder, path)
+    await second.setup()
+
+    assert embedder.embedded == ["Computes things."]
+    assert set(second.router.vector_store.vectors) == {
+        "wikipedia_fact_dispatcher_v1",
+        "wolfram_alpha_dispatcher_v1",
+        "google_search_tool_v1",
+    }
+    second.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=["wikipedia_fact_dispatcher_v1"], query_embedding=[1.0, 0.0, 0.0])
+    )
+    wiki_provider.lookup_fact.reset_mock()
+    assert (await second.lookup_fact("france", "capital")).value == "Paris"
+    assert len(second.semantic_cache) == 1
+    wiki_provider.lookup_fact.assert_not_called()
+    assert second.router.cost_model.has_estimate("wikipedia_fact_dispatcher_v1")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_from_another_embedding_model_keeps_only_facts(mock_plugin_manager_fixture, tmp_path):
+    path = tmp_path / "karta.snap"
+    first = _manager(mock_plugin_manager_fixture, FakeEmbedder("mini"), path)
+    await first.setup()
+    first.fact_cache.put(("france", "capital"), Fact(entity="France", attribute="capital", value="Paris"))
+    first.semantic_cache.add([1.0, 0.0, 0.0], "france", Fact(entity="France", attribute="capital", value="Paris"))
+    first.export_snapshot()
+
+    embedder = FakeEmbedder("large")
+    second = _manager(mock_plugin_manager_fixture, embedder, path)
+    restored = second.restore_snapshot(str(path))
+
+    assert restored == {"facts": 1}
+    assert len(second.semantic_cache) == 0
+    await second.setup()
+    assert len(embedder.embedded) == 3
@@ -0,0 +1,38 @@
+# karta-engine/tests/test_startup.py
+import sys
+
+from karta.lazy import lazy_import
+from karta.startup import StartupReport
+
+
+class TestLazyImport:
+    """Tests the deferred module proxy used for optional backends."""
+
+    def test_module_is_not_imported_until_used(self):
+        sys.modules.pop("colorsys", None)
+        proxy = lazy_import("colorsys")
+
+        assert not proxy.is_loaded
+        assert "colorsys" not in sys.modules
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+        assert proxy.is_loaded
+
+    def test_availability_does_not_import(self):
+        sys.modules.pop("colorsys", None)
+
+        assert lazy_import("colorsys")
+        assert "colorsys" not in sys.modules
+        assert not lazy_import("karta_module_that_does_not_exist")
+
+
+class TestStartupReport:
+    """Tests the bootstrap phase timer."""
+
+    def test_phases_are_recorded(self):
+        report = StartupReport()
+        with report.phase("router.setup"):
+            pass
+
+        phases = report.as_dict()["phases_ms"]
+        assert set(phases) == {"router.setup"}
+        assert phases["router.setup"] >= 0.0
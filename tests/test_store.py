@@ -0,0 +1,234 @@
+# karta-engine/tests/test_store.py
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from karta.cli import main as cli_main
+from karta.dispatchers.impl.fact_index_dispatcher import FactIndexDispatcher
+from karta.dispatchers.impl.local_fact_store_dispatcher import LocalFactStoreDispatcher
+from karta.manager import KartaManager
+from karta.normalization import fact_key, normalize_text
+from karta.routing.router import RoutingDecision
+from karta.store.bulk_import import import_facts
+from karta.store.fact_index import MmapFactIndex, compile_fact_index
+from karta.store.sqlite_store import SqliteFactStore
+from karta.types import Fact
+
+
+def test_normalize_text():
+    assert normalize_text("The Eiffel Tower") == "eiffel tower"
+    assert normalize_text("  eiffel-tower ") == "eiffel tower"
+    assert normalize_text("Zürich") == "zurich"
+
+
+class TestSqliteFactStore:
+    """Tests the embedded fact store."""
+
+    def test_lookup_ignores_surface_variation(self):
+        store = SqliteFactStore()
+        store.put(Fact(entity="Eiffel Tower", attribute="height", value="330 m", confidence=0.9))
+
+        fact = store.get("the eiffel tower", "Height")
+        assert fact is not None and fact.value == "330 m"
+        assert fact.confidence == 0.9
+
+    def test_aliases_resolve_to_canonical_entity(self):
+        store = SqliteFactStore()
+        store.add_alias("The Big Apple", "New York City")
+        store.put(Fact(entity="New York City", attribute="population", value="8.3 million"))
+
+        assert store.get("big apple", "population").value == "8.3 million"
+
+    def test_expired_facts_are_misses(self):
+        store = SqliteFactStore()
+        store.put(Fact(entity="Bitcoin", attribute="price", value="1"))
+
+        assert store.get("Bitcoin", "price", max_age_seconds=-1) is None
+
+
+@pytest.mark.asyncio
+async def test_local_store_concurrent_first_lookups_open_one_store():
+    local_store = LocalFactStoreDispatcher()
+    with patch(
+        "karta.dispatchers.impl.local_fact_store_dispatcher.SqliteFactStore", side_effect=SqliteFactStore
+    ) as opened:
+        await asyncio.gather(*(local_store.lookup_fact("Eiffel Tower", "height", None) for _ in range(5)))
+    assert opened.call_count == 1
+    await local_store.teardown()
+
+
+@pytest.mark.asyncio
+async def test_manager_writes_resolved_facts_back_to_local_store(mock_plugin_manager_fixture):
+    """Tests that a fact resolved remotely is served by the local store on the next lookup."""
+    local_store = LocalFactStoreDispatcher()
+    await local_store.setup({})
+    mock_plugin_manager_fixture._plugins[local_store.plugin_id] = local_store
+
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        return_value=Fact(entity="Eiffel Tower", attribute="height", value="330 m", confidence=0.85)
+    )
+
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        # Bypass the in-memory fact cache so the second lookup reaches the store.
+        config={"fact_lookup": {"cache": {"enabled": False}}},
+    )
+    manager.router.local_provider_ids = [local_store.plugin_id]
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=[local_store.plugin_id, "wikipedia_fact_dispatcher_v1"])
+    )
+
+    first = await manager.lookup_fact("Eiffel Tower", "height")
+    await manager.close()
+    second = await manager.lookup_fact("The Eiffel Tower", "height")
+
+    assert first.value == second.value == "330 m"
+    wiki_provider.lookup_fact.assert_called_once()
+    await local_store.teardown()
+
+
+@pytest.mark.asyncio
+async def test_refresh_bypasses_and_updates_local_store(mock_plugin_manager_fixture):
+    """Tests that a background refresh asks the remote provider again and overwrites the stored copy."""
+    local_store = LocalFactStoreDispatcher()
+    await local_store.setup({})
+    mock_plugin_manager_fixture._plugins[local_store.plugin_id] = local_store
+
+    wiki_provider = mock_plugin_manager_fixture._plugins["wikipedia_fact_dispatcher_v1"]
+    wiki_provider.lookup_fact = AsyncMock(
+        side_effect=[
+            Fact(entity="Bitcoin", attribute="price", value="1", confidence=0.9),
+            Fact(entity="Bitcoin", attribute="price", value="2", confidence=0.9),
+        ]
+    )
+
+    manager = KartaManager(
+        genie=MagicMock(),
+        plugin_manager=mock_plugin_manager_fixture,
+        embedder=MagicMock(),
+        vector_store=MagicMock(),
+        config={"fact_lookup": {"cache": {"enabled": True}}},
+    )
+    manager.router.local_provider_ids = [local_store.plugin_id]
+    manager.router.route = AsyncMock(
+        return_value=RoutingDecision(query="", cascade=[local_store.plugin_id, "wikipedia_fact_dispatcher_v1"])
+    )
+
+    assert (await manager.lookup_fact("Bitcoin", "price")).value == "1"
+    await manager.close()
+    await manager._refresh_fact(fact_key("bitcoin", "price"))
+    await manager.close()
+
+    assert wiki_provider.lookup_fact.await_count == 2
+    assert (await local_store.lookup_fact("Bitcoin", "price", None)).value == "2"
+    await local_store.teardown()
+
+
+class TestFactIndex:
+    """Tests bulk import into the memory-mapped fact index."""
+
+    def test_compiled_index_round_trips_facts(self, tmp_path):
+        path = str(tmp_path / "facts.kfi")
+        facts = [Fact(entity=f"Item {i}", attribute="color", value=f"shade {i}", source="catalog") for i in range(500)]
+        facts.append(Fact(entity="Eiffel Tower", attribute="height", value="330 m", confidence=0.9))
+        assert compile_fact_index(facts, path) == 501
+
+        index = MmapFactIndex(path)
+        assert len(index) == 501
+        assert index.get("item 42", "Color").value == "shade 42"
+        assert index.get("Item 42", "color").source == "catalog"
+        fact = index.get("the eiffel tower", "height")
+        assert fact.value == "330 m" and fact.confidence == 0.9 and fact.source is None
+        assert index.get("Item 42", "weight") is None
+        assert index.get("Item 9999", "color") is None
+        index.close()
+
+    def test_facts_for_entity_uses_sorted_keys(self, tmp_path):
+        path = str(tmp_path / "facts.kfi")
+        compile_fact_index(
+            [
+                Fact(entity="Widget", attribute="color", value="red"),
+                Fact(entity="Widget", attribute="weight", value="2 kg"),
+                Fact(entity="Widgets Inc", attribute="founded", value="1999"),
+            ],
+            path,
+        )
+        index = MmapFactIndex(path)
+        assert sorted(f.attribute for f in index.facts_for_entity("widget")) == ["color", "weight"]
+        assert list(index.facts_for_entity("gadget")) == []
+        index.close()
+
+    def test_import_wide_csv_and_long_jsonl(self, tmp_path):
+        catalog = tmp_path / "catalog.csv"
+        catalog.write_text("sku,color,weight\nA-1,red,2 kg\nA-2,blue,\n,green,1 kg\n")
+        overrides = tmp_path / "overrides.jsonl"
+        overrides.write_text('{"entity": "A-2", "attribute": "color", "value": "navy", "confidence": 0.8}\n')
+        output = str(tmp_path / "catalog.kfi")
+
+        stats = import_facts([str(catalog)], output, wide=True, entity_column="sku")
+        assert (stats.rows_read, stats.rows_skipped, stats.facts_written) == (3, 1, 3)
+        assert MmapFactIndex(output).get("A-1", "weight").source == "catalog.csv"
+
+        assert cli_main(["import-facts", str(catalog), "--wide", "--entity-column", "sku", "-o", output]) == 0
+        assert MmapFactIndex(output).get("A-2", "color").value == "blue"
+
+        import_facts([str(overrides)], output)
+        fact = MmapFactIndex(output).get("A-2", "color")
+        assert (fact.value, fact.confidence, fact.source) == ("navy", 0.8, "overrides.jsonl")
+
+    def test_rejects_files_that_are_not_indexes(self, tmp_path):
+        path = tmp_path / "bogus.kfi"
+        path.write_bytes(b"not an index" * 10)
+        with pytest.raises(ValueError):
+            MmapFactIndex(str(path))
+
+
+@pytest.mark.asyncio
+async def test_fact_index_dispatcher(tmp_path):
+    path = str(tmp_path / "facts.kfi")
+    compile_fact_index([Fact(entity="Widget", attribute="color", value="red")], path)
+
+    dispatcher = FactIndexDispatcher()
+    fact = await dispatcher.lookup_fact("widget", "color", genie=None, config={"index_path": path})
+    assert fact.value == "red"
+    assert dispatcher.is_local_source is True
+    await dispatcher.teardown()
+
+    unconfigured = FactIndexDispatcher()
+    await unconfigured.setup({})
+    assert unconfigured.is_local_source is False
+    assert unconfigured.knowledge_description == ""
+    assert await unconfigured.lookup_fact("widget", "color", genie=None) is None
+
+
+@pytest.mark.asyncio
+async def test_fact_index_under_deferred_setup_is_routed_only_when_configured(tmp_path, mock_plugin_manager_fixture):
+    from karta.routing.router import KnowledgeRouter
+
+    path = str(tmp_path / "facts.kfi")
+    compile_fact_index([Fact(entity="Widget", attribute="color", value="red")], path)
+
+    async def no_embeddings(chunks):
+        async def stream():
+            return
+            yield
+
+        return stream()
+
+    for dispatcher_config, expected_local in (({}, False), ({"index_path": path}, True)):
+        mock_plugin_manager_fixture._plugins["fact_index_dispatcher_v1"] = FactIndexDispatcher()
+        config = {
+            "defer_provider_setup": True,
+            "dispatcher_specific_configs": {"fact_index_dispatcher_v1": dispatcher_config},
+        }
+        router = KnowledgeRouter(mock_plugin_manager_fixture, MagicMock(embed=no_embeddings), AsyncMock(), config)
+        await router.setup()
+
+        assert ("fact_index_dispatcher_v1" in router.local_provider_ids) is expected_local
+        assert ("fact_index_dispatcher_v1" in [p for p, _ in router.provider_map]) is expected_local
+        await mock_plugin_manager_fixture._plugins["fact_index_dispatcher_v1"].teardown()
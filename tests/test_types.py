@@ -90,6 +90,17 @@ class TestFactType:
             "attribute": "rings",
             "value": "Yes",
             "source": "Wikipedia",
+            "confidence": 0.9,
         }
         fact = Fact(**data)
-        assert fact.model_dump() == data
\ No newline at end of file
+        assert fact.model_dump() == data
+
+    def test_fact_confidence_defaults_to_unscored(self):
+        """Test that confidence is optional and None when not provided."""
+        fact = Fact(entity="Mars", attribute="moons", value="2")
+        assert fact.confidence is None
+
+    def test_fact_confidence_out_of_range(self):
+        """Test that confidence must lie between 0 and 1."""
+        with pytest.raises(ValidationError):
+            Fact(entity="Mars", attribute="moons", value="2", confidence=1.5)
\ No newline at end of file